@@ -1,31 +1,109 @@
+import time
+_IMPORT_START = time.perf_counter()
+
 from PyQt6.QtWidgets import (
-    QApplication, QLabel, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout, QWidget, QTextEdit, QLineEdit, QFormLayout, 
+    QApplication, QLabel, QPushButton, QFileDialog, QVBoxLayout, QHBoxLayout, QWidget, QTextEdit, QPlainTextEdit, QLineEdit, QFormLayout, 
     QProgressBar, QTabWidget, QListWidget, QListWidgetItem, QMenu, QMessageBox, QSlider, QCheckBox, QComboBox, 
-    QSplitter, QMainWindow, QStatusBar, QToolBar, QDialog, QDialogButtonBox, QSpinBox, QScrollArea
+    QSplitter, QMainWindow, QStatusBar, QToolBar, QDialog, QDialogButtonBox, QSpinBox, QScrollArea,
+    QTableWidget, QTableWidgetItem, QHeaderView, QInputDialog, QDateEdit, QAbstractItemView
 )
-from PyQt6.QtGui import QPixmap, QDesktopServices, QDragEnterEvent, QDropEvent, QKeySequence, QImage, QAction, QIcon
-from PyQt6.QtCore import Qt, QUrl, QSettings, QSize, QTemporaryFile, QDir, pyqtSignal, QThread, QByteArray, QBuffer, QIODevice
+from PyQt6.QtGui import QPixmap, QBrush, QColor, QDesktopServices, QDragEnterEvent, QDropEvent, QKeySequence, QImage, QImageReader, QImageIOHandler, QAction, QIcon
+from PyQt6.QtCore import Qt, QUrl, QSettings, QSize, QDir, QDate, QTimer, pyqtSignal, QThread, QByteArray, QBuffer, QIODevice, QObject, QRunnable, QThreadPool
 import sys
-import requests
+import argparse
+import tracemalloc
 import logging
-import webbrowser
+import logging.handlers
+import queue
+import threading
+import atexit
 import json
+import csv
 import os
-import time
+import io
+import re
+import math
 import base64
+import hashlib
+import random
+import heapq
+import itertools
+from collections import deque, OrderedDict
+from functools import lru_cache
+from contextlib import contextmanager, asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 from typing import List, Dict, Optional, Union
-import asyncio
-import aiohttp
-from cryptography.fernet import Fernet
+from imgbb_probe import probe_image, probe_images, display_size
+from imgbb_optimize import optimize_image
+from imgbb_dedup import HASH_WIDTH, HASH_HEIGHT, DEFAULT_THRESHOLD, dhash_many, cluster_hashes
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 APP_NAME = "ImgBBUploader"
 APP_AUTHOR = "Nrentzilas"
 VERSION = "1.1.0"
 MAX_IMAGE_SIZE = 32 * 1024 * 1024
+UPLOAD_URL = "https://api.imgbb.com/1/upload"
+ENDPOINT_ENV_VAR = "IMGBB_API_URL"
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+UPLOAD_CHUNK_SIZE = 65536
+DEFAULT_BATCH_CONCURRENCY = 4
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+PRIORITY_BACKGROUND = 20
+VARIANT_FORMATS = ("PNG", "JPEG", "WEBP")
 DEFAULT_THEME = "dark"
 HISTORY_FILE = "upload_history.json"
+HISTORY_LIMIT = 100
+BATCHES_DIR = "batches"
+RESULT_FIELDS = ('filename', 'source', 'success', 'url', 'delete_url', 'size', 'width', 'height', 'duration', 'error')
+RESULTS_LOG_LINES = 1000
+THUMBNAIL_SIZE = 48
+THUMBNAIL_CACHE_SIZE = 1000
+THUMBNAIL_THREADS = 4
+THUMBNAIL_DELAY_MS = 50
+DEFAULT_DELETE_CONCURRENCY = 4
+LINK_CACHE_FILE = "link_health.json"
+DEFAULT_LINK_CONCURRENCY = 32
+DEFAULT_LINK_RATE = 100.0
+DEFAULT_LINK_TTL = 24 * 3600
+DAEMON_INFO_FILE = "daemon.json"
+DAEMON_SOCKET_FILE = "daemon.sock"
+DAEMON_GROUP = "daemon"
+DAEMON_JOB_RETENTION = 1000
+DAEMON_POLL_SECONDS = 30
+# The GUI's daemon worker polls in short slices so cancels and priority changes are sent promptly
+DAEMON_CONTROL_SECONDS = 1.0
+DAEMON_PROBE_SECONDS = 30
+# Per-request settings that do not change what gets uploaded, so they never split coalesced jobs
+DAEMON_CLIENT_OPTIONS = ('history', 'coalesce', 'priority')
+QUEUE_POLL_SECONDS = 2.0
+QUEUE_LEASE_SECONDS = 60.0
+# Per-job options a worker accepts from the shared queue; everything else, the endpoint above all, is its own
+QUEUE_JOB_OPTIONS = ('optimize', 'variants')
+AUTH_TOKEN_PATTERN = re.compile(r'auth_token\s*=\s*["\']([\w-]+)["\']')
+LOG_FILE = "imgbb_uploader.jsonl"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_FIELDS = ('file', 'bytes', 'saved', 'duration', 'stages', 'status', 'attempt', 'url', 'count', 'total', 'error')
+METRICS_JSON_FILE = "metrics.json"
+METRICS_PROM_FILE = "metrics.prom"
+PROFILES_DIR = "profiles"
+METRICS_EXPORT_SECONDS = 5.0
+METRICS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
 
 class APIKeyError(Exception):
     pass
@@ -33,117 +111,1386 @@ class APIKeyError(Exception):
 class ImageSizeError(Exception):
     pass
 
+class InvalidImageError(Exception):
+    pass
+
 class NetworkError(Exception):
     pass
 
+class UploadHTTPError(NetworkError):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP Error {status}: {message}")
+        self.status = status
+
+@lru_cache(maxsize=None)
+def app_data_dir() -> Path:
+    path = Path(QDir.homePath()) / f".{APP_NAME}"
+    path.mkdir(exist_ok=True)
+    return path
+
+class StartupTrace:
+    LAZY_MODULES = ('requests', 'aiohttp', 'asyncio', 'cryptography', 'http.server')
+    
+    def __init__(self, origin: float):
+        self.origin = origin
+        self.enabled = False
+        self.marks = []
+        
+    def mark(self, label: str):
+        self.marks.append((label, time.perf_counter()))
+        
+    def report(self):
+        if not self.enabled:
+            return
+            
+        previous = self.origin
+        lines = ["Startup trace (ms since imgbb import):"]
+        for label, timestamp in self.marks:
+            lines.append(f"{(timestamp - self.origin) * 1000:9.1f}  +{(timestamp - previous) * 1000:8.1f}  {label}")
+            previous = timestamp
+            
+        loaded = [name for name in self.LAZY_MODULES if name in sys.modules]
+        lines.append(f"Modules loaded: {len(sys.modules)}; deferred modules already imported: {', '.join(loaded) or 'none'}")
+        print("\n".join(lines), file=sys.stderr)
+
+STARTUP = StartupTrace(_IMPORT_START)
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+                
+        return json.dumps(entry, default=str)
+
+_log_listener = None
+
+def configure_logging(level=logging.INFO):
+    global _log_listener
+    
+    if _log_listener is not None:
+        return
+        
+    file_handler = logging.handlers.RotatingFileHandler(
+        str(app_data_dir() / LOG_FILE),
+        maxBytes=LOG_MAX_BYTES,
+        backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonLinesFormatter())
+    
+    log_queue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+def configured_endpoint() -> str:
+    return os.environ.get(ENDPOINT_ENV_VAR) or QSettings(APP_AUTHOR, APP_NAME).value('api_endpoint', '') or UPLOAD_URL
+
+def retry_delay(attempt: int, retry_after=None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), 60.0)
+        except ValueError:
+            pass
+    return random.uniform(0, min(RETRY_BACKOFF * 2 ** (attempt - 1), 30.0))
+
+def status_retry_delay(status: int, attempt: int, max_retries: int, retry_after=None) -> Optional[float]:
+    # A 429 or 5xx answer means the image was not stored, so sending it again is safe
+    if status in RETRY_STATUSES and attempt <= max_retries:
+        return retry_delay(attempt, retry_after)
+    return None
+
+def connection_retry_delay(upload_body: "UploadBody", attempt: int, max_retries: int) -> Optional[float]:
+    if upload_body.interrupted is not None:
+        raise upload_body.interrupted
+    # Once any of the body is out ImgBB may already have stored the image, and a retry would
+    # leave an orphaned copy with no delete link; only failures before that are retried
+    if attempt > max_retries or upload_body.first_read is not None:
+        return None
+    return retry_delay(attempt)
+
+def upload_params(api_key: str, options: dict) -> dict:
+    params = {'key': api_key}
+    if 'expiration' in options:
+        params['expiration'] = str(options['expiration'])
+    return params
+
+def upload_response_data(response: dict) -> dict:
+    if 'data' not in response or 'url' not in response['data']:
+        raise ValueError("Invalid response format from ImgBB")
+    return response['data']
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class UploadTrace:
+    def __init__(self, source: str):
+        self.source = source
+        self.stages = {}
+        self.bytes = {}
+        self.marks = {}
+        self.status = None
+        self.attempt = 1
+        self.error = None
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float, nbytes: int = 0):
+        self.stages[name] = self.stages.get(name, 0.0) + max(0.0, seconds)
+        if nbytes:
+            self.add_bytes(name, nbytes)
+
+    def add_bytes(self, name: str, nbytes: int):
+        self.bytes[name] = self.bytes.get(name, 0) + nbytes
+
+    def add_network(self, request_start, connected, body_sent, headers_received, body_size):
+        connected = connected or request_start
+        body_sent = body_sent or connected
+        self.add('connect', connected - request_start)
+        self.add('transfer', body_sent - connected, body_size)
+        self.add('server_wait', headers_received - body_sent)
+
+    def mark(self, name: str):
+        self.marks[name] = time.perf_counter()
+
+    def merge(self, other: "UploadTrace"):
+        for name, seconds in other.stages.items():
+            self.add(name, seconds)
+        for name, nbytes in other.bytes.items():
+            self.add_bytes(name, nbytes)
+        self.attempt = max(self.attempt, other.attempt)
+        self.status = other.status or self.status
+
+    def add_marked_network(self, body_size: int):
+        self.add_network(
+            self.marks.get('request_start', self.started),
+            self.marks.get('connected'),
+            self.marks.get('body_sent'),
+            self.marks.get('headers_received', time.perf_counter()),
+            body_size
+        )
+
+    def finish(self, success: bool):
+        self.add('total', time.perf_counter() - self.started)
+        METRICS.record_trace(self, success)
+        if METRICS.autoexport:
+            METRICS.schedule_export()
+        
+        fields = {
+            'file': self.source,
+            'bytes': self.bytes.get('transfer', self.bytes.get('read', 0)),
+            'saved': self.bytes.get('optimize'),
+            'duration': round(self.stages['total'], 4),
+            'stages': {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            'status': self.status,
+            'attempt': self.attempt
+        }
+        
+        if success:
+            logging.info("Upload succeeded", extra=fields)
+        else:
+            logging.error("Upload failed", extra={**fields, 'error': self.error})
+
+class UploadBody:
+    def __init__(self, data: bytes, job: Optional["UploadJob"] = None):
+        self._buffer = io.BytesIO(data)
+        self._size = len(data)
+        self.job = job
+        self.first_read = None
+        self.last_read = None
+        self.interrupted = None
+
+    def __len__(self):
+        return self._size
+
+    def read(self, size: int = -1) -> bytes:
+        if self.job is not None and (self.job.cancelled or self.job.paused) and self._buffer.tell() < self._size:
+            # Raising here aborts the request mid-body, before ImgBB can have stored the image. Once the whole
+            # body is out the request is left to finish, since sending it again would store a second copy
+            self._buffer.close()
+            try:
+                self.job.checkpoint()
+            except (JobCancelled, JobPaused) as e:
+                self.interrupted = e
+                raise
+        if self.first_read is None:
+            self.first_read = time.perf_counter()
+        chunk = self._buffer.read(size)
+        self.last_read = time.perf_counter()
+        return chunk
+
+    async def iter_chunks(self, size: int = UPLOAD_CHUNK_SIZE):
+        while True:
+            chunk = self.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+class JobCancelled(Exception):
+    pass
+
+class JobPaused(Exception):
+    pass
+
+class UploadJob:
+    _ids = itertools.count(1)
+    
+    def __init__(self, source: str, priority: int = PRIORITY_BATCH, group: Optional[str] = None):
+        self.id = next(self._ids)
+        self.source = source
+        self.priority = priority
+        self.group = group
+        self.state = 'queued'
+        self.cancelled = False
+        self.paused = False
+        self.children = []
+        self._interrupted = threading.Event()
+        self._interrupt_callbacks = []
+        self._lock = threading.Lock()
+        
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise JobCancelled(f"Upload of {self.source} was cancelled")
+            
+    def checkpoint(self):
+        self.raise_if_cancelled()
+        if self.paused:
+            raise JobPaused(f"Upload of {self.source} was paused")
+            
+    def sleep(self, seconds: float):
+        # Retry backoff wakes up early when the job is cancelled or paused
+        self._interrupted.wait(seconds)
+        self.checkpoint()
+        
+    def on_interrupt(self, callback):
+        with self._lock:
+            self._interrupt_callbacks.append(callback)
+        return lambda: self._remove_interrupt(callback)
+        
+    def _remove_interrupt(self, callback):
+        with self._lock:
+            if callback in self._interrupt_callbacks:
+                self._interrupt_callbacks.remove(callback)
+                
+    def _interrupt(self):
+        self._interrupted.set()
+        with self._lock:
+            callbacks = list(self._interrupt_callbacks)
+        for callback in callbacks:
+            callback()
+
+class UploadScheduler:
+    def __init__(self, max_active: int = DEFAULT_BATCH_CONCURRENCY, interactive_reserve: int = 1):
+        self.max_active = max_active
+        # Interactive jobs may use a reserved slot so they never queue behind a full batch
+        self.interactive_reserve = interactive_reserve
+        self.jobs = {}
+        self._active = set()
+        self._waiting = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        
+    def create_job(self, source: str, priority: int = PRIORITY_BATCH, group: Optional[str] = None) -> UploadJob:
+        job = UploadJob(source, priority, group)
+        with self._lock:
+            self.jobs[job.id] = job
+        return job
+        
+    def create_children(self, parent: UploadJob, count: int) -> List[UploadJob]:
+        # Children share the parent's group so batch pause/resume covers them; cancelling the parent cancels them
+        children = [self.create_job(parent.source, parent.priority, parent.group) for _ in range(count)]
+        parent.children.extend(children)
+        
+        def propagate():
+            if parent.cancelled:
+                for child in children:
+                    self.cancel(child)
+                    
+        parent.on_interrupt(propagate)
+        return children
+        
+    def finish_job(self, job: UploadJob, state: str):
+        with self._lock:
+            job.state = state
+            self.jobs.pop(job.id, None)
+            self._active.discard(job.id)
+            self._dispatch()
+            
+    def _capacity(self, job: UploadJob) -> int:
+        return self.max_active + (self.interactive_reserve if job.priority <= PRIORITY_INTERACTIVE else 0)
+        
+    def _request(self, job: UploadJob, grant):
+        with self._lock:
+            job.raise_if_cancelled()
+            heapq.heappush(self._waiting, (job.priority, next(self._seq), job, grant))
+            self._dispatch()
+            
+    def _dispatch(self):
+        held = []
+        
+        while self._waiting:
+            priority, seq, job, grant = heapq.heappop(self._waiting)
+            
+            if job.cancelled:
+                grant()
+            elif job.paused or len(self._active) >= self._capacity(job):
+                held.append((priority, seq, job, grant))
+                if not job.paused:
+                    # Anything behind this job has the same or lower priority, so it cannot start either
+                    break
+            else:
+                self._active.add(job.id)
+                job.state = 'running'
+                grant()
+                
+        for item in held:
+            heapq.heappush(self._waiting, item)
+            
+    def _granted(self, job: UploadJob):
+        if job.cancelled:
+            self.release(job)
+            job.raise_if_cancelled()
+            
+    def release(self, job: UploadJob):
+        with self._lock:
+            self._active.discard(job.id)
+            if job.state == 'running':
+                job.state = 'paused' if job.paused else 'queued'
+            self._dispatch()
+            
+    @contextmanager
+    def slot(self, job: UploadJob):
+        granted = threading.Event()
+        self._request(job, granted.set)
+        granted.wait()
+        self._granted(job)
+        
+        try:
+            yield
+        finally:
+            self.release(job)
+            
+    @asynccontextmanager
+    async def async_slot(self, job: UploadJob):
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        
+        def grant():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+            
+        self._request(job, grant)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            self.cancel(job)
+            raise
+        self._granted(job)
+        
+        try:
+            yield
+        finally:
+            self.release(job)
+            
+    def cancel(self, job: UploadJob):
+        job.cancelled = True
+        job._interrupt()
+        with self._lock:
+            # Wake a waiting job directly; it may sit behind a head that cannot start yet
+            for item in [item for item in self._waiting if item[2] is job]:
+                self._waiting.remove(item)
+                item[3]()
+            heapq.heapify(self._waiting)
+            self._dispatch()
+            
+    def reprioritize(self, job: UploadJob, priority: int):
+        with self._lock:
+            for target in [job] + job.children:
+                target.priority = priority
+            # A waiting job is re-sorted under its new priority; a running one keeps its slot
+            self._waiting = [(item[2].priority,) + item[1:] for item in self._waiting]
+            heapq.heapify(self._waiting)
+            self._dispatch()
+            
+    def pause(self, job: UploadJob):
+        if job.cancelled:
+            return
+        job.paused = True
+        if job.state == 'queued':
+            job.state = 'paused'
+        job._interrupt()
+        
+    def resume(self, job: UploadJob):
+        job.paused = False
+        job._interrupted.clear()
+        with self._lock:
+            if job.state == 'paused':
+                job.state = 'queued'
+            self._dispatch()
+            
+    def group_jobs(self, group: str) -> List[UploadJob]:
+        with self._lock:
+            return [job for job in self.jobs.values() if job.group == group]
+            
+    def cancel_group(self, group: str):
+        for job in self.group_jobs(group):
+            self.cancel(job)
+            
+    def pause_group(self, group: str):
+        for job in self.group_jobs(group):
+            self.pause(job)
+            
+    def resume_group(self, group: str):
+        for job in self.group_jobs(group):
+            self.resume(job)
+
+SCHEDULER = UploadScheduler()
+
+async def run_interruptible(job: UploadJob, awaitable, pausable: bool = True):
+    import asyncio
+    
+    # Cancelling the task closes the connection, which aborts a request mid-stream. Work that a pause must not
+    # cut short passes pausable=False and is only stopped by a cancel
+    job.checkpoint()
+    task = asyncio.ensure_future(awaitable)
+    loop = asyncio.get_running_loop()
+    remove = job.on_interrupt(lambda: (pausable or job.cancelled) and loop.call_soon_threadsafe(task.cancel))
+    
+    try:
+        return await task
+    except asyncio.CancelledError:
+        job.checkpoint()
+        raise
+    finally:
+        remove()
+
+class UploadMetrics:
+    def __init__(self, max_samples: int = 2048):
+        self._lock = threading.Lock()
+        self.max_samples = max_samples
+        self.samples = {}
+        self.buckets = {}
+        self.sums = {}
+        self.counts = {}
+        self.bytes = {}
+        self.uploads = {'success': 0, 'failure': 0}
+        self.autoexport = True
+        self._dirty = False
+        self._export_timer = None
+
+    def record(self, stage: str, seconds: float, nbytes: int = 0):
+        with self._lock:
+            self._record(stage, seconds, nbytes)
+
+    def _record(self, stage, seconds, nbytes):
+        if stage not in self.samples:
+            self.samples[stage] = deque(maxlen=self.max_samples)
+            self.buckets[stage] = [0] * len(METRICS_BUCKETS)
+            self.sums[stage] = 0.0
+            self.counts[stage] = 0
+            self.bytes[stage] = 0
+
+        self.samples[stage].append(seconds)
+        self.sums[stage] += seconds
+        self.counts[stage] += 1
+        self.bytes[stage] += nbytes
+
+        for i, bound in enumerate(METRICS_BUCKETS):
+            if seconds <= bound:
+                self.buckets[stage][i] += 1
+
+    def record_trace(self, trace: UploadTrace, success: bool):
+        with self._lock:
+            for stage, seconds in trace.stages.items():
+                self._record(stage, seconds, trace.bytes.get(stage, 0))
+            self.uploads['success' if success else 'failure'] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {}
+            for stage, samples in self.samples.items():
+                ordered = sorted(samples)
+                stages[stage] = {
+                    'count': self.counts[stage],
+                    'sum_seconds': round(self.sums[stage], 6),
+                    'bytes': self.bytes[stage],
+                    'p50': round(percentile(ordered, 0.50), 6),
+                    'p95': round(percentile(ordered, 0.95), 6),
+                    'p99': round(percentile(ordered, 0.99), 6)
+                }
+
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'uploads': dict(self.uploads),
+                'stages': stages
+            }
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            lines = [
+                "# HELP imgbb_uploads_total Uploads finished, by result.",
+                "# TYPE imgbb_uploads_total counter"
+            ]
+            for result, count in self.uploads.items():
+                lines.append(f'imgbb_uploads_total{{result="{result}"}} {count}')
+
+            lines.append("# HELP imgbb_stage_duration_seconds Time spent in each upload stage.")
+            lines.append("# TYPE imgbb_stage_duration_seconds histogram")
+            for stage in sorted(self.samples):
+                for bound, count in zip(METRICS_BUCKETS, self.buckets[stage]):
+                    lines.append(f'imgbb_stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'imgbb_stage_duration_seconds_bucket{{stage="{stage}",le="+Inf"}} {self.counts[stage]}')
+                lines.append(f'imgbb_stage_duration_seconds_sum{{stage="{stage}"}} {self.sums[stage]:.6f}')
+                lines.append(f'imgbb_stage_duration_seconds_count{{stage="{stage}"}} {self.counts[stage]}')
+
+            lines.append("# HELP imgbb_stage_bytes_total Bytes processed in each upload stage.")
+            lines.append("# TYPE imgbb_stage_bytes_total counter")
+            for stage in sorted(self.bytes):
+                lines.append(f'imgbb_stage_bytes_total{{stage="{stage}"}} {self.bytes[stage]}')
+
+            return "\n".join(lines) + "\n"
+
+    def export(self, directory: Optional[Path] = None):
+        directory = directory or app_data_dir()
+
+        try:
+            for name, content in (
+                (METRICS_JSON_FILE, json.dumps(self.snapshot(), indent=2)),
+                (METRICS_PROM_FILE, self.to_prometheus())
+            ):
+                temp_path = directory / f"{name}.tmp"
+                temp_path.write_text(content)
+                os.replace(temp_path, directory / name)
+        except OSError as e:
+            logging.error("Error exporting metrics", extra={'error': str(e)})
+
+    def schedule_export(self):
+        # Uploads only mark the metrics dirty; a timer thread writes the files at most every few seconds
+        with self._lock:
+            self._dirty = True
+            if self._export_timer is not None:
+                return
+            self._export_timer = threading.Timer(METRICS_EXPORT_SECONDS, self.flush)
+            self._export_timer.daemon = True
+            self._export_timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._export_timer = None
+            dirty, self._dirty = self._dirty, False
+
+        if dirty:
+            self.export()
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.buckets.clear()
+            self.sums.clear()
+            self.counts.clear()
+            self.bytes.clear()
+            self.uploads = {'success': 0, 'failure': 0}
+
+METRICS = UploadMetrics()
+atexit.register(METRICS.flush)
+
+class Profiler:
+    def __init__(self, top_n: int = 15):
+        self.enabled = False
+        self.top_n = top_n
+        self.summaries = deque(maxlen=50)
+        self._lock = threading.Lock()
+        self._cpu_lock = threading.Lock()
+        self._tracemalloc_users = 0
+
+    def profiles_dir(self) -> Path:
+        path = app_data_dir() / PROFILES_DIR
+        path.mkdir(exist_ok=True)
+        return path
+
+    def _start_tracemalloc(self):
+        with self._lock:
+            if self._tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            self._tracemalloc_users += 1
+
+    def _stop_tracemalloc(self):
+        with self._lock:
+            self._tracemalloc_users -= 1
+            if self._tracemalloc_users == 0:
+                tracemalloc.stop()
+
+    @contextmanager
+    def profile(self, label: str):
+        if not self.enabled:
+            yield
+            return
+
+        import cProfile
+        
+        # cProfile hooks are process-wide on newer Pythons, so only one CPU profile runs at a time
+        profiler = cProfile.Profile() if self._cpu_lock.acquire(blocking=False) else None
+        self._start_tracemalloc()
+        before = tracemalloc.take_snapshot()
+        start = time.perf_counter()
+
+        if profiler:
+            profiler.enable()
+
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                self._cpu_lock.release()
+
+            elapsed = time.perf_counter() - start
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            self._stop_tracemalloc()
+
+            try:
+                self._write_report(label, profiler, before, after, elapsed, peak)
+            except Exception as e:
+                logging.error("Error writing profile report", extra={'error': str(e)})
+
+    def _write_report(self, label, profiler, before, after, elapsed, peak):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        base_path = self.profiles_dir() / f"{label}-{stamp}"
+
+        top_functions = []
+        cpu_text = "CPU profile skipped: another profile was running\n"
+
+        if profiler:
+            import pstats
+            
+            profiler.dump_stats(str(base_path.with_suffix('.prof')))
+
+            stream = io.StringIO()
+            stats = pstats.Stats(profiler, stream=stream).sort_stats(pstats.SortKey.CUMULATIVE)
+            stats.print_stats(self.top_n)
+            cpu_text = stream.getvalue()
+
+            for func, (_, calls, total_time, cumulative_time, _) in sorted(
+                stats.stats.items(), key=lambda item: item[1][3], reverse=True
+            )[:self.top_n]:
+                filename, line, name = func
+                top_functions.append({
+                    'function': f"{Path(filename).name}:{line}({name})",
+                    'calls': calls,
+                    'total_seconds': round(total_time, 6),
+                    'cumulative_seconds': round(cumulative_time, 6)
+                })
+
+        top_allocations = []
+        for stat in after.compare_to(before, 'lineno')[:self.top_n]:
+            frame = stat.traceback[0]
+            top_allocations.append({
+                'location': f"{Path(frame.filename).name}:{frame.lineno}",
+                'size_diff': stat.size_diff,
+                'count_diff': stat.count_diff
+            })
+
+        with open(base_path.with_suffix('.txt'), 'w') as f:
+            f.write(f"{label}: {elapsed:.4f}s, peak traced memory {peak} bytes\n\n")
+            f.write(cpu_text)
+            f.write("\nTop allocations:\n")
+            for allocation in top_allocations:
+                f.write(f"{allocation['location']}: {allocation['size_diff']:+} bytes ({allocation['count_diff']:+} blocks)\n")
+
+        self.summaries.appendleft({
+            'label': label,
+            'timestamp': datetime.now().isoformat(),
+            'elapsed': round(elapsed, 6),
+            'peak_memory': peak,
+            'report': str(base_path.with_suffix('.txt')),
+            'top_functions': top_functions,
+            'top_allocations': top_allocations
+        })
+
+PROFILER = Profiler()
+
+def create_trace_config():
+    import aiohttp
+    
+    trace_config = aiohttp.TraceConfig()
+
+    def marker(name):
+        async def on_event(session, context, params):
+            if isinstance(context.trace_request_ctx, UploadTrace):
+                context.trace_request_ctx.mark(name)
+        return on_event
+
+    trace_config.on_request_start.append(marker('request_start'))
+    trace_config.on_connection_create_end.append(marker('connected'))
+    trace_config.on_connection_reuseconn.append(marker('connected'))
+    trace_config.on_request_chunk_sent.append(marker('body_sent'))
+    trace_config.on_request_end.append(marker('headers_received'))
+    return trace_config
+
+def is_remote_url(source) -> bool:
+    return isinstance(source, str) and source.lower().startswith(('http://', 'https://'))
+
+def needs_local_copy(source, options: dict) -> bool:
+    # Variants are made locally, so a remote image has to come through this machine
+    return is_remote_url(source) and bool(options.get('variants'))
+
+def should_relay(status: Optional[int], options: dict) -> bool:
+    # A 400 means ImgBB could not fetch the URL itself; relay the bytes through this machine instead
+    return status == 400 and options.get('url_fallback', True)
+
+def display_name(source: str) -> str:
+    return source if is_remote_url(source) else Path(source).name
+
+def download_image(url: str, timeout: float = DEFAULT_TIMEOUT, trace: Optional[UploadTrace] = None) -> bytes:
+    import requests
+    
+    trace = trace or UploadTrace(url)
+    chunks = []
+    total = 0
+    
+    with trace.stage('download'):
+        with requests.get(url, stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            
+            for chunk in response.iter_content(65536):
+                total += len(chunk)
+                check_image_size(total)
+                chunks.append(chunk)
+                
+    trace.add_bytes('download', total)
+    return b"".join(chunks)
+
+def encode_upload_form(image: Union[bytes, str]) -> tuple:
+    from urllib3.filepost import encode_multipart_formdata
+    
+    # A URL goes in as a plain field for ImgBB to fetch; image bytes go in as a file part
+    return encode_multipart_formdata({'image': image if isinstance(image, str) else ('image', image)})
+
+def source_label(source) -> str:
+    if isinstance(source, (str, Path)):
+        return str(source)
+    return f"<memory:{source_size(source)} bytes>"
+
+def source_size(source) -> int:
+    if isinstance(source, (str, Path)):
+        return Path(source).stat().st_size
+    if isinstance(source, QByteArray):
+        return source.size()
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer().nbytes
+    return len(source)
+
+def format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.2f} MB"
+    return f"{size / 1024:.2f} KB"
+
+def check_image_size(size: int):
+    if size > MAX_IMAGE_SIZE:
+        raise ImageSizeError(f"Image size exceeds {MAX_IMAGE_SIZE // (1024 * 1024)}MB limit")
+
+def check_probe(info: dict) -> dict:
+    if info['error']:
+        raise InvalidImageError(info['error'])
+    check_image_size(info['size'])
+    return info
+
+def validate_image_file(path) -> dict:
+    return check_probe(probe_image(str(path)))
+
+def load_preview(path: str, width: int, height: int) -> QImage:
+    # Let the decoder scale down while decoding (JPEG decodes at 1/2, 1/4 or 1/8) instead of decoding full size first
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    
+    # The scaled size applies before the EXIF rotation, so fit sideways images into the transposed box
+    if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+        width, height = height, width
+        
+    size = reader.size()
+    if size.isValid() and (size.width() > width or size.height() > height):
+        reader.setScaledSize(size.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio))
+        
+    image = reader.read()
+    if image.isNull():
+        raise InvalidImageError(reader.errorString())
+    return image
+
+def grayscale_thumbnail(path: str) -> Optional[tuple]:
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    size = reader.size()
+    
+    # Scaled decoding lets JPEGs skip most of the IDCT work; the scaled size applies before EXIF rotation
+    if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+        reader.setScaledSize(QSize(HASH_HEIGHT, HASH_WIDTH))
+    else:
+        reader.setScaledSize(QSize(HASH_WIDTH, HASH_HEIGHT))
+        
+    image = reader.read()
+    if image.isNull() or image.width() != HASH_WIDTH or image.height() != HASH_HEIGHT:
+        return None
+        
+    image = image.convertToFormat(QImage.Format.Format_Grayscale8)
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    data = bytes(bits)
+    stride = image.bytesPerLine()
+    
+    pixels = b"".join(data[row * stride:row * stride + HASH_WIDTH] for row in range(HASH_HEIGHT))
+    return pixels, size.width() * size.height()
+
+def read_image_source(source) -> bytes:
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as img_file:
+            return img_file.read()
+    if isinstance(source, QByteArray):
+        return source.data()
+    if isinstance(source, io.BytesIO):
+        return source.getvalue()
+    return bytes(source)
+
+def scale_to_fit(image: QImage, max_dimension: int) -> QImage:
+    if image.width() <= max_dimension and image.height() <= max_dimension:
+        return image
+    return image.scaled(max_dimension, max_dimension, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+def encode_qimage(image: QImage, image_format: str = "PNG", quality: int = -1) -> bytes:
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, image_format, quality)
+    return buffer.data().data()
+
+def resize_image_data(image_data: bytes, max_dimension: int, trace: Optional[UploadTrace] = None,
+                      image_format: str = "PNG", quality: int = -1) -> bytes:
+    trace = trace or UploadTrace("")
+    
+    with trace.stage('decode'):
+        buffer = QBuffer()
+        buffer.setData(image_data)
+        reader = QImageReader(buffer)
+        reader.setAutoTransform(True)
+        img = reader.read()
+    
+    if img.width() <= max_dimension and img.height() <= max_dimension:
+        return image_data
+        
+    with trace.stage('resize'):
+        resized = scale_to_fit(img, max_dimension)
+    
+    with trace.stage('encode'):
+        encoded = encode_qimage(resized, image_format, quality)
+    trace.add_bytes('encode', len(encoded))
+    
+    return encoded
+
+def prepare_image_data(image_data: bytes, options: dict, trace: Optional[UploadTrace] = None) -> bytes:
+    trace = trace or UploadTrace("")
+    
+    if options.get('resize', False):
+        image_data = resize_image_data(image_data, options.get('max_dimension', 1024), trace,
+                                       options.get('format', "PNG"), options.get('quality', -1))
+        
+    if options.get('optimize', False):
+        with trace.stage('optimize'):
+            optimized = optimize_image(image_data)
+        trace.add_bytes('optimize', len(image_data) - len(optimized))
+        image_data = optimized
+        
+    return image_data
+
+def parse_variants(text: str) -> List[dict]:
+    variants = []
+    
+    for token in text.replace(" ", "").split(','):
+        if not token:
+            continue
+            
+        size, _, image_format = token.partition(':')
+        image_format = {'JPG': "JPEG"}.get(image_format.upper(), image_format.upper()) or None
+        
+        if image_format is not None and image_format not in VARIANT_FORMATS:
+            raise ValueError(f"Unsupported variant format: {image_format}")
+            
+        if size.lower() == "original":
+            width = None
+        elif size.isdigit() and int(size) > 0:
+            width = int(size)
+        else:
+            raise ValueError(f"Invalid variant width: {size}")
+            
+        variants.append({'width': width, 'format': image_format})
+        
+    return variants
+
+def variant_label(spec: dict) -> str:
+    label = f"{spec['width']}w" if spec['width'] else "original"
+    return f"{label}-{spec['format'].lower()}" if spec['format'] else label
+
+def make_variants(image_data: bytes, variants: List[dict], options: dict,
+                  trace: Optional[UploadTrace] = None) -> List[tuple]:
+    trace = trace or UploadTrace("")
+    
+    with trace.stage('decode'):
+        buffer = QBuffer()
+        buffer.setData(image_data)
+        reader = QImageReader(buffer)
+        reader.setAutoTransform(True)
+        source_format = bytes(reader.format().data()).decode().upper()
+        image = reader.read()
+        
+    if image.isNull():
+        raise InvalidImageError(f"Could not decode image: {reader.errorString()}")
+        
+    default_format = options.get('format') or (source_format if source_format in VARIANT_FORMATS else "PNG")
+    quality = options.get('quality', -1)
+    
+    def optimized(data):
+        if not options.get('optimize', False):
+            return data
+        with trace.stage('optimize'):
+            result = optimize_image(data)
+        trace.add_bytes('optimize', len(data) - len(result))
+        return result
+        
+    outputs = {}
+    encoded = {}
+    
+    for spec in variants:
+        width = min(spec['width'] or image.width(), image.width())
+        
+        if width == image.width() and spec['format'] in (None, source_format):
+            key = (width, None)
+        else:
+            key = (width, spec['format'] or default_format)
+            
+        # Specs that clamp to the same width and format (e.g. 1600:webp and 2000:webp on a 1200px image)
+        # share one buffer, so it is encoded and uploaded once
+        if key not in encoded:
+            if key[1] is None:
+                encoded[key] = optimized(image_data)
+            else:
+                # Every size is scaled from the full-resolution decode, so smaller sizes do not compound
+                # the resampling error of the larger ones
+                scaled = image
+                if width < image.width():
+                    with trace.stage('resize'):
+                        scaled = image.scaledToWidth(width, Qt.TransformationMode.SmoothTransformation)
+                        
+                with trace.stage('encode'):
+                    data = encode_qimage(scaled, key[1], quality)
+                trace.add_bytes('encode', len(data))
+                encoded[key] = optimized(data)
+                
+        outputs[variant_label(spec)] = encoded[key]
+        
+    return [(variant_label(spec), outputs[variant_label(spec)]) for spec in variants]
+
+def unique_variants(variants: List[tuple]) -> List[bytes]:
+    # make_variants hands out one buffer per effective width and format, so identity is enough here
+    return list({id(data): data for _, data in variants}.values())
+
+def combine_variants(variants: List[tuple], unique: List[bytes], uploaded: List[dict]) -> dict:
+    by_data = {id(data): result['data'] for data, result in zip(unique, uploaded)}
+    entries = []
+    
+    for label, data in variants:
+        result = by_data[id(data)]
+        entries.append({
+            'label': label,
+            'url': result.get('url'),
+            'width': result.get('width'),
+            'height': result.get('height'),
+            'size': result.get('size'),
+            'delete_url': result.get('delete_url')
+        })
+        
+    primary = max(by_data.values(), key=lambda result: int(result.get('width') or 0))
+    return dict(primary, variants=entries)
+
+def first_error(results: list) -> Optional[BaseException]:
+    errors = [result for result in results if isinstance(result, BaseException)]
+    # A sibling cancelled because another variant failed should not hide the original failure
+    return next((e for e in errors if not isinstance(e, JobCancelled)), errors[0] if errors else None)
+
+def discard_variant_uploads(uploaded: List[dict]):
+    import asyncio
+    
+    if uploaded:
+        asyncio.run(BulkDeleteWorker([result['data'] for result in uploaded], {'max_retries': 1}).perform_deletes())
+
+class VariantUploads:
+    # The fan-out plan for one source's variants; the threaded and asyncio workers only differ in how they send
+    def __init__(self, job: UploadJob, variants: List[tuple]):
+        self.variants = variants
+        self.unique = unique_variants(variants)
+        self.jobs = SCHEDULER.create_children(job, len(self.unique))
+        self.traces = [UploadTrace(job.source) for _ in self.unique]
+        
+    def uploads(self):
+        return zip(self.unique, self.jobs, self.traces)
+        
+    def child_finished(self, child: UploadJob, success: bool):
+        if success:
+            SCHEDULER.finish_job(child, 'done')
+            return
+            
+        SCHEDULER.finish_job(child, 'cancelled' if child.cancelled else 'failed')
+        # One missing variant fails the whole record, so the siblings stop as well
+        for sibling in self.jobs:
+            SCHEDULER.cancel(sibling)
+            
+    def finish(self, trace: UploadTrace, results: list) -> dict:
+        for child_trace in self.traces:
+            trace.merge(child_trace)
+            
+        error = first_error(results)
+        if error is not None:
+            # The variants form one record, so a partial set is removed again rather than left behind
+            discard_variant_uploads([result for result in results if isinstance(result, dict)])
+            raise error
+            
+        return {'data': combine_variants(self.variants, self.unique, results)}
+
 class UploadWorker(QThread):
     upload_progress = pyqtSignal(int)
     upload_complete = pyqtSignal(dict)
     upload_error = pyqtSignal(str)
     
-    def __init__(self, api_key: str, file_path: str, options: dict = None):
+    def __init__(self, api_key: str, source: Union[str, bytes, bytearray, QByteArray, io.BytesIO], options: dict = None):
         super().__init__()
         self.api_key = api_key
-        self.file_path = file_path
+        self.source = source
         self.options = options or {}
+        self.priority = self.options.get('priority', PRIORITY_INTERACTIVE)
+        self.job = None
+        self.cancelled = False
+        self.data = None
         
     def run(self):
-        try:
-            self.upload_progress.emit(10)
+        # Created here rather than in __init__, so a worker that is never started leaves no job in the scheduler
+        self.job = SCHEDULER.create_job(source_label(self.source), self.priority)
+        if self.cancelled:
+            SCHEDULER.cancel(self.job)
+        if self.job.priority != self.priority:
+            SCHEDULER.reprioritize(self.job, self.priority)
             
-            if not self.api_key:
-                raise APIKeyError("API key is required")
+        with PROFILER.profile('upload'):
+            self._upload()
             
-            if Path(self.file_path).stat().st_size > MAX_IMAGE_SIZE:
-                raise ImageSizeError(f"Image size exceeds {MAX_IMAGE_SIZE // (1024 * 1024)}MB limit")
+    def cancel(self):
+        # requests can only be interrupted while it is still reading the body; once the upload is sent and
+        # the worker is waiting for the response, cancelling takes effect when the response or timeout arrives
+        self.cancelled = True
+        if self.job is not None:
+            SCHEDULER.cancel(self.job)
             
-            url = "https://api.imgbb.com/1/upload"
+    def set_priority(self, priority: int):
+        self.priority = priority
+        if self.job is not None:
+            SCHEDULER.reprioritize(self.job, priority)
             
-            with open(self.file_path, 'rb') as img_file:
-                image_data = img_file.read()
-                
-            self.upload_progress.emit(30)
+    def _upload(self):
+        import requests
+        
+        trace = UploadTrace(source_label(self.source))
+        success = False
+        
+        try:
+            self.upload_progress.emit(10)
             
-            if self.options.get('resize', False):
-                max_dimension = self.options.get('max_dimension', 1024)
-                image_data = self._resize_image(image_data, max_dimension)
-                
-            self.upload_progress.emit(50)
+            if not self.api_key:
+                raise APIKeyError("API key is required")
             
-            files = {'image': image_data}
-            params = {'key': self.api_key}
+            url = self.options.get('endpoint') or configured_endpoint()
+            params = upload_params(self.api_key, self.options)
             
-            if 'expiration' in self.options:
-                params['expiration'] = self.options['expiration']
-                
             if 'name' in self.options:
                 params['name'] = self.options['name']
                 
-            self.upload_progress.emit(70)
-            
-            response = requests.post(
-                url,
-                params=params,
-                files=files,
-                timeout=30
-            )
+            if needs_local_copy(self.source, self.options):
+                image_data = download_image(self.source, self.options.get('timeout', DEFAULT_TIMEOUT), trace)
+                data = self._upload_bytes(url, params, image_data, trace)
+                image_data = None
+            elif is_remote_url(self.source):
+                data = self._upload_remote(url, params, trace)
+            else:
+                if isinstance(self.source, (str, Path)):
+                    with trace.stage('probe'):
+                        validate_image_file(self.source)
+                else:
+                    check_image_size(source_size(self.source))
+                    
+                with trace.stage('read'):
+                    image_data = read_image_source(self.source)
+                trace.add_bytes('read', len(image_data))
+                
+                data = self._upload_bytes(url, params, image_data, trace)
+                image_data = None
             
             self.upload_progress.emit(90)
             
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'data' not in data or 'url' not in data['data']:
-                raise ValueError("Invalid response format from ImgBB")
-                
+            self.data = upload_response_data(data)
+            success = True
             self.upload_progress.emit(100)
-            self.upload_complete.emit(data['data'])
+            self.upload_complete.emit(self.data)
             
+        except JobCancelled:
+            self._fail(trace, "Upload cancelled")
         except APIKeyError as e:
-            self.upload_error.emit(f"API Key Error: {str(e)}")
+            self._fail(trace, f"API Key Error: {str(e)}")
         except ImageSizeError as e:
-            self.upload_error.emit(f"Image Size Error: {str(e)}")
+            self._fail(trace, f"Image Size Error: {str(e)}")
+        except InvalidImageError as e:
+            self._fail(trace, f"Image Error: {str(e)}")
         except requests.exceptions.RequestException as e:
-            self.upload_error.emit(f"Network Error: {str(e)}")
+            self._fail(trace, f"Network Error: {str(e)}")
         except ValueError as e:
-            self.upload_error.emit(f"API Error: {str(e)}")
+            self._fail(trace, f"API Error: {str(e)}")
         except Exception as e:
-            self.upload_error.emit(f"Unexpected Error: {str(e)}")
-    
-    def _resize_image(self, image_data: bytes, max_dimension: int) -> bytes:
-        img = QImage()
-        img.loadFromData(image_data)
+            self._fail(trace, f"Unexpected Error: {str(e)}")
+        finally:
+            trace.finish(success)
+            SCHEDULER.finish_job(self.job, 'done' if success else 'cancelled' if self.job.cancelled else 'failed')
+            
+    def _upload_bytes(self, url: str, params: dict, image_data: bytes, trace: UploadTrace) -> dict:
+        self.upload_progress.emit(30)
         
-        if img.width() <= max_dimension and img.height() <= max_dimension:
-            return image_data
+        if self.options.get('variants'):
+            return self._upload_variants(url, params, image_data, trace)
             
-        if img.width() > img.height():
-            new_width = max_dimension
-            new_height = int(img.height() * (max_dimension / img.width()))
-        else:
-            new_height = max_dimension
-            new_width = int(img.width() * (max_dimension / img.height()))
+        image_data = prepare_image_data(image_data, self.options, trace)
+        self.job.raise_if_cancelled()
             
-        resized = img.scaled(new_width, new_height, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        self.upload_progress.emit(50)
         
-        buffer = QBuffer()
-        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
-        resized.save(buffer, "PNG")
+        body, content_type = encode_upload_form(image_data)
+        del image_data
         
-        return buffer.data().data()
-
-class OptionsDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Upload Options")
-        self.resize(400, 300)
-        self.init_ui()
+        self.upload_progress.emit(70)
         
-    def init_ui(self):
-        layout = QVBoxLayout()
-        form_layout = QFormLayout()
+        return self._post(url, params, body, content_type, trace)
         
-        self.filename_input = QLineEdit()
+    def _upload_variants(self, url: str, params: dict, image_data: bytes, trace: UploadTrace) -> dict:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        variants = make_variants(image_data, self.options['variants'], self.options, trace)
+        del image_data
+        self.job.raise_if_cancelled()
+        
+        self.upload_progress.emit(50)
+        
+        plan = VariantUploads(self.job, variants)
+        with ThreadPoolExecutor(max_workers=len(plan.unique)) as executor:
+            futures = [executor.submit(self._upload_variant, url, params, data, plan, job, child_trace)
+                       for data, job, child_trace in plan.uploads()]
+            
+        return plan.finish(trace, [future.exception() or future.result() for future in futures])
+        
+    def _upload_variant(self, url: str, params: dict, data: bytes, plan: VariantUploads, job: UploadJob,
+                        trace: UploadTrace) -> dict:
+        try:
+            body, content_type = encode_upload_form(data)
+            result = self._post(url, params, body, content_type, trace, job)
+        except BaseException:
+            plan.child_finished(job, False)
+            raise
+            
+        plan.child_finished(job, True)
+        return result
+        
+    def _upload_remote(self, url: str, params: dict, trace: UploadTrace) -> dict:
+        import requests
+        
+        body, content_type = encode_upload_form(self.source)
+        self.upload_progress.emit(50)
+        
+        try:
+            return self._post(url, params, body, content_type, trace)
+        except requests.exceptions.HTTPError as e:
+            if not should_relay(e.response.status_code if e.response is not None else None, self.options):
+                raise
+                
+        image_data = download_image(self.source, self.options.get('timeout', DEFAULT_TIMEOUT), trace)
+        return self._upload_bytes(url, params, image_data, trace)
+        
+    def _post(self, url: str, params: dict, body: bytes, content_type: str, trace: UploadTrace,
+              job: Optional[UploadJob] = None) -> dict:
+        job = job or self.job
+        
+        while True:
+            try:
+                with SCHEDULER.slot(job):
+                    return self._send_with_retries(url, params, body, content_type, trace, job)
+            except JobPaused:
+                # The slot is released while paused; the next slot() call waits until the job is resumed
+                continue
+                
+    def _send_with_retries(self, url: str, params: dict, body: bytes, content_type: str, trace: UploadTrace,
+                           job: UploadJob) -> dict:
+        import requests
+        
+        max_retries = self.options.get('max_retries', DEFAULT_MAX_RETRIES)
+        timeout = self.options.get('timeout', DEFAULT_TIMEOUT)
+        
+        for attempt in range(1, max_retries + 2):
+            trace.attempt = attempt
+            upload_body = UploadBody(body, job)
+            request_start = time.perf_counter()
+            
+            try:
+                response = requests.post(
+                    url,
+                    params=params,
+                    data=upload_body,
+                    headers={'Content-Type': content_type},
+                    timeout=timeout,
+                    stream=True
+                )
+                trace.add_network(request_start, upload_body.first_read, upload_body.last_read, time.perf_counter(), len(body))
+                trace.status = response.status_code
+                
+                delay = status_retry_delay(response.status_code, attempt, max_retries, response.headers.get('Retry-After'))
+                if delay is not None:
+                    response.close()
+                    job.sleep(delay)
+                    continue
+                    
+                response.raise_for_status()
+                
+                with trace.stage('response'):
+                    content = response.content
+                    trace.add_bytes('response', len(content))
+                    return json.loads(content)
+                    
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                delay = connection_retry_delay(upload_body, attempt, max_retries)
+                if delay is None:
+                    raise
+                job.sleep(delay)
+                
+    def _fail(self, trace: UploadTrace, message: str):
+        trace.error = message
+        self.upload_error.emit(message)
+    
+class DaemonUploadWorker(QThread):
+    upload_progress = pyqtSignal(int)
+    upload_complete = pyqtSignal(dict)
+    upload_error = pyqtSignal(str)
+    
+    def __init__(self, client, api_key: str, source: str, options: dict = None):
+        super().__init__()
+        self.client = client
+        self.api_key = api_key
+        # The daemon runs in another working directory
+        self.source = source if is_remote_url(source) else os.path.abspath(source)
+        # The window records history itself, so unrevealed speculative uploads stay out of it
+        self.options = dict(options or {}, history=False)
+        self.priority = self.options.pop('priority', PRIORITY_INTERACTIVE)
+        self.job_id = None
+        self.cancelled = False
+        self.data = None
+        
+    def cancel(self):
+        # Sent by the worker thread on its next poll, so the window never blocks on the daemon
+        self.cancelled = True
+        
+    def _cancel_remote(self):
+        try:
+            self.client.cancel(self.job_id)
+        except Exception as e:
+            logging.warning("Could not cancel daemon job", extra={'file': self.source, 'error': str(e)})
+            
+    def _reprioritize_remote(self, priority: int):
+        try:
+            self.client.reprioritize(self.job_id, priority)
+        except Exception as e:
+            logging.warning("Could not change daemon job priority", extra={'file': self.source, 'error': str(e)})
+            
+    def set_priority(self, priority: int):
+        self.priority = priority
+        
+    def run(self):
+        from imgbb_daemon import DaemonError
+        
+        if self.cancelled:
+            self.upload_error.emit("Upload cancelled")
+            return
+            
+        try:
+            self.upload_progress.emit(10)
+            priority = self.priority
+            job = self.client.submit([self.source], dict(self.options, priority=priority), self.api_key)[0]
+            self.job_id = job['id']
+            cancel_sent = False
+            self.upload_progress.emit(30)
+            
+            while not job['finished']:
+                if self.cancelled and not cancel_sent:
+                    cancel_sent = True
+                    self._cancel_remote()
+                elif self.priority != priority:
+                    priority = self.priority
+                    self._reprioritize_remote(priority)
+                job = self.client.job(self.job_id, wait=DAEMON_CONTROL_SECONDS)
+                self.upload_progress.emit(60 if job['state'] == 'running' else 30)
+                
+            result = job['result']
+            if result['success']:
+                self.data = result['data']
+                self.upload_progress.emit(100)
+                self.upload_complete.emit(self.data)
+            else:
+                self.upload_error.emit(result.get('error') or "Upload failed")
+                
+        except DaemonError as e:
+            self.upload_error.emit(f"Daemon Error: {str(e)}")
+        except OSError as e:
+            self.upload_error.emit(f"Network Error: could not reach the upload daemon ({str(e)})")
+
+def saved_upload_options() -> dict:
+    # Options that persist across sessions, so uploads made without opening the Options dialog agree with it
+    if QSettings(APP_AUTHOR, APP_NAME).value('optimize_uploads', False, type=bool):
+        return {'optimize': True}
+    return {}
+
+class OptionsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Upload Options")
+        self.resize(400, 300)
+        self.init_ui()
+        
+    def init_ui(self):
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        
+        self.filename_input = QLineEdit()
         self.filename_input.setPlaceholderText("Leave empty for original filename")
         form_layout.addRow("Custom filename:", self.filename_input)
         
@@ -170,6 +1517,35 @@ class OptionsDialog(QDialog):
         
         form_layout.addRow("Resize:", resize_layout)
         
+        self.optimize_check = QCheckBox("Strip metadata and recompress losslessly")
+        self.optimize_check.setChecked(QSettings(APP_AUTHOR, APP_NAME).value('optimize_uploads', False, type=bool))
+        self.optimize_check.setToolTip("Removes EXIF/XMP, comments and embedded thumbnails (orientation is kept) "
+                                       "and recompresses PNG data before uploading")
+        form_layout.addRow("Optimize:", self.optimize_check)
+        
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(["Original", "PNG", "JPEG", "WEBP"])
+        self.format_combo.setToolTip("Format used when an image is re-encoded (resized or pasted from the clipboard)")
+        form_layout.addRow("Format:", self.format_combo)
+        
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(1, 100)
+        self.quality_spin.setValue(90)
+        self.quality_spin.setSuffix("%")
+        form_layout.addRow("Quality:", self.quality_spin)
+        
+        self.variants_input = QLineEdit()
+        self.variants_input.setPlaceholderText("e.g. 320,800,1600,original or 800:webp")
+        self.variants_input.setToolTip("Upload several widths per image from a single decode and keep them as one "
+                                       "history record; replaces the resize setting when set")
+        form_layout.addRow("Variants:", self.variants_input)
+        
+        self.endpoint_input = QLineEdit()
+        self.endpoint_input.setPlaceholderText(UPLOAD_URL)
+        self.endpoint_input.setText(QSettings(APP_AUTHOR, APP_NAME).value('api_endpoint', ''))
+        self.endpoint_input.setToolTip(f"Upload endpoint, e.g. a caching proxy or local emulator. {ENDPOINT_ENV_VAR} overrides it.")
+        form_layout.addRow("API endpoint:", self.endpoint_input)
+        
         layout.addLayout(form_layout)
         
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
@@ -179,6 +1555,18 @@ class OptionsDialog(QDialog):
         
         self.setLayout(layout)
         
+    def accept(self):
+        try:
+            parse_variants(self.variants_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Variants", str(e))
+            return
+            
+        settings = QSettings(APP_AUTHOR, APP_NAME)
+        settings.setValue('api_endpoint', self.endpoint_input.text().strip())
+        settings.setValue('optimize_uploads', self.optimize_check.isChecked())
+        super().accept()
+        
     def get_options(self):
         options = {}
         
@@ -200,17 +1588,250 @@ class OptionsDialog(QDialog):
             options['resize'] = True
             options['max_dimension'] = self.resize_slider.value()
             
+        if self.optimize_check.isChecked():
+            options['optimize'] = True
+            
+        if self.format_combo.currentText() != "Original":
+            options['format'] = self.format_combo.currentText()
+            options['quality'] = self.quality_spin.value()
+            
+        variants = parse_variants(self.variants_input.text())
+        if variants:
+            options['variants'] = variants
+            
         return options
 
+class MetricsDialog(QDialog):
+    COLUMNS = ["Stage", "Count", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Bytes"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Upload Statistics")
+        self.resize(560, 360)
+        self.init_ui()
+        self.refresh()
+        
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        self.summary_label = QLabel("")
+        layout.addWidget(self.summary_label)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+        
+        btn_layout = QHBoxLayout()
+        
+        self.refresh_btn = QPushButton("Refresh")
+        self.refresh_btn.clicked.connect(self.refresh)
+        
+        self.export_btn = QPushButton("Export JSON")
+        self.export_btn.clicked.connect(self.export_snapshot)
+        
+        self.reset_btn = QPushButton("Reset")
+        self.reset_btn.clicked.connect(self.reset_metrics)
+        
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        
+        btn_layout.addWidget(self.refresh_btn)
+        btn_layout.addWidget(self.export_btn)
+        btn_layout.addWidget(self.reset_btn)
+        btn_layout.addWidget(self.close_btn)
+        
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+        
+    def refresh(self):
+        snapshot = METRICS.snapshot()
+        uploads = snapshot['uploads']
+        self.summary_label.setText(
+            f"Uploads: {uploads['success']} successful, {uploads['failure']} failed - "
+            f"Prometheus file: {app_data_dir() / METRICS_PROM_FILE}"
+        )
+        
+        stages = snapshot['stages']
+        self.table.setRowCount(len(stages))
+        
+        for row, (stage, stats) in enumerate(sorted(stages.items())):
+            values = [
+                stage,
+                str(stats['count']),
+                f"{stats['p50'] * 1000:.1f}",
+                f"{stats['p95'] * 1000:.1f}",
+                f"{stats['p99'] * 1000:.1f}",
+                str(stats['bytes'])
+            ]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+                
+    def export_snapshot(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Metrics",
+            "imgbb_metrics.json",
+            "JSON Files (*.json)"
+        )
+        
+        if file_path:
+            try:
+                with open(file_path, 'w') as f:
+                    json.dump(METRICS.snapshot(), f, indent=2)
+            except OSError as e:
+                logging.error("Error exporting metrics", extra={'file': file_path, 'error': str(e)})
+                QMessageBox.warning(self, "Export Metrics", f"Could not save the metrics: {str(e)}")
+                
+    def reset_metrics(self):
+        METRICS.reset()
+        METRICS.export()
+        self.refresh()
+
+class ProfileReportDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Profile Report")
+        self.resize(640, 480)
+        self.init_ui()
+        self.refresh()
+        
+    def init_ui(self):
+        layout = QVBoxLayout()
+        
+        self.report_text = QTextEdit()
+        self.report_text.setReadOnly(True)
+        layout.addWidget(self.report_text)
+        
+        btn_layout = QHBoxLayout()
+        
+        self.open_dir_btn = QPushButton("Open Reports Folder")
+        self.open_dir_btn.clicked.connect(lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(PROFILER.profiles_dir()))))
+        
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.accept)
+        
+        btn_layout.addWidget(self.open_dir_btn)
+        btn_layout.addWidget(self.close_btn)
+        
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+        
+    def refresh(self):
+        if not PROFILER.summaries:
+            self.report_text.setPlainText("No profiles recorded yet. Enable profiling and run an upload, preview or history refresh.")
+            return
+            
+        lines = []
+        for summary in PROFILER.summaries:
+            lines.append(f"{summary['timestamp']} - {summary['label']}: {summary['elapsed'] * 1000:.1f} ms, "
+                         f"peak {summary['peak_memory'] / 1024:.1f} KB")
+            
+            for func in summary['top_functions'][:5]:
+                lines.append(f"    {func['cumulative_seconds'] * 1000:8.1f} ms  {func['calls']:6} calls  {func['function']}")
+                
+            for allocation in summary['top_allocations'][:3]:
+                lines.append(f"    {allocation['size_diff'] / 1024:+8.1f} KB  {allocation['location']}")
+                
+            lines.append(f"    Report: {summary['report']}")
+            lines.append("")
+            
+        self.report_text.setPlainText("\n".join(lines))
+
+def load_encryption_key(settings: QSettings) -> bytes:
+    key = settings.value('encryption_key')
+    
+    if not key:
+        # Same format as Fernet.generate_key(), without importing cryptography at startup
+        key = base64.urlsafe_b64encode(os.urandom(32)).decode()
+        settings.setValue('encryption_key', key)
+        
+    return key.encode() if isinstance(key, str) else key
+
 class HistoryManager:
     def __init__(self, encryption_key=None):
         self.history_file = Path(QDir.homePath()) / f".{APP_NAME}" / HISTORY_FILE
         self.history_file.parent.mkdir(exist_ok=True)
         self.encryption_key = encryption_key
+        self._stamp = None
         self.history = self._load_history()
+        self._rebuild_index()
+        
+    @contextmanager
+    def _exclusive(self):
+        # The GUI, the CLI and the daemon share this file, so read-modify-write cycles are serialized
+        if fcntl is None:
+            yield
+            return
+            
+        with open(self.history_file.with_suffix(".lock"), 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                
+    def _file_stamp(self) -> Optional[tuple]:
+        try:
+            stat = self.history_file.stat()
+        except OSError:
+            return None
+        # os.replace gives every save a new inode, so this changes even within one mtime tick
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+            
+    def reload(self) -> bool:
+        if self._file_stamp() == self._stamp:
+            return False
+            
+        self.history = self._load_history()
+        self._rebuild_index()
+        return True
+        
+    @staticmethod
+    def entry_key(entry):
+        return entry.get('timestamp'), entry.get('url')
+        
+    def _rebuild_index(self):
+        self._by_key = {self.entry_key(entry): entry for entry in self.history}
+        self._expiry_heap = [(entry['expires_at'], self.entry_key(entry)) for entry in self.history
+                             if entry.get('expires_at') and not entry.get('expired')]
+        heapq.heapify(self._expiry_heap)
+        
+    def next_expiry(self) -> Optional[float]:
+        # Heap items for deleted or already swept entries are dropped lazily here
+        while self._expiry_heap:
+            expires_at, key = self._expiry_heap[0]
+            entry = self._by_key.get(key)
+            if entry is not None and not entry.get('expired') and entry.get('expires_at') == expires_at:
+                return expires_at
+            heapq.heappop(self._expiry_heap)
+        return None
+        
+    def sweep_expired(self, now: Optional[float] = None) -> List[dict]:
+        now = time.time() if now is None else now
+        expired = []
+        
+        with self._exclusive():
+            self.reload()
+            
+            while True:
+                expires_at = self.next_expiry()
+                if expires_at is None or expires_at > now:
+                    break
+                    
+                entry = self._by_key[heapq.heappop(self._expiry_heap)[1]]
+                entry['expired'] = True
+                expired.append(entry)
+                
+            if expired:
+                self.save_history()
+        return expired
         
     def _load_history(self):
-        if not self.history_file.exists():
+        self._stamp = self._file_stamp()
+        if self._stamp is None:
             return []
             
         try:
@@ -218,12 +1839,14 @@ class HistoryManager:
                 data = f.read()
                 
                 if self.encryption_key:
+                    from cryptography.fernet import Fernet
+                    
                     fernet = Fernet(self.encryption_key)
                     data = fernet.decrypt(data.encode()).decode()
                     
                 return json.loads(data)
         except Exception as e:
-            logging.error(f"Error loading history: {str(e)}")
+            logging.error("Error loading history", extra={'file': str(self.history_file), 'error': str(e)})
             return []
             
     def save_history(self):
@@ -231,44 +1854,86 @@ class HistoryManager:
             data = json.dumps(self.history)
             
             if self.encryption_key:
+                from cryptography.fernet import Fernet
+                
                 fernet = Fernet(self.encryption_key)
                 data = fernet.encrypt(data.encode()).decode()
                 
-            with open(self.history_file, 'w') as f:
+            # Readers in other processes see either the old file or the new one, never a partial write
+            temp_file = self.history_file.with_suffix(".tmp")
+            with open(temp_file, 'w') as f:
                 f.write(data)
+            os.replace(temp_file, self.history_file)
+            self._stamp = self._file_stamp()
                 
         except Exception as e:
-            logging.error(f"Error saving history: {str(e)}")
+            logging.error("Error saving history", extra={'file': str(self.history_file), 'error': str(e)})
             
-    def add_entry(self, data):
-        entry = {
-            'timestamp': datetime.now().isoformat(),
+    @staticmethod
+    def make_entry(data):
+        now = datetime.now()
+        expiration = int(data.get('expiration') or 0)
+        uploaded_at = int(data.get('time') or now.timestamp())
+        
+        return {
+            'timestamp': now.isoformat(),
+            'id': data.get('id'),
+            'expiration': expiration,
+            'expires_at': uploaded_at + expiration if expiration else None,
             'url': data.get('url'),
             'delete_url': data.get('delete_url'),
             'thumb_url': data.get('thumb', {}).get('url'),
             'filename': data.get('title'),
             'size': data.get('size'),
             'width': data.get('width'),
-            'height': data.get('height')
+            'height': data.get('height'),
+            'variants': data.get('variants') or []
         }
         
-        self.history.insert(0, entry)
+    def add_entry(self, data):
+        self.add_entries([data])
+        
+    def add_entries(self, items):
+        self.insert_entries([self.make_entry(data) for data in items])
         
-        if len(self.history) > 100:
-            self.history = self.history[:100]
+    def insert_entries(self, entries):
+        with self._exclusive():
+            self.reload()
+            self.history[:0] = reversed(entries)
             
-        self.save_history()
+            for entry in self.history[HISTORY_LIMIT:]:
+                self._by_key.pop(self.entry_key(entry), None)
+            del self.history[HISTORY_LIMIT:]
+            
+            # New entries sit at the front, so only they need indexing
+            for entry in self.history[:len(entries)]:
+                key = self.entry_key(entry)
+                self._by_key[key] = entry
+                if entry['expires_at']:
+                    heapq.heappush(self._expiry_heap, (entry['expires_at'], key))
+                    
+            self.save_history()
         
     def get_history(self):
         return self.history
         
     def clear_history(self):
-        self.history = []
-        self.save_history()
+        with self._exclusive():
+            self.history = []
+            self._rebuild_index()
+            self.save_history()
         
     def delete_entry(self, index):
         if 0 <= index < len(self.history):
-            del self.history[index]
+            self.remove_entries([self.history[index]])
+            
+    def remove_entries(self, entries):
+        keys = {self.entry_key(entry) for entry in entries}
+        
+        with self._exclusive():
+            self.reload()
+            self.history = [entry for entry in self.history if self.entry_key(entry) not in keys]
+            self._rebuild_index()
             self.save_history()
             
 class ThemeManager:
@@ -407,6 +2072,28 @@ class ThemeManager:
             }}
         """
 
+class DaemonProbeWorker(QThread):
+    probe_finished = pyqtSignal(object)
+    
+    def run(self):
+        self.probe_finished.emit(find_daemon())
+
+class SpeculativeUpload:
+    def __init__(self, worker: QThread, api_key: str, source, options: dict):
+        self.worker = worker
+        self.api_key = api_key
+        self.source = source
+        self.options = options
+        self.progress = 0
+        self.data = None
+        self.error = None
+        self.revealed = False
+        self.discarded = False
+        
+    def matches(self, api_key: str, source, options: dict) -> bool:
+        return (not self.revealed and not self.discarded and self.error is None and
+                self.api_key == api_key and self.source == source and self.options == options)
+
 class ImgBBUploader(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -415,32 +2102,84 @@ class ImgBBUploader(QMainWindow):
         self.setup_logging()
         
         self.image_path = None
+        self.image_data = None
+        self.clipboard_image = None
+        self.clipboard_options = None
         self.current_theme = self.settings.value('theme', DEFAULT_THEME)
+        self.upload_options = saved_upload_options()
         self.encryption_key = self._get_or_create_encryption_key()
-        self.history_manager = HistoryManager(self.encryption_key)
+        self._history_manager = None
+        self._link_cache = None
+        self.link_worker = None
+        self.speculative = None
+        self.delete_workers = set()
+        self.daemon_client = None
+        self.daemon_probe = None
+        self.history_list = None
+        self.startup_finished = False
+        
+        self.expiry_timer = QTimer(self)
+        self.expiry_timer.setSingleShot(True)
+        self.expiry_timer.timeout.connect(self.sweep_expired)
+        
+        # Whether a daemon is running is checked off the GUI thread and cached, never per upload
+        self.daemon_timer = QTimer(self)
+        self.daemon_timer.setInterval(DAEMON_PROBE_SECONDS * 1000)
+        self.daemon_timer.timeout.connect(self.probe_daemon)
         
         self.init_ui()
         self.load_saved_api_key()
         self.setAcceptDrops(True)
+        STARTUP.mark("window constructed")
+        
+    @property
+    def history_manager(self):
+        if self._history_manager is None:
+            self._history_manager = HistoryManager(self.encryption_key)
+        return self._history_manager
+        
+    @property
+    def link_cache(self):
+        if self._link_cache is None:
+            ttl_hours = float(self.settings.value('link_check_ttl_hours', DEFAULT_LINK_TTL / 3600))
+            self._link_cache = LinkHealthCache(ttl=ttl_hours * 3600)
+        return self._link_cache
+        
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        
+        if not self.startup_finished:
+            self.startup_finished = True
+            STARTUP.mark("first paint")
+            QTimer.singleShot(0, self.finish_startup)
+            
+    def finish_startup(self):
+        self.init_history_tab()
+        self.refresh_history()
+        STARTUP.mark("history loaded")
+        STARTUP.report()
         
-    def setup_logging(self):
-        log_path = Path(QDir.homePath()) / f".{APP_NAME}"
-        log_path.mkdir(exist_ok=True)
+        self.probe_daemon()
+        self.daemon_timer.start()
         
-        logging.basicConfig(
-            filename=str(log_path / 'imgbb_uploader.log'),
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+    def probe_daemon(self):
+        if self.daemon_probe is not None and self.daemon_probe.isRunning():
+            return
+            
+        self.daemon_probe = DaemonProbeWorker()
+        self.daemon_probe.probe_finished.connect(self.handle_daemon_probe)
+        self.daemon_probe.start()
         
-    def _get_or_create_encryption_key(self):
-        key = self.settings.value('encryption_key')
+    def handle_daemon_probe(self, client):
+        if (client is None) != (self.daemon_client is None):
+            logging.info("Upload daemon found" if client is not None else "Upload daemon not available")
+        self.daemon_client = client
         
-        if not key:
-            key = Fernet.generate_key().decode()
-            self.settings.setValue('encryption_key', key)
-            
-        return key.encode() if isinstance(key, str) else key
+    def setup_logging(self):
+        configure_logging()
+        
+    def _get_or_create_encryption_key(self):
+        return load_encryption_key(self.settings)
         
     def init_ui(self):
         self.setWindowTitle(f"{APP_AUTHOR}'s ImgBB Uploader v{VERSION}")
@@ -463,10 +2202,49 @@ class ImgBBUploader(QMainWindow):
         self.theme_action.triggered.connect(self.toggle_theme)
         self.toolbar.addAction(self.theme_action)
         
+        self.batch_action = QAction("Batch Upload", self)
+        self.batch_action.triggered.connect(self.show_batch_upload)
+        self.toolbar.addAction(self.batch_action)
+        
+        self.stats_action = QAction("Stats", self)
+        self.stats_action.triggered.connect(self.show_stats)
+        self.toolbar.addAction(self.stats_action)
+        
         self.about_action = QAction("About", self)
         self.about_action.triggered.connect(self.show_about)
         self.toolbar.addAction(self.about_action)
         
+        self.profile_action = QAction("Profiling", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setChecked(PROFILER.enabled)
+        self.profile_action.toggled.connect(self.toggle_profiling)
+        self.toolbar.addAction(self.profile_action)
+        
+        self.profile_report_action = QAction("Profile Report", self)
+        self.profile_report_action.triggered.connect(self.show_profile_report)
+        self.toolbar.addAction(self.profile_report_action)
+        
+        self.profile_action.setVisible(PROFILER.enabled)
+        self.profile_report_action.setVisible(PROFILER.enabled)
+        
+        self.speculative_action = QAction("Upload on Select", self)
+        self.speculative_action.setCheckable(True)
+        self.speculative_action.setChecked(self.settings.value('speculative_upload', False, type=bool))
+        self.speculative_action.setToolTip("Start uploading as soon as an image is chosen; "
+                                           "the copy is deleted again if the image or options change")
+        self.speculative_action.toggled.connect(self.toggle_speculative_upload)
+        self.toolbar.addAction(self.speculative_action)
+        
+        self.paste_action = QAction("Paste Image", self)
+        self.paste_action.setShortcut(QKeySequence.StandardKey.Paste)
+        self.paste_action.triggered.connect(self.paste_from_clipboard)
+        self.addAction(self.paste_action)
+        
+        self.reveal_profiling_action = QAction(self)
+        self.reveal_profiling_action.setShortcut(QKeySequence("Ctrl+Shift+P"))
+        self.reveal_profiling_action.triggered.connect(self.reveal_profiling)
+        self.addAction(self.reveal_profiling_action)
+        
         self.tab_widget = QTabWidget()
         
         self.upload_tab = QWidget()
@@ -484,11 +2262,16 @@ class ImgBBUploader(QMainWindow):
         self.upload_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.upload_btn.clicked.connect(self.upload_image)
         
+        self.url_btn = QPushButton("From URL")
+        self.url_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.url_btn.clicked.connect(self.enter_remote_url)
+        
         self.options_btn = QPushButton("Options")
         self.options_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.options_btn.clicked.connect(self.show_options)
         
         upload_btn_layout.addWidget(self.upload_btn)
+        upload_btn_layout.addWidget(self.url_btn)
         upload_btn_layout.addWidget(self.options_btn)
         
         image_layout = QVBoxLayout()
@@ -554,7 +2337,25 @@ class ImgBBUploader(QMainWindow):
         self.history_tab = QWidget()
         self.history_layout = QVBoxLayout(self.history_tab)
         
+        self.tab_widget.addTab(self.upload_tab, "Upload")
+        self.tab_widget.addTab(self.history_tab, "History")
+        
+        self.main_layout.addWidget(self.tab_widget)
+        
+        self.upload_btn.setToolTip("Click to select and upload an image")
+        self.options_btn.setToolTip("Configure upload options")
+        self.copy_btn.setToolTip("Copy the image URL to clipboard")
+        self.open_btn.setToolTip("Open the image in your web browser")
+        self.api_key_input.setToolTip("Enter your ImgBB API key here")
+        
+        self.apply_theme(self.current_theme)
+        
+    def init_history_tab(self):
+        if self.history_list is not None:
+            return
+            
         self.history_list = QListWidget()
+        self.history_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         self.history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.history_list.customContextMenuRequested.connect(self.show_history_context_menu)
         self.history_list.itemDoubleClicked.connect(self.copy_history_link)
@@ -567,27 +2368,22 @@ class ImgBBUploader(QMainWindow):
         self.clear_history_btn = QPushButton("Clear All")
         self.clear_history_btn.clicked.connect(self.clear_history)
         
+        self.verify_links_btn = QPushButton("Verify Links")
+        self.verify_links_btn.setToolTip("Check which history links still work (results are cached)")
+        self.verify_links_btn.clicked.connect(self.verify_links)
+        
+        self.remote_delete_btn = QPushButton("Delete from ImgBB...")
+        self.remote_delete_btn.setToolTip("Delete the selected or filtered uploads from ImgBB using their delete links")
+        self.remote_delete_btn.clicked.connect(self.show_bulk_delete)
+        
         history_btn_layout.addWidget(self.refresh_history_btn)
+        history_btn_layout.addWidget(self.verify_links_btn)
+        history_btn_layout.addWidget(self.remote_delete_btn)
         history_btn_layout.addWidget(self.clear_history_btn)
         
         self.history_layout.addWidget(self.history_list)
         self.history_layout.addLayout(history_btn_layout)
         
-        self.tab_widget.addTab(self.upload_tab, "Upload")
-        self.tab_widget.addTab(self.history_tab, "History")
-        
-        self.main_layout.addWidget(self.tab_widget)
-        
-        self.upload_btn.setToolTip("Click to select and upload an image")
-        self.options_btn.setToolTip("Configure upload options")
-        self.copy_btn.setToolTip("Copy the image URL to clipboard")
-        self.open_btn.setToolTip("Open the image in your web browser")
-        self.api_key_input.setToolTip("Enter your ImgBB API key here")
-        
-        self.apply_theme(self.current_theme)
-        
-        self.refresh_history()
-        
     def apply_theme(self, theme_name):
         self.current_theme = theme_name
         stylesheet = self.theme_manager.get_stylesheet(theme_name)
@@ -608,16 +2404,78 @@ class ImgBBUploader(QMainWindow):
         self.settings.setValue('api_key', self.api_key_input.text().strip())
         
     def refresh_history(self):
-        self.history_list.clear()
+        if self.history_list is None:
+            return
+            
+        with PROFILER.profile('history_refresh'):
+            # Picks up entries written by the daemon or the CLI since the last refresh
+            self.history_manager.reload()
+            self.history_list.clear()
+            
+            for entry in self.history_manager.get_history():
+                timestamp = datetime.fromisoformat(entry['timestamp'])
+                formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+                filename = entry.get('filename', 'Unnamed Image')
+                
+                item = QListWidgetItem(f"{formatted_time} - {filename}")
+                item.setData(Qt.ItemDataRole.UserRole, entry)
+                tooltip = []
+                
+                if entry.get('expires_at'):
+                    expires = datetime.fromtimestamp(entry['expires_at']).strftime("%Y-%m-%d %H:%M:%S")
+                    
+                    if entry.get('expired'):
+                        item.setText(f"{formatted_time} - {filename} (expired)")
+                        item.setForeground(QBrush(QColor("#808080")))
+                        font = item.font()
+                        font.setStrikeOut(True)
+                        item.setFont(font)
+                        tooltip.append(f"Expired {expires}, the link no longer works")
+                    else:
+                        tooltip.append(f"Expires {expires}")
+                        
+                health = self.link_cache.get(entry['url']) if entry.get('url') else None
+                if health is not None:
+                    checked = datetime.fromtimestamp(health['checked_at']).strftime("%Y-%m-%d %H:%M")
+                    
+                    if health['ok'] is True:
+                        item.setText(f"{item.text()}  ✓")
+                        tooltip.append(f"Link OK (HTTP {health['status']}), checked {checked}")
+                    elif health['ok'] is False:
+                        item.setText(f"{item.text()}  ✗ broken")
+                        item.setForeground(QBrush(QColor("#d9534f")))
+                        tooltip.append(f"Link broken (HTTP {health['status']}), checked {checked}")
+                    else:
+                        item.setText(f"{item.text()}  ?")
+                        tooltip.append(f"Link check inconclusive ({health['error']}), checked {checked}")
+                        
+                if entry.get('variants'):
+                    tooltip.append("Variants: " + ", ".join(variant['label'] for variant in entry['variants']))
+                    
+                item.setToolTip("\n".join(tooltip))
+                self.history_list.addItem(item)
+                
+        self.schedule_expiry_sweep()
         
-        for entry in self.history_manager.get_history():
-            timestamp = datetime.fromisoformat(entry['timestamp'])
-            formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            filename = entry.get('filename', 'Unnamed Image')
+    def schedule_expiry_sweep(self):
+        next_expiry = self.history_manager.next_expiry()
+        
+        if next_expiry is None:
+            self.expiry_timer.stop()
+            return
             
-            item = QListWidgetItem(f"{formatted_time} - {filename}")
-            item.setData(Qt.ItemDataRole.UserRole, entry)
-            self.history_list.addItem(item)
+        # QTimer intervals are 32-bit milliseconds, so far-off expiries wake up daily and re-arm
+        delay = min(max(0.0, next_expiry - time.time()), 86400.0)
+        self.expiry_timer.start(int(delay * 1000) + 1)
+        
+    def sweep_expired(self):
+        expired = self.history_manager.sweep_expired()
+        
+        if expired:
+            logging.info("History entries expired", extra={'count': len(expired)})
+            self.refresh_history()
+        else:
+            self.schedule_expiry_sweep()
             
     def show_history_context_menu(self, position):
         item = self.history_list.itemAt(position)
@@ -626,17 +2484,63 @@ class ImgBBUploader(QMainWindow):
             menu = QMenu()
             
             copy_action = menu.addAction("Copy URL")
+            copy_variants_action = None
+            if item.data(Qt.ItemDataRole.UserRole).get('variants'):
+                copy_variants_action = menu.addAction("Copy Variant URLs")
             open_action = menu.addAction("Open in Browser")
             delete_action = menu.addAction("Delete")
+            remote_delete_action = menu.addAction("Delete from ImgBB...")
             
             action = menu.exec(self.history_list.mapToGlobal(position))
             
             if action == copy_action:
                 self.copy_history_link(item)
+            elif action is not None and action == copy_variants_action:
+                self.copy_variant_links(item)
             elif action == open_action:
                 self.open_history_link(item)
             elif action == delete_action:
                 self.delete_history_item(item)
+            elif action == remote_delete_action:
+                self.show_bulk_delete()
+                
+    def verify_links(self):
+        if self.link_worker is not None:
+            return
+            
+        urls = [entry['url'] for entry in self.history_manager.get_history() if entry.get('url')]
+        options = {
+            'concurrency': int(self.settings.value('link_check_concurrency', DEFAULT_LINK_CONCURRENCY)),
+            'rate': float(self.settings.value('link_check_rate', DEFAULT_LINK_RATE))
+        }
+        
+        self.verify_links_btn.setEnabled(False)
+        self.links_checked = 0
+        self.status_bar.showMessage(f"Verifying {len(urls)} links...")
+        
+        self.link_worker = LinkCheckWorker(urls, self.link_cache, options)
+        self.link_worker.link_checked.connect(self.handle_link_checked)
+        self.link_worker.check_finished.connect(self.handle_links_verified)
+        self.link_worker.start()
+        
+    def handle_link_checked(self, result):
+        self.links_checked += 1
+        self.status_bar.showMessage(f"Verified {self.links_checked} of {len(self.link_worker.urls)} links...")
+        
+    def handle_links_verified(self, summary):
+        self.link_worker = None
+        self.verify_links_btn.setEnabled(True)
+        self.refresh_history()
+        
+        self.status_bar.showMessage(f"Links: {summary['alive']} OK, {summary['dead']} broken, "
+                                    f"{summary['unknown']} inconclusive, {summary['cached']} from cache", 8000)
+        
+    def show_bulk_delete(self):
+        selected = [item.data(Qt.ItemDataRole.UserRole) for item in self.history_list.selectedItems()]
+        
+        dialog = BulkDeleteDialog(self, self.history_manager, selected)
+        dialog.exec()
+        self.refresh_history()
                 
     def copy_history_link(self, item):
         entry = item.data(Qt.ItemDataRole.UserRole)
@@ -647,6 +2551,14 @@ class ImgBBUploader(QMainWindow):
             clipboard.setText(url)
             self.status_bar.showMessage("Link copied to clipboard", 3000)
             
+    def copy_variant_links(self, item):
+        entry = item.data(Qt.ItemDataRole.UserRole)
+        lines = [f"{variant['label']}: {variant['url']}" for variant in entry.get('variants', []) if variant.get('url')]
+        
+        if lines:
+            QApplication.clipboard().setText("\n".join(lines))
+            self.status_bar.showMessage(f"{len(lines)} variant links copied to clipboard", 3000)
+            
     def open_history_link(self, item):
         entry = item.data(Qt.ItemDataRole.UserRole)
         url = entry.get('url', '')
@@ -655,9 +2567,10 @@ class ImgBBUploader(QMainWindow):
             QDesktopServices.openUrl(QUrl(url))
             
     def delete_history_item(self, item):
-        row = self.history_list.row(item)
-        self.history_list.takeItem(row)
-        self.history_manager.delete_entry(row)
+        # The manager may have reloaded entries from the daemon or the CLI since this list was built, so rows
+        # no longer line up with its entries; remove the entry itself rather than whatever sits at this row
+        self.history_list.takeItem(self.history_list.row(item))
+        self.history_manager.remove_entries([item.data(Qt.ItemDataRole.UserRole)])
         
     def clear_history(self):
         confirm = QMessageBox.question(
@@ -675,11 +2588,39 @@ class ImgBBUploader(QMainWindow):
         dialog = OptionsDialog(self)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.upload_options = dialog.get_options()
+            options = dialog.get_options()
+            changed = options != self.upload_options
+            self.upload_options = options
             self.status_bar.showMessage("Options updated", 3000)
+            
+            if changed and self.speculative is not None:
+                self.start_speculative_upload()
         else:
             pass
 
+    def show_batch_upload(self):
+        dialog = BatchUploadDialog(self, self.api_key_input.text().strip(), self.history_manager)
+        dialog.exec()
+        self.refresh_history()
+        
+    def show_stats(self):
+        dialog = MetricsDialog(self)
+        dialog.exec()
+        
+    def reveal_profiling(self):
+        visible = not self.profile_action.isVisible()
+        self.profile_action.setVisible(visible)
+        self.profile_report_action.setVisible(visible)
+        
+    def toggle_profiling(self, enabled):
+        PROFILER.enabled = enabled
+        state = "enabled" if enabled else "disabled"
+        self.status_bar.showMessage(f"Profiling {state} - reports in {PROFILER.profiles_dir()}", 5000)
+        
+    def show_profile_report(self):
+        dialog = ProfileReportDialog(self)
+        dialog.exec()
+        
     def show_about(self):
 
         class AboutDialog(QDialog):
@@ -737,7 +2678,7 @@ class ImgBBUploader(QMainWindow):
 
                 github_button = QPushButton("Visit GitHub")
                 github_button.setIcon(QIcon.fromTheme("internet-services"))
-                github_button.clicked.connect(lambda: webbrowser.open("https://github.com/Nrentzilas/ImgBB-Uploader"))
+                github_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl("https://github.com/Nrentzilas/ImgBB-Uploader")))
 
                 close_button = QPushButton("Close")
                 close_button.clicked.connect(self.close)
@@ -756,18 +2697,19 @@ class ImgBBUploader(QMainWindow):
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             for url in event.mimeData().urls():
-                file_path = url.toLocalFile()
-                if Path(file_path).suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']:
+                if url.isLocalFile() and not probe_image(url.toLocalFile())['error']:
                     event.accept()
                     return
         event.ignore()
         
     def dropEvent(self, event: QDropEvent):
-        files = [u.toLocalFile() for u in event.mimeData().urls()]
-        for file_path in files:
-            if Path(file_path).suffix.lower() in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp']:
-                self.handle_image(file_path)
+        files = [u.toLocalFile() for u in event.mimeData().urls() if u.isLocalFile()]
+        for info in probe_images(files):
+            if not info['error']:
+                self.handle_image(info['path'], info)
                 break
+        else:
+            self.status_bar.showMessage("Error: No supported image in the dropped files", 3000)
                 
     def paste_from_clipboard(self):
         clipboard = QApplication.clipboard()
@@ -776,51 +2718,94 @@ class ImgBBUploader(QMainWindow):
         if mime_data.hasImage():
             image = clipboard.image()
             if not image.isNull():
-                temp_file = QTemporaryFile(QDir.tempPath() + "/imgbb_clipboard_XXXXXX.png")
+                self.handle_clipboard_image(image)
                 
-                if temp_file.open():
-                    temp_path = temp_file.fileName()
-                    image.save(temp_path, "PNG")
-                    temp_file.close()
-                    
-                    self.handle_image(temp_path)
-                    
-                    logging.info(f"Image pasted from clipboard and saved to {temp_path}")
-                    self.status_bar.showMessage("Image pasted from clipboard", 3000)
-                else:
-                    self.status_bar.showMessage("Failed to create temporary file", 3000)
+                logging.info("Image pasted from clipboard", extra={'bytes': len(self.image_data)})
+                self.status_bar.showMessage("Image pasted from clipboard", 3000)
             else:
                 self.status_bar.showMessage("No valid image in clipboard", 3000)
         else:
             self.status_bar.showMessage("No image found in clipboard", 3000)
             
-    def handle_image(self, file_path):
-        try:
-            self.image_path = file_path
-            
-            file_size = Path(file_path).stat().st_size
-            if file_size > MAX_IMAGE_SIZE:
-                raise ImageSizeError(f"Image size exceeds {MAX_IMAGE_SIZE // (1024 * 1024)}MB limit")
-                
-            pixmap = QPixmap(file_path)
-            scaled_pixmap = pixmap.scaled(
+    def encode_clipboard_image(self, image: QImage, options: dict) -> bytes:
+        if options.get('resize', False):
+            image = scale_to_fit(image, options.get('max_dimension', 1024))
+        return encode_qimage(image, options.get('format', "PNG"), options.get('quality', -1))
+        
+    def handle_clipboard_image(self, image: QImage):
+        options = dict(self.upload_options)
+        
+        self.image_path = None
+        self.clipboard_image = image
+        self.clipboard_options = options
+        self.image_data = self.encode_clipboard_image(image, options)
+        
+        with PROFILER.profile('preview'):
+            self.image_label.setPixmap(QPixmap.fromImage(image).scaled(
                 self.image_label.width(),
                 self.image_label.height(),
                 Qt.AspectRatioMode.KeepAspectRatio,
                 Qt.TransformationMode.SmoothTransformation
-            )
-            self.image_label.setPixmap(scaled_pixmap)
+            ))
             
-            file_info = Path(file_path)
-            size_kb = file_size / 1024
-            size_mb = size_kb / 1024
+        image_format = options.get('format', "PNG")
+        self.image_info.setText(f"Clipboard image - {image.width()}x{image.height()} - "
+                                f"{len(self.image_data) / 1024:.2f} KB {image_format}")
+        
+        if self.tab_widget.currentIndex() == 1:
+            self.tab_widget.setCurrentIndex(0)
             
-            if size_mb >= 1:
-                size_str = f"{size_mb:.2f} MB"
+        self.link_display.clear()
+        self.copy_btn.setDisabled(True)
+        self.open_btn.setDisabled(True)
+        
+        self.start_speculative_upload()
+        
+    def enter_remote_url(self):
+        url, ok = QInputDialog.getText(self, "Upload from URL", "Image URL:")
+        url = url.strip()
+        
+        if ok and url:
+            if is_remote_url(url):
+                self.handle_remote_url(url)
             else:
-                size_str = f"{size_kb:.2f} KB"
+                self.status_bar.showMessage("Error: URL must start with http:// or https://", 3000)
                 
-            self.image_info.setText(f"{file_info.name} - {pixmap.width()}x{pixmap.height()} - {size_str}")
+    def handle_remote_url(self, url):
+        self.image_path = url
+        self.image_data = None
+        self.clipboard_image = None
+        
+        self.image_label.clear()
+        self.image_label.setText("Remote image\n(ImgBB fetches it directly)")
+        self.image_info.setText(url)
+        
+        if self.tab_widget.currentIndex() == 1:
+            self.tab_widget.setCurrentIndex(0)
+            
+        self.link_display.clear()
+        self.copy_btn.setDisabled(True)
+        self.open_btn.setDisabled(True)
+        
+        self.status_bar.showMessage("Remote URL set", 3000)
+        self.start_speculative_upload()
+        
+    def handle_image(self, file_path, info: Optional[dict] = None):
+        try:
+            self.image_path = file_path
+            self.image_data = None
+            self.clipboard_image = None
+            
+            info = check_probe(info or probe_image(file_path))
+                
+            with PROFILER.profile('preview'):
+                image = load_preview(file_path, self.image_label.width(), self.image_label.height())
+                self.image_label.setPixmap(QPixmap.fromImage(image))
+            
+            file_info = Path(file_path)
+            width, height = display_size(info)
+                
+            self.image_info.setText(f"{file_info.name} - {width}x{height} - {format_size(info['size'])}")
             
             if self.tab_widget.currentIndex() == 1:
                 self.tab_widget.setCurrentIndex(0)
@@ -830,18 +2815,23 @@ class ImgBBUploader(QMainWindow):
             self.open_btn.setDisabled(True)
             
             self.status_bar.showMessage(f"Image loaded: {file_info.name}", 3000)
+            self.start_speculative_upload()
             
         except ImageSizeError as e:
             self.link_display.setText(f"Error: {str(e)}")
             self.status_bar.showMessage(f"Error: {str(e)}", 5000)
-            logging.error(f"Image size error: {str(e)}")
+            logging.error("Image size error", extra={'file': file_path, 'error': str(e)})
+        except InvalidImageError as e:
+            self.link_display.setText(f"Error: {str(e)}")
+            self.status_bar.showMessage("Error: Unsupported image", 5000)
+            logging.error("Invalid image", extra={'file': file_path, 'error': str(e)})
         except Exception as e:
             self.link_display.setText(f"Error: Could not load image - {str(e)}")
-            self.status_bar.showMessage(f"Error loading image", 3000)
-            logging.error(f"Error loading image: {str(e)}")
+            self.status_bar.showMessage("Error loading image", 3000)
+            logging.error("Error loading image", extra={'file': file_path, 'error': str(e)})
             
     def upload_image(self):
-        if not self.image_path:
+        if not self.image_path and self.image_data is None:
             file_path, _ = QFileDialog.getOpenFileName(
                 self,
                 "Select Image",
@@ -861,20 +2851,156 @@ class ImgBBUploader(QMainWindow):
             return
             
         self.save_api_key()
-        
-        options = getattr(self, 'upload_options', {})
+        source, options = self.pending_upload()
         
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.upload_btn.setDisabled(True)
+        self.url_btn.setDisabled(True)
         self.options_btn.setDisabled(True)
         
-        self.upload_worker = UploadWorker(api_key, self.image_path, options)
+        speculative = self.speculative
+        if speculative is not None and speculative.matches(api_key, source, options):
+            # The upload already started when the image was chosen; the click only reveals it
+            speculative.revealed = True
+            speculative.worker.set_priority(PRIORITY_INTERACTIVE)
+            self.progress_bar.setValue(speculative.progress)
+            if speculative.data is not None:
+                self.handle_upload_success(speculative.data)
+            return
+            
+        self.discard_speculative_upload()
+        
+        if getattr(self, 'upload_worker', None) is not None and self.upload_worker.isRunning():
+            self.upload_worker.cancel()
+            
+        self.upload_worker = self.create_upload_worker(api_key, source, options)
         self.upload_worker.upload_progress.connect(self.update_progress)
         self.upload_worker.upload_complete.connect(self.handle_upload_success)
         self.upload_worker.upload_error.connect(self.handle_upload_error)
         self.upload_worker.start()
         
+    def pending_upload(self) -> tuple:
+        options = self.upload_options
+        source = self.image_path
+        
+        if self.image_data is not None:
+            if options != self.clipboard_options:
+                self.image_data = self.encode_clipboard_image(self.clipboard_image, options)
+                self.clipboard_options = dict(options)
+            # Already scaled and encoded in memory, so the worker must not decode it again
+            source = self.image_data
+            options = dict(options, resize=False)
+            
+        return source, options
+        
+    def create_upload_worker(self, api_key: str, source, options: dict) -> QThread:
+        # Paths and URLs go to a running daemon so its connections and job coalescing are shared;
+        # in-memory clipboard images are uploaded from this process
+        client = self.daemon_client if isinstance(source, str) else None
+        
+        if client is not None:
+            logging.info("Uploading through the local daemon", extra={'file': source_label(source)})
+            worker = DaemonUploadWorker(client, api_key, source, options)
+            # The daemon may have gone away since the last probe; check again instead of waiting for the timer
+            worker.upload_error.connect(lambda message: self.probe_daemon())
+            return worker
+        return UploadWorker(api_key, source, options)
+        
+    def toggle_speculative_upload(self, enabled):
+        self.settings.setValue('speculative_upload', enabled)
+        
+        if enabled:
+            self.start_speculative_upload()
+        else:
+            self.discard_speculative_upload()
+            
+    def start_speculative_upload(self):
+        self.discard_speculative_upload()
+        
+        api_key = self.api_key_input.text().strip()
+        if not self.speculative_action.isChecked() or not api_key:
+            return
+        if not self.image_path and self.image_data is None:
+            return
+            
+        source, options = self.pending_upload()
+        # A guess must not take the interactive slot or overtake running batches until the user asks for it
+        worker = self.create_upload_worker(api_key, source, dict(options, priority=PRIORITY_BACKGROUND))
+        speculative = SpeculativeUpload(worker, api_key, source, options)
+        
+        worker.upload_progress.connect(lambda value: self.handle_speculative_progress(speculative, value))
+        worker.upload_complete.connect(lambda data: self.handle_speculative_complete(speculative, data))
+        worker.upload_error.connect(lambda message: self.handle_speculative_error(speculative, message))
+        
+        self.speculative = speculative
+        worker.start()
+        logging.info("Speculative upload started", extra={'file': source_label(source)})
+        
+    def discard_speculative_upload(self):
+        speculative, self.speculative = self.speculative, None
+        if speculative is None or speculative.revealed:
+            return
+            
+        speculative.discarded = True
+        speculative.worker.cancel()
+        
+        if speculative.data is not None:
+            self.delete_remote_copy(speculative.data)
+            
+    def handle_speculative_progress(self, speculative, value):
+        speculative.progress = value
+        if speculative.revealed and not speculative.discarded:
+            self.update_progress(value)
+            
+    def handle_speculative_complete(self, speculative, data):
+        speculative.data = data
+        
+        if speculative.discarded:
+            # The upload finished before the cancel reached it, so remove the copy nobody asked for
+            self.delete_remote_copy(data)
+        elif speculative.revealed:
+            self.handle_upload_success(data)
+            
+    def handle_speculative_error(self, speculative, message):
+        speculative.error = message
+        
+        if speculative.revealed and not speculative.discarded:
+            self.handle_upload_error(message)
+            
+    def delete_remote_copy(self, data: dict):
+        logging.info("Deleting discarded speculative upload", extra={'url': data.get('url')})
+        
+        worker = BulkDeleteWorker([data])
+        worker.finished.connect(lambda: self.delete_workers.discard(worker))
+        self.delete_workers.add(worker)
+        worker.start()
+        
+    def closeEvent(self, event):
+        speculative, self.speculative = self.speculative, None
+        
+        if speculative is not None and not speculative.revealed:
+            speculative.discarded = True
+            speculative.worker.cancel()
+            
+            # The worker may still be waiting on the server and finish after the cancel, so let it end
+            # first; its signals will not be delivered any more, so the result is read from the worker
+            self.hide()
+            speculative.worker.wait()
+            data = speculative.data or speculative.worker.data
+            
+            if data is not None:
+                import asyncio
+                # No event loop will run after this, so the remote copy is deleted before the window closes
+                asyncio.run(BulkDeleteWorker([data], {'max_retries': 0}).perform_deletes())
+                
+        for worker in list(self.delete_workers):
+            worker.wait()
+        if self.daemon_probe is not None:
+            self.daemon_probe.wait()
+            
+        super().closeEvent(event)
+        
     def update_progress(self, value):
         self.progress_bar.setValue(value)
         
@@ -884,22 +3010,22 @@ class ImgBBUploader(QMainWindow):
         self.open_btn.setEnabled(True)
         self.progress_bar.setVisible(False)
         self.upload_btn.setEnabled(True)
+        self.url_btn.setEnabled(True)
         self.options_btn.setEnabled(True)
         
         self.history_manager.add_entry(data)
         self.refresh_history()
         
         self.status_bar.showMessage("Upload successful!", 3000)
-        logging.info(f"Successfully uploaded image: {self.image_path}")
         
     def handle_upload_error(self, error_message):
         self.link_display.setText(f"Error: {error_message}")
         self.progress_bar.setVisible(False)
         self.upload_btn.setEnabled(True)
+        self.url_btn.setEnabled(True)
         self.options_btn.setEnabled(True)
         
         self.status_bar.showMessage(f"Upload failed: {error_message}", 5000)
-        logging.error(f"Upload failed: {error_message}")
         
     def copy_link(self):
         clipboard = QApplication.clipboard()
@@ -916,13 +3042,405 @@ class ImgBBUploader(QMainWindow):
             QDesktopServices.openUrl(QUrl(link))
             self.status_bar.showMessage("Opening in browser", 3000)
 
+class BatchUploadWorker(QThread):
+    file_started = pyqtSignal(str)
+    file_finished = pyqtSignal(dict)
+    batch_finished = pyqtSignal(dict)
+    
+    def __init__(self, api_key: str, sources: List[str], options: dict = None, keep_results: bool = True):
+        super().__init__()
+        self.api_key = api_key
+        self.sources = sources
+        self.options = options or {}
+        self.keep_results = keep_results
+        self.results = []
+        self.group = f"batch-{id(self)}"
+        
+    def pause(self):
+        SCHEDULER.pause_group(self.group)
+        
+    def resume(self):
+        SCHEDULER.resume_group(self.group)
+        
+    def cancel(self):
+        SCHEDULER.cancel_group(self.group)
+        
+    def run(self):
+        import asyncio
+        
+        with PROFILER.profile('batch_upload'):
+            summary = asyncio.run(self.perform_uploads())
+            
+        self.batch_finished.emit(summary)
+        
+    async def perform_uploads(self) -> dict:
+        import asyncio
+        import aiohttp
+        
+        summary = {'total': len(self.sources), 'successful': 0, 'failed': 0, 'cancelled': 0}
+        semaphore = asyncio.Semaphore(self.options.get('concurrency', DEFAULT_BATCH_CONCURRENCY))
+        priority = self.options.get('priority', PRIORITY_BATCH)
+        # Jobs exist up front so pausing or cancelling the batch also covers files that have not started
+        jobs = [SCHEDULER.create_job(source, priority, self.group) for source in self.sources]
+        
+        async with aiohttp.ClientSession(trace_configs=[create_trace_config()]) as session:
+            async def upload(source, job):
+                async with semaphore:
+                    result = await self.upload_one(session, source, job)
+                    
+                if result.get('cancelled'):
+                    summary['cancelled'] += 1
+                else:
+                    summary['successful' if result['success'] else 'failed'] += 1
+                if self.keep_results:
+                    self.results.append(result)
+                self.file_finished.emit(result)
+                
+            await asyncio.gather(*(upload(source, job) for source, job in zip(self.sources, jobs)))
+            
+        return summary
+        
+    async def upload_one(self, session, source: str, job: UploadJob) -> dict:
+        import asyncio
+        
+        trace = UploadTrace(source)
+        result = {'source': source, 'filename': display_name(source), 'success': False}
+        state = 'failed'
+        
+        try:
+            job.raise_if_cancelled()
+            self.file_started.emit(source)
+            url = self.options.get('endpoint') or configured_endpoint()
+            data = None
+            
+            if needs_local_copy(source, self.options):
+                file_data = await run_interruptible(job, self._download(session, source, trace), pausable=False)
+            elif is_remote_url(source):
+                try:
+                    data = await self._post_with_retries(session, url, source, trace, job)
+                except UploadHTTPError as e:
+                    if not should_relay(e.status, self.options):
+                        raise
+                    file_data = await run_interruptible(job, self._download(session, source, trace), pausable=False)
+            else:
+                with trace.stage('probe'):
+                    await asyncio.to_thread(validate_image_file, source)
+                    
+                with trace.stage('read'):
+                    with open(source, 'rb') as f:
+                        file_data = f.read()
+                trace.add_bytes('read', len(file_data))
+                
+            if data is None and self.options.get('variants'):
+                data = await self._upload_variants(session, url, file_data, trace, job)
+                
+            if data is None:
+                if self.options.get('resize', False) or self.options.get('optimize', False):
+                    file_data = await asyncio.to_thread(prepare_image_data, file_data, self.options, trace)
+                job.raise_if_cancelled()
+                data = await self._post_with_retries(session, url, file_data, trace, job)
+                
+            data = upload_response_data(data)
+            result.update(success=True, url=data['url'], data=data)
+            state = 'done'
+            
+        except JobCancelled:
+            result.update(cancelled=True, error="Upload cancelled")
+            trace.error = "cancelled"
+            state = 'cancelled'
+        except Exception as e:
+            result['error'] = str(e)
+            trace.error = str(e)
+        finally:
+            SCHEDULER.finish_job(job, state)
+            trace.finish(result['success'])
+            result['duration'] = round(trace.stages['total'], 4)
+            
+        return result
+        
+    async def _upload_variants(self, session, url: str, image_data: bytes, trace: UploadTrace, job: UploadJob) -> dict:
+        import asyncio
+        
+        variants = await asyncio.to_thread(make_variants, image_data, self.options['variants'], self.options, trace)
+        job.raise_if_cancelled()
+        
+        plan = VariantUploads(job, variants)
+        
+        async def upload(data, child, child_trace):
+            try:
+                result = await self._post_with_retries(session, url, data, child_trace, child)
+            except BaseException:
+                plan.child_finished(child, False)
+                raise
+                
+            plan.child_finished(child, True)
+            return result
+            
+        results = await asyncio.gather(*(upload(*item) for item in plan.uploads()), return_exceptions=True)
+        # finish() may delete a partial set over its own connection, so it runs off this loop
+        return await asyncio.to_thread(plan.finish, trace, results)
+        
+    async def _download(self, session, source: str, trace: UploadTrace) -> bytes:
+        import aiohttp
+        
+        chunks = []
+        total = 0
+        timeout = aiohttp.ClientTimeout(total=self.options.get('timeout', DEFAULT_TIMEOUT))
+        
+        with trace.stage('download'):
+            async with session.get(source, timeout=timeout) as response:
+                if response.status != 200:
+                    raise UploadHTTPError(response.status, f"could not download {source}")
+                    
+                async for chunk in response.content.iter_chunked(65536):
+                    total += len(chunk)
+                    check_image_size(total)
+                    chunks.append(chunk)
+                    
+        trace.add_bytes('download', total)
+        return b"".join(chunks)
+        
+    async def _post_with_retries(self, session, url: str, image: Union[bytes, str],
+                                 trace: UploadTrace, job: UploadJob) -> dict:
+        while True:
+            try:
+                async with SCHEDULER.async_slot(job):
+                    return await self._send_with_retries(session, url, image, trace, job)
+            except JobPaused:
+                # The slot is released while paused; the job queues again and restarts from the first attempt
+                continue
+                
+    async def _send_with_retries(self, session, url: str, image: Union[bytes, str],
+                                 trace: UploadTrace, job: UploadJob) -> dict:
+        import asyncio
+        import aiohttp
+        
+        max_retries = self.options.get('max_retries', DEFAULT_MAX_RETRIES)
+        timeout = aiohttp.ClientTimeout(total=self.options.get('timeout', DEFAULT_TIMEOUT))
+        params = upload_params(self.api_key, self.options)
+        body, content_type = encode_upload_form(image)
+        headers = {'Content-Type': content_type, 'Content-Length': str(len(body))}
+        
+        async def attempt_post(upload_body):
+            # Streaming through UploadBody lets a pause abort the request only while the body is still going out
+            async with session.post(url, data=upload_body.iter_chunks(), params=params, headers=headers,
+                                    timeout=timeout, trace_request_ctx=trace) as response:
+                trace.add_marked_network(len(body))
+                trace.status = response.status
+                
+                delay = status_retry_delay(response.status, trace.attempt, max_retries, response.headers.get('Retry-After'))
+                if delay is not None:
+                    return delay, None
+                    
+                if response.status != 200:
+                    raise UploadHTTPError(response.status, await response.text())
+                    
+                with trace.stage('response'):
+                    content = await response.read()
+                    trace.add_bytes('response', len(content))
+                    return None, json.loads(content)
+                    
+        for attempt in range(1, max_retries + 2):
+            trace.attempt = attempt
+            trace.marks.clear()
+            upload_body = UploadBody(body, job)
+            
+            try:
+                delay, data = await run_interruptible(job, attempt_post(upload_body), pausable=False)
+                if delay is None:
+                    return data
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = connection_retry_delay(upload_body, attempt, max_retries)
+                if delay is None:
+                    raise
+                
+            await run_interruptible(job, asyncio.sleep(delay))
+
+def result_record(result: dict) -> dict:
+    data = result.get('data') or {}
+    return {
+        'filename': result.get('filename'),
+        'source': result.get('source'),
+        'success': result.get('success', False),
+        'url': result.get('url'),
+        'delete_url': data.get('delete_url'),
+        'size': data.get('size'),
+        'width': data.get('width'),
+        'height': data.get('height'),
+        'duration': result.get('duration'),
+        'error': result.get('error')
+    }
+
+class ResultSink:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.format = 'csv' if self.path.suffix.lower() == '.csv' else 'jsonl'
+        self.count = 0
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+        
+        if self.format == 'csv':
+            self._writer = csv.DictWriter(self._file, fieldnames=RESULT_FIELDS)
+            self._writer.writeheader()
+            
+    def write(self, record: dict):
+        if self.format == 'csv':
+            self._writer.writerow(record)
+        else:
+            self._file.write(json.dumps(record) + "\n")
+            
+        # Flush every record so a crash mid-batch still leaves everything finished so far on disk
+        self._file.flush()
+        self.count += 1
+        
+    def close(self):
+        self._file.close()
+        
+    @staticmethod
+    def read_records(path):
+        path = Path(path)
+        with open(path, newline='', encoding='utf-8') as f:
+            if path.suffix.lower() == '.csv':
+                for row in csv.DictReader(f):
+                    row['success'] = row['success'] == 'True'
+                    yield row
+            else:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+class DuplicateScanWorker(QThread):
+    scan_finished = pyqtSignal(list)
+    
+    def __init__(self, paths: List[str], threshold: int = DEFAULT_THRESHOLD):
+        super().__init__()
+        self.paths = paths
+        self.threshold = threshold
+        
+    def run(self):
+        with PROFILER.profile('dedup'):
+            self.scan_finished.emit(self.find_duplicates())
+            
+    def find_duplicates(self) -> List[List[str]]:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        start = time.perf_counter()
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+            thumbnails = list(executor.map(grayscale_thumbnail, self.paths, chunksize=32))
+            
+        decoded = [i for i, thumbnail in enumerate(thumbnails) if thumbnail is not None]
+        hashes = [None] * len(self.paths)
+        for i, value in zip(decoded, dhash_many([thumbnails[i][0] for i in decoded])):
+            hashes[i] = value
+            
+        clusters = []
+        for group in cluster_hashes(hashes, self.threshold):
+            # Keep the largest image of each cluster first, it is the one worth uploading
+            group.sort(key=lambda i: thumbnails[i][1], reverse=True)
+            clusters.append([self.paths[i] for i in group])
+            
+        logging.info("Duplicate scan finished", extra={'count': len(clusters), 'total': len(self.paths),
+                                                       'duration': round(time.perf_counter() - start, 4)})
+        return clusters
+
+def thumbnail_key(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    # An edited file gets a new key, so a stale thumbnail is never shown for it
+    return path, stat.st_mtime_ns, stat.st_size
+
+class ThumbnailCache:
+    def __init__(self, max_entries: int = THUMBNAIL_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        
+    def __contains__(self, key) -> bool:
+        return key in self.entries
+        
+    def get(self, key) -> Optional[QIcon]:
+        icon = self.entries.get(key)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        return icon
+        
+    def put(self, key, icon: Optional[QIcon]):
+        # None records a file that failed to decode so it is not retried on every scroll
+        self.entries[key] = icon
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+THUMBNAILS = ThumbnailCache()
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, loader: "ThumbnailLoader", key: tuple):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        
+    def run(self):
+        # The row may have scrolled out of view while this task waited in the pool
+        if self.key not in self.loader.wanted:
+            self.loader.thumbnail_skipped.emit(self.key)
+            return
+            
+        try:
+            image = load_preview(self.key[0], THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        except InvalidImageError:
+            image = QImage()
+        self.loader.thumbnail_ready.emit(self.key, image)
+
+class ThumbnailLoader(QObject):
+    thumbnail_ready = pyqtSignal(object, QImage)
+    thumbnail_skipped = pyqtSignal(object)
+    thumbnails_changed = pyqtSignal()
+    
+    def __init__(self, cache: ThumbnailCache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.wanted = set()
+        self.queued = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(THUMBNAIL_THREADS)
+        self.thumbnail_ready.connect(self.store)
+        self.thumbnail_skipped.connect(self.discard)
+        
+    def request(self, keys: List[tuple]):
+        self.wanted = set(keys)
+        
+        for key in keys:
+            if key not in self.queued and key not in self.cache:
+                self.queued.add(key)
+                self.pool.start(ThumbnailTask(self, key))
+                
+    def store(self, key: tuple, image: QImage):
+        # Pixmaps can only be made on the GUI thread, so the pool hands back QImages
+        self.queued.discard(key)
+        self.cache.put(key, None if image.isNull() else QIcon(QPixmap.fromImage(image)))
+        self.thumbnails_changed.emit()
+        
+    def discard(self, key: tuple):
+        self.queued.discard(key)
+        
+    def shutdown(self):
+        self.wanted = set()
+        self.pool.clear()
+        self.pool.waitForDone()
+
 class BatchUploadDialog(QDialog):
-    def __init__(self, parent=None, api_key=""):
+    def __init__(self, parent=None, api_key="", history_manager=None):
         super().__init__(parent)
         self.api_key = api_key
+        self.history_manager = history_manager
         self.files = []
-        self.results = []
-        self.upload_options = {}
+        self.completed = 0
+        self.uploaded_data = deque(maxlen=HISTORY_LIMIT)
+        self.upload_options = saved_upload_options()
+        self.sink = None
+        self.sink_path = None
+        self.thumbnails = ThumbnailLoader(THUMBNAILS, self)
         
         self.setWindowTitle("Batch Upload")
         self.resize(600, 400)
@@ -932,23 +3450,46 @@ class BatchUploadDialog(QDialog):
         layout = QVBoxLayout()
         
         self.file_list = QListWidget()
+        self.file_list.setIconSize(QSize(THUMBNAIL_SIZE, THUMBNAIL_SIZE))
+        # Every row is the same height, so the view can lay out tens of thousands without measuring each one
+        self.file_list.setUniformItemSizes(True)
         layout.addWidget(QLabel("Selected Files:"))
         layout.addWidget(self.file_list)
         
+        placeholder = QPixmap(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+        placeholder.fill(Qt.GlobalColor.transparent)
+        self.placeholder_icon = QIcon(placeholder)
+        
+        self.thumbnail_timer = QTimer(self)
+        self.thumbnail_timer.setSingleShot(True)
+        self.thumbnail_timer.setInterval(THUMBNAIL_DELAY_MS)
+        self.thumbnail_timer.timeout.connect(self.update_thumbnails)
+        self.file_list.verticalScrollBar().valueChanged.connect(lambda: self.thumbnail_timer.start())
+        self.thumbnails.thumbnails_changed.connect(self.thumbnail_timer.start)
+        
         btn_layout = QHBoxLayout()
         
         self.add_btn = QPushButton("Add Files")
         self.add_btn.clicked.connect(self.add_files)
         
+        self.add_urls_btn = QPushButton("Add URLs")
+        self.add_urls_btn.clicked.connect(self.add_urls)
+        
         self.remove_btn = QPushButton("Remove Selected")
         self.remove_btn.clicked.connect(self.remove_files)
         
         self.clear_btn = QPushButton("Clear All")
         self.clear_btn.clicked.connect(self.clear_files)
         
+        self.duplicates_btn = QPushButton("Find Duplicates")
+        self.duplicates_btn.setToolTip("Group visually similar images and keep the largest of each group")
+        self.duplicates_btn.clicked.connect(self.find_duplicates)
+        
         btn_layout.addWidget(self.add_btn)
+        btn_layout.addWidget(self.add_urls_btn)
         btn_layout.addWidget(self.remove_btn)
         btn_layout.addWidget(self.clear_btn)
+        btn_layout.addWidget(self.duplicates_btn)
         
         layout.addLayout(btn_layout)
         
@@ -960,9 +3501,17 @@ class BatchUploadDialog(QDialog):
         self.resize_check = QCheckBox("Resize Images")
         self.resize_check.setChecked(True)
         
+        self.sink_btn = QPushButton("Results File...")
+        self.sink_btn.setToolTip("Results are written here as each upload finishes (.jsonl or .csv)")
+        self.sink_btn.clicked.connect(self.choose_sink)
+        
+        self.sink_label = QLabel("Automatic (.jsonl)")
+        
         options_layout.addWidget(self.options_btn)
         options_layout.addWidget(self.resize_check)
         options_layout.addStretch()
+        options_layout.addWidget(self.sink_btn)
+        options_layout.addWidget(self.sink_label)
         
         layout.addLayout(options_layout)
         
@@ -971,8 +3520,10 @@ class BatchUploadDialog(QDialog):
         layout.addWidget(self.progress_bar)
         
         layout.addWidget(QLabel("Results:"))
-        self.results_text = QTextEdit()
+        self.results_text = QPlainTextEdit()
         self.results_text.setReadOnly(True)
+        # Only the tail stays on screen; the full record is in the results file
+        self.results_text.setMaximumBlockCount(RESULTS_LOG_LINES)
         layout.addWidget(self.results_text)
         
         bottom_btn_layout = QHBoxLayout()
@@ -980,6 +3531,15 @@ class BatchUploadDialog(QDialog):
         self.upload_btn = QPushButton("Start Upload")
         self.upload_btn.clicked.connect(self.start_uploads)
         
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.setCheckable(True)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.toggled.connect(self.toggle_pause)
+        
+        self.stop_btn = QPushButton("Stop")
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.clicked.connect(self.stop_uploads)
+        
         self.save_results_btn = QPushButton("Save Results")
         self.save_results_btn.clicked.connect(self.save_results)
         self.save_results_btn.setEnabled(False)
@@ -988,6 +3548,8 @@ class BatchUploadDialog(QDialog):
         self.close_btn.clicked.connect(self.reject)
         
         bottom_btn_layout.addWidget(self.upload_btn)
+        bottom_btn_layout.addWidget(self.pause_btn)
+        bottom_btn_layout.addWidget(self.stop_btn)
         bottom_btn_layout.addWidget(self.save_results_btn)
         bottom_btn_layout.addWidget(self.close_btn)
         
@@ -1004,13 +3566,44 @@ class BatchUploadDialog(QDialog):
         )
         
         if files:
-            for file_path in files:
-                if file_path not in self.files:
-                    self.files.append(file_path)
-                    self.file_list.addItem(Path(file_path).name)
+            known = set(self.files)
+            rejected = []
+            
+            # Read only the headers so large selections validate without decoding every image
+            for info in probe_images([f for f in files if f not in known]):
+                try:
+                    check_probe(info)
+                except (InvalidImageError, ImageSizeError) as e:
+                    rejected.append(f"{Path(info['path']).name}: {str(e)}")
+                    continue
+                    
+                width, height = display_size(info)
+                item = QListWidgetItem(self.placeholder_icon, Path(info['path']).name)
+                item.setToolTip(f"{info['path']}\n{info['format'].upper()} {width}x{height} - {format_size(info['size'])}")
+                
+                self.files.append(info['path'])
+                self.file_list.addItem(item)
+                
+            self.thumbnail_timer.start()
+            
+            if rejected:
+                logging.warning("Skipped invalid images", extra={'error': "; ".join(rejected)})
+                QMessageBox.warning(self, "Skipped Files",
+                                    f"{len(rejected)} file(s) were skipped:\n\n" + "\n".join(rejected[:20]))
             
             self.update_upload_button()
             
+    def add_urls(self):
+        text, ok = QInputDialog.getMultiLineText(self, "Add URLs", "Image URLs (one per line):")
+        
+        if ok:
+            for url in text.split():
+                if is_remote_url(url) and url not in self.files:
+                    self.files.append(url)
+                    self.file_list.addItem(QListWidgetItem(self.placeholder_icon, url))
+                    
+            self.update_upload_button()
+            
     def remove_files(self):
         selected_items = self.file_list.selectedItems()
         
@@ -1019,6 +3612,7 @@ class BatchUploadDialog(QDialog):
             self.file_list.takeItem(row)
             del self.files[row]
             
+        self.thumbnail_timer.start()
         self.update_upload_button()
         
     def clear_files(self):
@@ -1029,123 +3623,1524 @@ class BatchUploadDialog(QDialog):
     def update_upload_button(self):
         self.upload_btn.setEnabled(len(self.files) > 0)
         
+    def visible_rows(self) -> range:
+        viewport = self.file_list.viewport().rect()
+        first = self.file_list.indexAt(viewport.topLeft())
+        if not first.isValid():
+            return range(0)
+            
+        last = self.file_list.indexAt(viewport.bottomLeft())
+        end = last.row() if last.isValid() else self.file_list.count() - 1
+        return range(first.row(), end + 1)
+        
+    def update_thumbnails(self):
+        # Only rows on screen are decoded; everything else keeps the placeholder until scrolled to
+        wanted = []
+        
+        for row in self.visible_rows():
+            path = self.files[row]
+            if is_remote_url(path):
+                continue
+                
+            item = self.file_list.item(row)
+            key = thumbnail_key(path)
+            if key is None or item.data(Qt.ItemDataRole.UserRole) == key:
+                continue
+                
+            if key in THUMBNAILS:
+                item.setIcon(THUMBNAILS.get(key) or self.placeholder_icon)
+                item.setData(Qt.ItemDataRole.UserRole, key)
+            else:
+                wanted.append(key)
+                
+        self.thumbnails.request(wanted)
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.thumbnail_timer.start()
+        
+    def find_duplicates(self):
+        paths = [f for f in self.files if not is_remote_url(f)]
+        if len(paths) < 2:
+            self.results_text.appendPlainText("Add at least two local images to look for duplicates.")
+            return
+            
+        self.duplicates_btn.setEnabled(False)
+        self.upload_btn.setEnabled(False)
+        self.results_text.appendPlainText(f"Scanning {len(paths)} images for near-duplicates...")
+        
+        self.duplicate_worker = DuplicateScanWorker(paths)
+        self.duplicate_worker.scan_finished.connect(self.handle_duplicates)
+        self.duplicate_worker.start()
+        
+    def handle_duplicates(self, clusters):
+        self.duplicates_btn.setEnabled(True)
+        self.update_upload_button()
+        
+        if not clusters:
+            self.results_text.appendPlainText("No near-duplicates found.")
+            return
+            
+        redundant = [path for cluster in clusters for path in cluster[1:]]
+        
+        for cluster in clusters:
+            self.results_text.appendPlainText(f"Keep {Path(cluster[0]).name}, similar: " +
+                                     ", ".join(Path(path).name for path in cluster[1:]))
+            
+        reply = QMessageBox.question(
+            self, "Duplicates Found",
+            f"Found {len(clusters)} group(s) of similar images.\n\n"
+            f"Keep one image per group and remove {len(redundant)} file(s) from the batch?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if reply == QMessageBox.StandardButton.Yes:
+            redundant = set(redundant)
+            for row in reversed(range(len(self.files))):
+                if self.files[row] in redundant:
+                    self.file_list.takeItem(row)
+                    del self.files[row]
+                    
+            self.thumbnail_timer.start()
+            self.results_text.appendPlainText(f"Removed {len(redundant)} duplicate(s).\n")
+            self.update_upload_button()
+        
     def show_options(self):
         dialog = OptionsDialog(self)
         
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.upload_options = dialog.get_options()
             
+    def choose_sink(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Results File",
+            "",
+            "JSON Lines (*.jsonl);;CSV Files (*.csv)"
+        )
+        
+        if file_path:
+            self.sink_path = file_path
+            self.sink_label.setText(Path(file_path).name)
+            
+    def open_sink(self) -> ResultSink:
+        if self.sink_path:
+            return ResultSink(self.sink_path)
+            
+        batches_dir = app_data_dir() / BATCHES_DIR
+        batches_dir.mkdir(exist_ok=True)
+        return ResultSink(batches_dir / f"batch-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl")
+            
     def start_uploads(self):
         if not self.api_key:
             QMessageBox.warning(self, "API Key Required", "Please enter an API key in the main window.")
             return
             
+        try:
+            self.sink = self.open_sink()
+        except OSError as e:
+            QMessageBox.warning(self, "Results File", f"Could not open the results file: {str(e)}")
+            return
+            
         self.add_btn.setEnabled(False)
+        self.add_urls_btn.setEnabled(False)
         self.remove_btn.setEnabled(False)
         self.clear_btn.setEnabled(False)
+        self.duplicates_btn.setEnabled(False)
         self.options_btn.setEnabled(False)
         self.upload_btn.setEnabled(False)
+        self.pause_btn.setEnabled(True)
+        self.stop_btn.setEnabled(True)
         
         self.results_text.clear()
-        self.results = []
+        self.completed = 0
+        self.uploaded_data.clear()
+        # The results file is readable while the batch runs, so partial results can be exported
+        self.save_results_btn.setEnabled(True)
         
-        asyncio.create_task(self.perform_uploads())
+        self.progress_bar.setRange(0, len(self.files))
+        self.progress_bar.setValue(0)
         
-    async def perform_uploads(self):
-        total_files = len(self.files)
-        successful = 0
-        failed = 0
+        options = dict(self.upload_options)
+        if not self.resize_check.isChecked():
+            options.pop('resize', None)
+            
+        self.batch_worker = BatchUploadWorker(self.api_key, list(self.files), options, keep_results=False)
+        self.batch_worker.file_started.connect(self.handle_file_started)
+        self.batch_worker.file_finished.connect(self.handle_file_finished)
+        self.batch_worker.batch_finished.connect(self.handle_batch_finished)
+        self.batch_worker.start()
+        
+    def toggle_pause(self, paused):
+        if paused:
+            self.batch_worker.pause()
+            self.pause_btn.setText("Resume")
+            self.results_text.appendPlainText("Paused; uploads in flight are aborted and will restart on resume.")
+        else:
+            self.batch_worker.resume()
+            self.pause_btn.setText("Pause")
+            self.results_text.appendPlainText("Resumed.")
+            
+    def stop_uploads(self):
+        self.stop_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.batch_worker.cancel()
+        self.results_text.appendPlainText("Stopping; remaining uploads are cancelled.")
         
-        self.progress_bar.setRange(0, total_files)
-        self.progress_bar.setValue(0)
+    def reject(self):
+        if getattr(self, 'batch_worker', None) is not None and self.batch_worker.isRunning():
+            self.batch_worker.cancel()
+        self.thumbnails.shutdown()
+        super().reject()
         
-        async with aiohttp.ClientSession() as session:
-            for i, file_path in enumerate(self.files):
-                try:
-                    self.progress_bar.setValue(i)
-                    self.results_text.append(f"Uploading {Path(file_path).name}...")
-                    
-                    with open(file_path, 'rb') as f:
-                        file_data = f.read()
-                        
-                    if self.resize_check.isChecked() and 'resize' in self.upload_options:
-                        pass
-                        
-                    url = "https://api.imgbb.com/1/upload"
-                    payload = aiohttp.FormData()
-                    payload.add_field('image', file_data)
-                    
-                    async with session.post(url, data=payload, params={'key': self.api_key}) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            
-                            if 'data' in data and 'url' in data['data']:
-                                url = data['data']['url']
-                                self.results.append({
-                                    'filename': Path(file_path).name,
-                                    'url': url,
-                                    'success': True
-                                })
-                                self.results_text.append(f"✓ Success: {url}\n")
-                                successful += 1
-                            else:
-                                raise ValueError("Invalid API response")
-                        else:
-                            error_text = await response.text()
-                            raise Exception(f"HTTP Error {response.status}: {error_text}")
-                                
-                except Exception as e:
-                    self.results.append({
-                        'filename': Path(file_path).name,
-                        'error': str(e),
-                        'success': False
-                    })
-                    self.results_text.append(f"✗ Failed: {str(e)}\n")
-                    failed += 1
-                    
-        self.progress_bar.setValue(total_files)
+    def handle_file_started(self, source):
+        self.results_text.appendPlainText(f"Uploading {display_name(source)}...")
+        
+    def handle_file_finished(self, result):
+        self.completed += 1
+        self.progress_bar.setValue(self.completed)
         
-        self.results_text.append(f"\nUpload Summary:\n"
-                                 f"Total: {total_files}\n"
-                                 f"Successful: {successful}\n"
-                                 f"Failed: {failed}")
+        try:
+            self.sink.write(result_record(result))
+        except OSError as e:
+            logging.error("Error writing batch result", extra={'file': str(self.sink.path), 'error': str(e)})
+        
+        if result['success']:
+            self.uploaded_data.append(result['data'])
+            self.results_text.appendPlainText(f"✓ Success: {result['url']}\n")
+        elif result.get('cancelled'):
+            self.results_text.appendPlainText(f"- Cancelled: {result['filename']}")
+        else:
+            self.results_text.appendPlainText(f"✗ Failed: {result['filename']} - {result['error']}\n")
+            
+    def handle_batch_finished(self, summary):
+        self.progress_bar.setValue(summary['total'])
+        
+        self.sink.close()
+        self.results_text.appendPlainText(f"\nUpload Summary:\n"
+                                          f"Total: {summary['total']}\n"
+                                          f"Successful: {summary['successful']}\n"
+                                          f"Failed: {summary['failed']}\n"
+                                          f"Cancelled: {summary['cancelled']}\n"
+                                          f"Results: {self.sink.path}")
                                  
+        if self.history_manager is not None and self.uploaded_data:
+            self.history_manager.add_entries(self.uploaded_data)
+            
         self.add_btn.setEnabled(True)
+        self.add_urls_btn.setEnabled(True)
         self.remove_btn.setEnabled(True)
         self.clear_btn.setEnabled(True)
+        self.duplicates_btn.setEnabled(True)
         self.options_btn.setEnabled(True)
         self.upload_btn.setEnabled(True)
         self.save_results_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setChecked(False)
         
     def save_results(self):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save Results",
             "",
-            "Text Files (*.txt)"
+            "JSON Lines (*.jsonl);;CSV Files (*.csv);;Text Files (*.txt)"
         )
         
         if file_path:
-            with open(file_path, 'w') as f:
-                for result in self.results:
-                    if result.get('success', False):
-                        f.write(f"✓ {result['filename']} - {result['url']}\n")
-                    else:
-                        f.write(f"✗ {result['filename']} - {result['error']}\n")
+            if Path(file_path).resolve() == self.sink.path.resolve():
+                QMessageBox.information(self, "Results Saved", f"Results are already being written to {file_path}.")
+                return
+                
+            records = ResultSink.read_records(self.sink.path)
+            
+            if Path(file_path).suffix.lower() == '.txt':
+                with open(file_path, 'w', encoding='utf-8') as f:
+                    for record in records:
+                        if record['success']:
+                            f.write(f"✓ {record['filename']} - {record['url']}\n")
+                        else:
+                            f.write(f"✗ {record['filename']} - {record['error']}\n")
+            else:
+                sink = ResultSink(file_path)
+                try:
+                    for record in records:
+                        sink.write(record)
+                finally:
+                    sink.close()
                         
             QMessageBox.information(self, "Results Saved", "Results have been saved to the specified file.")
 
+def parse_delete_url(delete_url: str) -> tuple:
+    parts = urlsplit(delete_url)
+    path = parts.path.strip('/').split('/')
+    if len(path) != 2:
+        raise ValueError(f"Unrecognized delete URL: {delete_url}")
+    return f"{parts.scheme}://{parts.netloc}", path[0], path[1]
+
+class BulkDeleteWorker(QThread):
+    item_finished = pyqtSignal(dict)
+    delete_finished = pyqtSignal(dict)
+    
+    def __init__(self, entries: List[dict], options: dict = None):
+        super().__init__()
+        self.entries = entries
+        self.options = options or {}
+        self.cancelled = False
+        
+    def cancel(self):
+        self.cancelled = True
+        
+    def run(self):
+        import asyncio
+        
+        with PROFILER.profile('bulk_delete'):
+            summary = asyncio.run(self.perform_deletes())
+            
+        self.delete_finished.emit(summary)
+        
+    async def perform_deletes(self) -> dict:
+        import asyncio
+        import aiohttp
+        
+        summary = {'total': len(self.entries), 'deleted': 0, 'failed': 0, 'skipped': 0}
+        semaphore = asyncio.Semaphore(self.options.get('concurrency', DEFAULT_DELETE_CONCURRENCY))
+        
+        # One session so the cookie from each delete page is sent back with its POST
+        async with aiohttp.ClientSession() as session:
+            async def delete(entry):
+                async with semaphore:
+                    if self.cancelled:
+                        summary['skipped'] += 1
+                        # Still reported, so progress reaches the total after a cancel
+                        self.item_finished.emit({'entry': entry, 'success': False, 'gone': False, 'skipped': True,
+                                                 'error': "Cancelled"})
+                        return
+                    result = await self.delete_one(session, entry)
+                    
+                summary['deleted' if result['success'] else 'failed'] += 1
+                self.item_finished.emit(result)
+                
+            await asyncio.gather(*(delete(entry) for entry in self.entries))
+            
+        return summary
+        
+    async def delete_one(self, session, entry: dict) -> dict:
+        result = {'entry': entry, 'success': False, 'gone': False}
+        start = time.perf_counter()
+        
+        try:
+            # A multi-variant record owns one remote image per distinct variant upload
+            delete_urls = [entry.get('delete_url')] + [variant.get('delete_url') for variant in entry.get('variants') or []]
+            delete_urls = list(dict.fromkeys(url for url in delete_urls if url))
+            if not delete_urls:
+                raise ValueError("No delete URL stored for this upload")
+                
+            gone = [await self._delete(session, delete_url) for delete_url in delete_urls]
+            result.update(success=True, gone=all(gone))
+            
+        except Exception as e:
+            result['error'] = str(e)
+        finally:
+            result['duration'] = round(time.perf_counter() - start, 4)
+            
+            if result['success']:
+                logging.info("Remote image deleted", extra={'url': entry.get('url'), 'duration': result['duration']})
+            else:
+                logging.error("Remote delete failed", extra={'url': entry.get('url'), 'error': result.get('error')})
+                
+        return result
+        
+    async def _delete(self, session, delete_url: str) -> bool:
+        base, image_id, delete_hash = parse_delete_url(delete_url)
+        status, page = await self._request_with_retries(session, 'GET', delete_url)
+        
+        if status == 404:
+            # Already deleted or expired on ImgBB, so only the local record is left
+            return True
+        if status != 200:
+            raise UploadHTTPError(status, "could not open the delete page")
+            
+        match = AUTH_TOKEN_PATTERN.search(page)
+        if not match:
+            raise ValueError("Delete page has no auth token")
+            
+        form = {
+            'auth_token': match.group(1),
+            'pathname': f"/{image_id}/{delete_hash}",
+            'action': "delete",
+            'delete': "image",
+            'from': "resource",
+            'deleting[id]': image_id,
+            'deleting[hash]': delete_hash
+        }
+        status, body = await self._request_with_retries(session, 'POST', f"{base}/json", data=form)
+        
+        try:
+            payload = json.loads(body)
+        except json.JSONDecodeError:
+            payload = {}
+            
+        if status == 200 and payload.get('status_code', 200) == 200:
+            return False
+        if status == 404:
+            return True
+            
+        message = (payload.get('error') or {}).get('message') or body[:200]
+        raise UploadHTTPError(status, message)
+        
+    async def _request_with_retries(self, session, method: str, url: str, **kwargs) -> tuple:
+        import asyncio
+        import aiohttp
+        
+        max_retries = self.options.get('max_retries', DEFAULT_MAX_RETRIES)
+        timeout = aiohttp.ClientTimeout(total=self.options.get('timeout', DEFAULT_TIMEOUT))
+        
+        for attempt in range(1, max_retries + 2):
+            try:
+                async with session.request(method, url, timeout=timeout, **kwargs) as response:
+                    if response.status in RETRY_STATUSES and attempt <= max_retries:
+                        await asyncio.sleep(retry_delay(attempt, response.headers.get('Retry-After')))
+                        continue
+                        
+                    return response.status, await response.text()
+                    
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError):
+                if attempt > max_retries:
+                    raise
+                await asyncio.sleep(retry_delay(attempt))
+
+class BulkDeleteDialog(QDialog):
+    SCOPES = ["Selected entries", "All entries", "Older than", "Uploaded between", "Expired entries"]
+    
+    def __init__(self, parent=None, history_manager=None, selected=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        self.selected = selected or []
+        self.deleted = []
+        self.completed = 0
+        self.worker = None
+        
+        self.setWindowTitle("Delete from ImgBB")
+        self.resize(520, 420)
+        self.init_ui()
+        self.update_matches()
+        
+    def init_ui(self):
+        layout = QVBoxLayout()
+        form_layout = QFormLayout()
+        
+        self.scope_combo = QComboBox()
+        self.scope_combo.addItems(self.SCOPES)
+        self.scope_combo.setCurrentIndex(0 if self.selected else 2)
+        self.scope_combo.currentIndexChanged.connect(self.update_matches)
+        form_layout.addRow("Delete:", self.scope_combo)
+        
+        self.days_spin = QSpinBox()
+        self.days_spin.setRange(0, 3650)
+        self.days_spin.setValue(30)
+        self.days_spin.setSuffix(" days")
+        self.days_spin.valueChanged.connect(self.update_matches)
+        form_layout.addRow("Older than:", self.days_spin)
+        
+        range_layout = QHBoxLayout()
+        self.from_date = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.from_date.setCalendarPopup(True)
+        self.from_date.dateChanged.connect(self.update_matches)
+        self.to_date = QDateEdit(QDate.currentDate())
+        self.to_date.setCalendarPopup(True)
+        self.to_date.dateChanged.connect(self.update_matches)
+        range_layout.addWidget(self.from_date)
+        range_layout.addWidget(QLabel("to"))
+        range_layout.addWidget(self.to_date)
+        form_layout.addRow("Between:", range_layout)
+        
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 32)
+        self.concurrency_spin.setValue(DEFAULT_DELETE_CONCURRENCY)
+        form_layout.addRow("Parallel requests:", self.concurrency_spin)
+        
+        layout.addLayout(form_layout)
+        
+        self.match_label = QLabel()
+        layout.addWidget(self.match_label)
+        
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+        
+        self.log_text = QPlainTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(RESULTS_LOG_LINES)
+        layout.addWidget(self.log_text)
+        
+        btn_layout = QHBoxLayout()
+        
+        self.delete_btn = QPushButton("Delete")
+        self.delete_btn.clicked.connect(self.start_deletes)
+        
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_deletes)
+        
+        self.close_btn = QPushButton("Close")
+        self.close_btn.clicked.connect(self.reject)
+        
+        btn_layout.addWidget(self.delete_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        btn_layout.addWidget(self.close_btn)
+        
+        layout.addLayout(btn_layout)
+        
+        self.setLayout(layout)
+        
+    def matching_entries(self) -> List[dict]:
+        scope = self.scope_combo.currentIndex()
+        
+        if scope == 0:
+            return list(self.selected)
+            
+        entries = self.history_manager.get_history()
+        if scope == 1:
+            return list(entries)
+            
+        if scope == 2:
+            cutoff = datetime.now().timestamp() - self.days_spin.value() * 86400
+            return [entry for entry in entries if datetime.fromisoformat(entry['timestamp']).timestamp() < cutoff]
+            
+        if scope == 3:
+            start = self.from_date.date().toString(Qt.DateFormat.ISODate)
+            end = self.to_date.date().toString(Qt.DateFormat.ISODate)
+            return [entry for entry in entries if start <= entry['timestamp'][:10] <= end]
+            
+        return [entry for entry in entries if entry.get('expired')]
+        
+    def update_matches(self):
+        scope = self.scope_combo.currentIndex()
+        self.days_spin.setEnabled(scope == 2)
+        self.from_date.setEnabled(scope == 3)
+        self.to_date.setEnabled(scope == 3)
+        
+        count = len(self.matching_entries())
+        self.match_label.setText(f"{count} upload(s) will be deleted from ImgBB and removed from history")
+        self.delete_btn.setEnabled(count > 0 and self.worker is None)
+        
+    def start_deletes(self):
+        entries = self.matching_entries()
+        
+        confirm = QMessageBox.question(
+            self,
+            "Delete from ImgBB",
+            f"Permanently delete {len(entries)} image(s) from ImgBB? This cannot be undone.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        
+        if confirm != QMessageBox.StandardButton.Yes:
+            return
+            
+        self.deleted = []
+        self.completed = 0
+        self.progress_bar.setRange(0, len(entries))
+        self.progress_bar.setValue(0)
+        self.log_text.clear()
+        
+        self.scope_combo.setEnabled(False)
+        self.delete_btn.setEnabled(False)
+        self.close_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        
+        self.worker = BulkDeleteWorker(entries, {'concurrency': self.concurrency_spin.value()})
+        self.worker.item_finished.connect(self.handle_item_finished)
+        self.worker.delete_finished.connect(self.handle_delete_finished)
+        self.worker.start()
+        
+    def cancel_deletes(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.cancel_btn.setEnabled(False)
+            self.log_text.appendPlainText("Cancelling, waiting for running requests...")
+            
+    def handle_item_finished(self, result):
+        self.completed += 1
+        self.progress_bar.setValue(self.completed)
+        
+        entry = result['entry']
+        name = entry.get('filename') or entry.get('url')
+        
+        if result['success']:
+            self.deleted.append(entry)
+            self.log_text.appendPlainText(f"✓ {name}" + (" (already gone)" if result['gone'] else ""))
+        elif result.get('skipped'):
+            self.log_text.appendPlainText(f"- {name} (skipped)")
+        else:
+            self.log_text.appendPlainText(f"✗ {name} - {result['error']}")
+            
+    def handle_delete_finished(self, summary):
+        # Every deleted record goes in a single history write instead of one save per item
+        if self.deleted:
+            self.history_manager.remove_entries(self.deleted)
+            
+        self.log_text.appendPlainText(f"\nDeleted: {summary['deleted']}, Failed: {summary['failed']}, "
+                                      f"Skipped: {summary['skipped']}")
+        
+        self.worker = None
+        self.selected = [entry for entry in self.selected if entry not in self.deleted]
+        self.scope_combo.setEnabled(True)
+        self.close_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.update_matches()
+        
+    def reject(self):
+        if self.worker is None:
+            super().reject()
+
+class LinkHealthCache:
+    def __init__(self, path: Optional[Path] = None, ttl: float = DEFAULT_LINK_TTL):
+        self.path = Path(path) if path else app_data_dir() / LINK_CACHE_FILE
+        self.ttl = ttl
+        self.results = self._load()
+        
+    @staticmethod
+    def key(url: str) -> str:
+        # Hashed so the cache does not leak URLs from an encrypted history
+        return hashlib.sha256(url.encode()).hexdigest()
+        
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.error("Error loading link cache", extra={'file': str(self.path), 'error': str(e)})
+            return {}
+            
+    def get(self, url: str) -> Optional[dict]:
+        return self.results.get(self.key(url))
+        
+    def is_fresh(self, url: str, now: Optional[float] = None) -> bool:
+        result = self.get(url)
+        now = time.time() if now is None else now
+        # Inconclusive answers (rate limits, timeouts) are always re-checked
+        return result is not None and result.get('ok') is not None and now - result['checked_at'] < self.ttl
+        
+    def put(self, url: str, result: dict):
+        self.results[self.key(url)] = {key: result.get(key) for key in ('status', 'ok', 'checked_at', 'error')}
+        
+    def save(self):
+        try:
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            temp_path.write_text(json.dumps(self.results))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logging.error("Error saving link cache", extra={'file': str(self.path), 'error': str(e)})
+
+class RateLimiter:
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        
+    async def wait(self):
+        import asyncio
+        
+        # Slots are handed out in order on the event loop thread, so no lock is needed
+        now = time.monotonic()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class LinkCheckWorker(QThread):
+    link_checked = pyqtSignal(dict)
+    check_finished = pyqtSignal(dict)
+    
+    def __init__(self, urls: List[str], cache: LinkHealthCache, options: dict = None):
+        super().__init__()
+        self.urls = urls
+        self.cache = cache
+        self.options = options or {}
+        
+    def run(self):
+        import asyncio
+        
+        with PROFILER.profile('link_check'):
+            summary = asyncio.run(self.check_all())
+            
+        self.check_finished.emit(summary)
+        
+    async def check_all(self) -> dict:
+        import asyncio
+        import aiohttp
+        
+        now = time.time()
+        unique = list(dict.fromkeys(self.urls))
+        pending = [url for url in unique if not self.cache.is_fresh(url, now)]
+        summary = {'total': len(unique), 'cached': len(unique) - len(pending), 'checked': 0,
+                   'alive': 0, 'dead': 0, 'unknown': 0}
+        
+        concurrency = max(1, self.options.get('concurrency', DEFAULT_LINK_CONCURRENCY))
+        limiter = RateLimiter(self.options.get('rate', DEFAULT_LINK_RATE))
+        timeout = aiohttp.ClientTimeout(total=self.options.get('timeout', DEFAULT_TIMEOUT))
+        connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+        
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            remaining = iter(pending)
+            
+            # A fixed pool pulling from one iterator keeps memory flat for very large histories
+            async def worker():
+                for url in remaining:
+                    result = await self.check_one(session, url, limiter)
+                    self.cache.put(url, result)
+                    
+                    summary['checked'] += 1
+                    summary[{True: 'alive', False: 'dead', None: 'unknown'}[result['ok']]] += 1
+                    self.link_checked.emit(result)
+                    
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+            
+        self.cache.save()
+        return summary
+        
+    async def check_one(self, session, url: str, limiter: RateLimiter) -> dict:
+        import asyncio
+        import aiohttp
+        
+        result = {'url': url, 'status': None, 'ok': None, 'error': None}
+        
+        try:
+            await limiter.wait()
+            async with session.head(url, allow_redirects=True) as response:
+                status = response.status
+                
+            if status in (403, 405, 501):
+                # Some hosts refuse HEAD; a one-byte range GET is the next cheapest probe
+                await limiter.wait()
+                async with session.get(url, headers={'Range': "bytes=0-0"}, allow_redirects=True) as response:
+                    status = response.status
+                    
+            result['status'] = status
+            if status in RETRY_STATUSES:
+                result['error'] = f"HTTP {status}"
+            else:
+                result['ok'] = status < 400
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result['error'] = str(e) or type(e).__name__
+            
+        result['checked_at'] = time.time()
+        return result
+
+def generate_corpus(directory: Path, sizes, count: int, image_format: str = "PNG") -> List[str]:
+    files = []
+    
+    for width, height in sizes:
+        for i in range(count):
+            # A repeated random tile keeps files compressible but still realistic in size
+            tile = random.randbytes(width * 4 * 16)
+            data = tile * (height // 16 + 1)
+            image = QImage(data, width, height, width * 4, QImage.Format.Format_RGB32).copy()
+            
+            path = directory / f"corpus-{width}x{height}-{i}.{image_format.lower()}"
+            image.save(str(path), image_format)
+            files.append(str(path))
+            
+    return files
+
+def peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def summarize_benchmark(files: List[str], wall_seconds: float) -> dict:
+    snapshot = METRICS.snapshot()
+    total_bytes = sum(Path(f).stat().st_size for f in files)
+    total = snapshot['stages'].get('total', {})
+    
+    return {
+        'files': len(files),
+        'successful': snapshot['uploads']['success'],
+        'failed': snapshot['uploads']['failure'],
+        'wall_seconds': round(wall_seconds, 4),
+        'files_per_second': round(len(files) / wall_seconds, 3) if wall_seconds else 0.0,
+        'bytes_per_second': round(total_bytes / wall_seconds) if wall_seconds else 0,
+        'latency': {key: total.get(key, 0.0) for key in ('p50', 'p95', 'p99')},
+        'stages': {
+            stage: {key: stats[key] for key in ('p50', 'p95', 'p99')}
+            for stage, stats in snapshot['stages'].items()
+        },
+        'peak_rss_kb': peak_rss_kb()
+    }
+
+def benchmark_single(files: List[str], endpoint: str) -> dict:
+    METRICS.reset()
+    start = time.perf_counter()
+    
+    for file_path in files:
+        worker = UploadWorker("benchmark", file_path, {'endpoint': endpoint})
+        worker.run()
+        
+    return summarize_benchmark(files, time.perf_counter() - start)
+
+def benchmark_batch(files: List[str], endpoint: str) -> dict:
+    import asyncio
+    
+    METRICS.reset()
+    worker = BatchUploadWorker("benchmark", list(files), {'endpoint': endpoint})
+    
+    start = time.perf_counter()
+    asyncio.run(worker.perform_uploads())
+    
+    return summarize_benchmark(files, time.perf_counter() - start)
+
+def benchmark_path(path: str, files: List[str], endpoint: str) -> dict:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    
+    METRICS.autoexport = False
+    logging.disable(logging.ERROR)
+    run = benchmark_single if path == 'single' else benchmark_batch
+    return run(files, endpoint)
+
+def benchmark_isolated(path: str, files: List[str], endpoint: str) -> dict:
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    # ru_maxrss only ever grows, so each path runs in a fresh process to report its own peak
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return executor.submit(benchmark_path, path, files, endpoint).result()
+
+def run_benchmark(args) -> dict:
+    import tempfile
+    from imgbb_emulator import MockImgBBServer, mock_server_options
+    
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    
+    METRICS.autoexport = False
+    logging.disable(logging.ERROR)
+    random.seed(args.bench_seed)
+    
+    sizes = [tuple(int(v) for v in size.lower().split('x')) for size in args.bench_sizes.split(',')]
+    config = {
+        'version': VERSION,
+        'sizes': [f"{w}x{h}" for w, h in sizes],
+        'files_per_size': args.bench_files,
+        'format': args.bench_format,
+        'server': mock_server_options(args),
+        'seed': args.bench_seed
+    }
+    
+    with tempfile.TemporaryDirectory(prefix="imgbb-bench-") as temp_dir:
+        files = generate_corpus(Path(temp_dir), sizes, args.bench_files, args.bench_format)
+        
+        with MockImgBBServer(**mock_server_options(args)) as server:
+            results = {
+                'config': config,
+                'server_stats': server.stats,
+                'corpus': {'files': len(files), 'bytes': sum(Path(f).stat().st_size for f in files)},
+                'single': benchmark_isolated('single', files, server.url),
+                'batch': benchmark_isolated('batch', files, server.url)
+            }
+            
+    logging.disable(logging.NOTSET)
+    return results
+
+def upload_sources(api_key: str, sources: List[str], options: dict = None,
+                   history_manager: Optional["HistoryManager"] = None) -> List[dict]:
+    import asyncio
+    
+    worker = BatchUploadWorker(api_key, sources, options)
+    asyncio.run(worker.perform_uploads())
+    
+    if history_manager is not None:
+        history_manager.add_entries([result['data'] for result in worker.results if result['success']])
+        
+    return worker.results
+
+class DaemonJob:
+    def __init__(self, job_id: int, source: str, key: Optional[tuple], upload_job: UploadJob):
+        self.id = job_id
+        self.source = source
+        self.key = key
+        self.upload_job = upload_job
+        self.subscribers = 1
+        self.result = None
+        self.submitted_at = time.time()
+        self.finished_at = None
+        
+    def to_dict(self) -> dict:
+        return {
+            'id': self.id,
+            'source': self.source,
+            'state': self.upload_job.state,
+            'finished': self.finished_at is not None,
+            'subscribers': self.subscribers,
+            'submitted_at': self.submitted_at,
+            'finished_at': self.finished_at,
+            'result': self.result
+        }
+
+class UploadDaemon:
+    def __init__(self, api_key: str = "", options: dict = None, history_manager: Optional[HistoryManager] = None,
+                 retention: int = DAEMON_JOB_RETENTION):
+        self.api_key = api_key
+        self.options = options or {}
+        self.history_manager = history_manager
+        self.retention = retention
+        self.jobs = {}
+        self._by_key = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._loop = None
+        self._session = None
+        self._thread = None
+        self._error = None
+        
+    def start(self):
+        import asyncio
+        
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), name="UploadDaemon", daemon=True)
+        self._thread.start()
+        ready.wait()
+        
+        if self._error is not None:
+            raise self._error
+        return self
+        
+    def _run_loop(self, ready: threading.Event):
+        import asyncio
+        
+        asyncio.set_event_loop(self._loop)
+        
+        try:
+            self._session = self._loop.run_until_complete(self._open_session())
+        except Exception as e:
+            self._error = e
+            return
+        finally:
+            ready.set()
+            
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.run_until_complete(self._session.close())
+            self._loop.close()
+            
+    async def _open_session(self):
+        import aiohttp
+        
+        # Every client's uploads go through this one session, so connections and DNS lookups are shared
+        return aiohttp.ClientSession(trace_configs=[create_trace_config()])
+        
+    def stop(self):
+        import asyncio
+        
+        SCHEDULER.cancel_group(DAEMON_GROUP)
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop)
+        self._thread.join()
+        
+    async def _shutdown(self):
+        import asyncio
+        
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        if tasks:
+            await asyncio.wait(tasks, timeout=DEFAULT_TIMEOUT)
+        asyncio.get_running_loop().stop()
+        
+    def __enter__(self):
+        return self.start()
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+        
+    @staticmethod
+    def coalesce_key(api_key: str, source: str, options: dict) -> Optional[tuple]:
+        upload_options = json.dumps({key: value for key, value in options.items() if key not in DAEMON_CLIENT_OPTIONS},
+                                    sort_keys=True, default=str)
+        
+        if is_remote_url(source):
+            return api_key, source, upload_options
+            
+        try:
+            stat = os.stat(source)
+        except OSError:
+            return None
+            
+        # Same path, size and mtime is treated as the same file without reading it
+        return api_key, os.path.realpath(source), stat.st_mtime_ns, stat.st_size, upload_options
+        
+    def submit(self, sources: List[str], options: dict = None, api_key: Optional[str] = None) -> List[dict]:
+        import asyncio
+        
+        options = dict(self.options, **(options or {}))
+        api_key = api_key or self.api_key
+        
+        if not api_key:
+            raise ValueError("API key is required (send api_key or save one in the GUI)")
+            
+        for source in sources:
+            if not is_remote_url(source) and not os.path.isabs(source):
+                raise ValueError(f"Local paths must be absolute: {source}")
+                
+        priority = options.get('priority', PRIORITY_BATCH)
+        jobs = []
+        
+        with self._lock:
+            for source in sources:
+                key = self.coalesce_key(api_key, source, options) if options.get('coalesce', True) else None
+                job = self._by_key.get(key) if key is not None else None
+                
+                if job is not None and job.upload_job.state in ('failed', 'cancelled'):
+                    job = None
+                    
+                if job is None:
+                    job = DaemonJob(next(self._ids), source, key, SCHEDULER.create_job(source, priority, DAEMON_GROUP))
+                    self.jobs[job.id] = job
+                    if key is not None:
+                        self._by_key[key] = job
+                    asyncio.run_coroutine_threadsafe(self._run(job, api_key, options), self._loop)
+                elif job.finished_at is None:
+                    job.subscribers += 1
+                    
+                jobs.append(job.to_dict())
+                
+        return jobs
+        
+    async def _run(self, job: DaemonJob, api_key: str, options: dict):
+        import asyncio
+        
+        worker = BatchUploadWorker(api_key, [job.source], options, keep_results=False)
+        result = await worker.upload_one(self._session, job.source, job.upload_job)
+        
+        if result['success'] and options.get('history', True) and self.history_manager is not None:
+            # Saving locks, decrypts and rewrites the history file; off the loop so other clients' uploads keep going
+            await asyncio.to_thread(self.history_manager.add_entry, result['data'])
+            
+        with self._changed:
+            job.result = result
+            job.finished_at = time.time()
+            self._trim()
+            self._changed.notify_all()
+            
+    def _trim(self):
+        excess = len(self.jobs) - self.retention
+        if excess <= 0:
+            return
+            
+        for job_id in [job_id for job_id, job in self.jobs.items() if job.finished_at is not None][:excess]:
+            job = self.jobs.pop(job_id)
+            if self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+                
+    def wait(self, job_ids: List[int], timeout: float = 0) -> List[Optional[dict]]:
+        with self._changed:
+            self._changed.wait_for(
+                lambda: all(self.jobs[job_id].finished_at is not None for job_id in job_ids if job_id in self.jobs),
+                timeout
+            )
+            return [self.jobs[job_id].to_dict() if job_id in self.jobs else None for job_id in job_ids]
+            
+    def cancel(self, job_id: int) -> Optional[bool]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.finished_at is not None:
+                return False
+                
+            # A coalesced job keeps running until every client that submitted it has cancelled
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return True
+                
+        SCHEDULER.cancel(job.upload_job)
+        return True
+        
+    def reprioritize(self, job_id: int, priority: int) -> Optional[bool]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job.finished_at is not None:
+                return False
+                
+        # A coalesced job runs at the most urgent priority any of its clients asked for
+        SCHEDULER.reprioritize(job.upload_job, min(priority, job.upload_job.priority))
+        return True
+        
+    def status(self) -> dict:
+        states = {}
+        with self._lock:
+            for job in self.jobs.values():
+                states[job.upload_job.state] = states.get(job.upload_job.state, 0) + 1
+                
+        return {'version': VERSION, 'pid': os.getpid(), 'max_active': SCHEDULER.max_active, 'jobs': states}
+
+def daemon_socket_path(args) -> Optional[str]:
+    import socket
+    
+    if args.daemon_socket is not None:
+        return args.daemon_socket or None
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    return str(app_data_dir() / DAEMON_SOCKET_FILE)
+
+def find_daemon(timeout: float = 2.0):
+    info_path = app_data_dir() / DAEMON_INFO_FILE
+    if not info_path.exists():
+        return None
+        
+    from imgbb_daemon import DaemonClient, DaemonError
+    
+    client = DaemonClient.from_info(info_path, timeout)
+    if client is None:
+        return None
+        
+    try:
+        client.status()
+    except (OSError, DaemonError):
+        return None
+    return client
+
+def run_daemon(args) -> int:
+    from imgbb_daemon import UploadDaemonServer
+    
+    configure_logging()
+    settings = QSettings(APP_AUTHOR, APP_NAME)
+    SCHEDULER.max_active = max(1, args.concurrency)
+    
+    engine = UploadDaemon(args.api_key or settings.value('api_key', ''), {'optimize': args.optimize},
+                          HistoryManager(load_encryption_key(settings)))
+    port = args.daemon_port if args.daemon_port >= 0 else None
+    
+    try:
+        with engine, UploadDaemonServer(engine, args.daemon_host, port, daemon_socket_path(args),
+                                        app_data_dir() / DAEMON_INFO_FILE) as server:
+            print(f"Upload daemon listening on {', '.join(server.addresses)} (Ctrl+C to stop)", flush=True)
+            logging.info("Upload daemon started", extra={'url': server.url})
+            server.wait()
+    except OSError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+        
+    return 0
+
+class QueueWorker:
+    def __init__(self, queue, api_key: str, options: dict = None):
+        import socket
+        
+        self.queue = queue
+        self.api_key = api_key
+        self.options = dict(options or {})
+        self.concurrency = max(1, self.options.pop('concurrency', DEFAULT_BATCH_CONCURRENCY))
+        self.lease_seconds = self.options.pop('lease', QUEUE_LEASE_SECONDS)
+        self.exit_when_empty = self.options.pop('exit_when_empty', False)
+        self.host = socket.gethostname()
+        self.worker_id = f"{self.host}-{os.getpid()}-{random.getrandbits(32):08x}"
+        self.group = f"queue-{self.worker_id}"
+        self.active = {}
+        self.stopping = False
+        self.summary = {'done': 0, 'failed': 0, 'lost': 0}
+        
+    def stop(self):
+        self.stopping = True
+        
+    async def run(self) -> dict:
+        import asyncio
+        import aiohttp
+        
+        await asyncio.to_thread(self.queue.register_worker, self.worker_id, self.host, os.getpid())
+        logging.info("Queue worker started", extra={'file': self.queue.path, 'url': self.worker_id})
+        tasks = set()
+        
+        try:
+            async with aiohttp.ClientSession(trace_configs=[create_trace_config()]) as session:
+                heartbeat = asyncio.ensure_future(self._heartbeat())
+                
+                try:
+                    while not self.stopping:
+                        leased = await asyncio.to_thread(self.queue.lease, self.worker_id,
+                                                         self.concurrency - len(tasks), self.lease_seconds)
+                        tasks.update(asyncio.ensure_future(self._process(session, job)) for job in leased)
+                        
+                        if tasks:
+                            _, pending = await asyncio.wait(tasks, timeout=QUEUE_POLL_SECONDS,
+                                                            return_when=asyncio.FIRST_COMPLETED)
+                            tasks = set(pending)
+                        elif self.exit_when_empty and not await asyncio.to_thread(self.queue.pending):
+                            break
+                        else:
+                            await asyncio.sleep(QUEUE_POLL_SECONDS)
+                finally:
+                    SCHEDULER.cancel_group(self.group)
+                    if tasks:
+                        await asyncio.wait(tasks)
+                    heartbeat.cancel()
+        finally:
+            # Anything still leased goes straight back to the queue instead of waiting for the lease to run out
+            await asyncio.to_thread(self.queue.unregister_worker, self.worker_id)
+            logging.info("Queue worker stopped", extra={'url': self.worker_id})
+            
+        return self.summary
+        
+    async def _heartbeat(self):
+        import asyncio
+        
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            held = set(await asyncio.to_thread(self.queue.heartbeat, self.worker_id, list(self.active), self.lease_seconds))
+            
+            for job_id, job in list(self.active.items()):
+                if job_id not in held:
+                    # The lease was reassigned (this worker stalled past it), so stop before uploading a duplicate
+                    logging.warning("Queue lease lost", extra={'file': job.source, 'url': self.worker_id})
+                    SCHEDULER.cancel(job)
+                    
+    async def _process(self, session, leased: dict):
+        import asyncio
+        
+        try:
+            options = dict(self.options, **queue_job_options(leased['options']))
+        except ValueError as e:
+            await asyncio.to_thread(self.queue.complete, self.worker_id, leased['id'], False, {}, str(e))
+            self.summary['failed'] += 1
+            return
+            
+        job = SCHEDULER.create_job(leased['source'], PRIORITY_BATCH, self.group)
+        self.active[leased['id']] = job
+        
+        try:
+            worker = BatchUploadWorker(self.api_key, [leased['source']], options, keep_results=False)
+            result = await worker.upload_one(session, leased['source'], job)
+        finally:
+            self.active.pop(leased['id'], None)
+            
+        if result.get('cancelled'):
+            if not self.stopping:
+                self.summary['lost'] += 1
+            return
+            
+        record = {
+            'result': result_record(result),
+            'entry': HistoryManager.make_entry(result['data']) if result['success'] else None
+        }
+        accepted = await asyncio.to_thread(self.queue.complete, self.worker_id, leased['id'],
+                                           result['success'], record, result.get('error'))
+        
+        if accepted:
+            self.summary['done' if result['success'] else 'failed'] += 1
+        else:
+            self.summary['lost'] += 1
+            if result['success']:
+                # Another worker owns this job now, so the copy uploaded here is a duplicate
+                await BulkDeleteWorker([result['data']], {'max_retries': 1}).perform_deletes()
+
+def queue_job_options(options: dict) -> dict:
+    # Anyone who can write the queue file can set these, so they may only change what is uploaded;
+    # an endpoint taken from the queue would send the worker's image and API key to any host
+    ignored = sorted(set(options) - set(QUEUE_JOB_OPTIONS))
+    if ignored:
+        logging.warning("Ignoring queued job options", extra={'error': ", ".join(ignored)})
+        
+    accepted = {}
+    if options.get('optimize'):
+        accepted['optimize'] = True
+        
+    variants = options.get('variants') or []
+    if not isinstance(variants, list) or not all(
+        isinstance(spec, dict) and spec.get('format') in (None,) + VARIANT_FORMATS and
+        (spec.get('width') is None or (type(spec['width']) is int and spec['width'] > 0))
+        for spec in variants
+    ):
+        raise ValueError("Invalid variants in queued job")
+    if variants:
+        accepted['variants'] = [{'width': spec.get('width'), 'format': spec.get('format')} for spec in variants]
+        
+    return accepted
+
+def run_queue_worker(args) -> int:
+    import asyncio
+    import signal
+    from imgbb_queue import JobQueue
+    
+    configure_logging()
+    settings = QSettings(APP_AUTHOR, APP_NAME)
+    api_key = args.api_key or settings.value('api_key', '')
+    
+    if not api_key:
+        print("Error: API key is required (--api-key or save one in the GUI)", file=sys.stderr)
+        return 2
+        
+    try:
+        options = cli_upload_options(args)
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+        
+    options.update(concurrency=args.concurrency, lease=args.lease, exit_when_empty=args.exit_when_empty)
+    SCHEDULER.max_active = max(1, args.concurrency)
+    worker = QueueWorker(JobQueue(args.queue), api_key, options)
+    
+    async def main():
+        if hasattr(signal, 'SIGTERM'):
+            try:
+                asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, worker.stop)
+            except NotImplementedError:
+                pass
+        return await worker.run()
+        
+    try:
+        summary = asyncio.run(main())
+    except KeyboardInterrupt:
+        summary = worker.summary
+        
+    print(json.dumps(dict(summary, worker=worker.worker_id)))
+    return 0 if summary['failed'] == 0 else 1
+
+def run_enqueue(args) -> int:
+    from imgbb_queue import JobQueue
+    
+    configure_logging()
+    
+    try:
+        options = cli_upload_options(args)
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+        
+    # Workers on other machines resolve paths themselves, so they must point at shared storage
+    sources = [source if is_remote_url(source) else os.path.abspath(source) for source in args.enqueue]
+    queue = JobQueue(args.queue)
+    job_ids = queue.enqueue(sources, options)
+    
+    if not args.wait:
+        print(json.dumps({'queue': queue.path, 'jobs': job_ids}))
+        return 0
+        
+    try:
+        jobs = queue.wait(job_ids, QUEUE_POLL_SECONDS)
+    except KeyboardInterrupt:
+        return 130
+        
+    settings = QSettings(APP_AUTHOR, APP_NAME)
+    entries = [job['result']['entry'] for job in jobs if job['result'] and job['result'].get('entry')]
+    if entries:
+        HistoryManager(load_encryption_key(settings)).insert_entries(entries)
+        
+    for job in jobs:
+        result = (job['result'] or {}).get('result') or {}
+        print(json.dumps({'source': job['source'], 'success': job['state'] == 'done', 'url': result.get('url'),
+                          'error': job['error']}))
+        
+    return 0 if all(job['state'] == 'done' for job in jobs) else 1
+
+def cli_upload_options(args) -> dict:
+    options = {'optimize': True} if args.optimize else {}
+    variants = parse_variants(args.variants or "")
+    if variants:
+        options['variants'] = variants
+    return options
+
+def run_daemon_upload(args, api_key: str, options: dict) -> int:
+    from imgbb_daemon import DaemonError
+    
+    client = find_daemon()
+    if client is None:
+        print("Error: no upload daemon is running (start one with --daemon)", file=sys.stderr)
+        return 2
+        
+    sources = [source if is_remote_url(source) else os.path.abspath(source) for source in args.upload]
+    
+    try:
+        jobs = client.submit(sources, options, api_key)
+        while not all(job['finished'] for job in jobs):
+            jobs = [job if job['finished'] else client.job(job['id'], wait=DAEMON_POLL_SECONDS) for job in jobs]
+    except (OSError, DaemonError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+        
+    results = [job['result'] for job in jobs]
+    for result in results:
+        print(json.dumps({key: result.get(key) for key in ('source', 'success', 'url', 'error')}))
+        
+    return 0 if all(result['success'] for result in results) else 1
+
+def run_cli_upload(args) -> int:
+    configure_logging()
+    settings = QSettings(APP_AUTHOR, APP_NAME)
+    api_key = args.api_key or settings.value('api_key', '')
+    
+    try:
+        options = cli_upload_options(args)
+    except ValueError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 2
+        
+    if args.via_daemon:
+        return run_daemon_upload(args, api_key, options)
+        
+    if not api_key:
+        print("Error: API key is required (--api-key or save one in the GUI)", file=sys.stderr)
+        return 2
+        
+    options['concurrency'] = args.concurrency
+    SCHEDULER.max_active = max(1, args.concurrency)
+    history_manager = HistoryManager(load_encryption_key(settings))
+    results = upload_sources(api_key, args.upload, options, history_manager)
+    
+    for result in results:
+        print(json.dumps({key: result.get(key) for key in ('source', 'success', 'url', 'error')}))
+        
+    return 0 if all(result['success'] for result in results) else 1
+
+def run_verify_links(args) -> int:
+    import asyncio
+    
+    configure_logging()
+    settings = QSettings(APP_AUTHOR, APP_NAME)
+    history_manager = HistoryManager(load_encryption_key(settings))
+    cache = LinkHealthCache(ttl=args.link_ttl * 3600)
+    
+    urls = [entry['url'] for entry in history_manager.get_history() if entry.get('url')]
+    worker = LinkCheckWorker(urls, cache, {'concurrency': args.link_concurrency, 'rate': args.link_rate})
+    summary = asyncio.run(worker.check_all())
+    
+    print(json.dumps(summary))
+    return 0 if summary['dead'] == 0 else 1
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=f"{APP_NAME} v{VERSION}")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"record cProfile/tracemalloc reports under ~/.{APP_NAME}/{PROFILES_DIR}/")
+    
+    parser.add_argument('--trace-startup', action='store_true',
+                        help="print startup phase timings to stderr (combine with python -X importtime for per-module detail)")
+    parser.add_argument('--upload', nargs='+', metavar="SOURCE",
+                        help="upload local files or http(s) URLs without starting the GUI")
+    parser.add_argument('--api-key', help="ImgBB API key for --upload (defaults to the key saved by the GUI)")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_BATCH_CONCURRENCY,
+                        help="parallel uploads for --upload")
+    parser.add_argument('--optimize', action='store_true',
+                        help="strip metadata and recompress losslessly before each --upload")
+    parser.add_argument('--variants', metavar="WIDTHS",
+                        help="upload each --upload source at several widths as one record, e.g. 320,800,1600,original")
+    parser.add_argument('--verify-links', action='store_true',
+                        help="check which history links still work and print a JSON summary")
+    parser.add_argument('--link-concurrency', type=int, default=DEFAULT_LINK_CONCURRENCY,
+                        help="parallel requests for --verify-links")
+    parser.add_argument('--link-rate', type=float, default=DEFAULT_LINK_RATE,
+                        help="maximum requests per second for --verify-links (0 for no limit)")
+    parser.add_argument('--link-ttl', type=float, default=DEFAULT_LINK_TTL / 3600,
+                        help="hours before a cached link result is checked again")
+    parser.add_argument('--via-daemon', action='store_true',
+                        help="send --upload jobs to the running upload daemon instead of uploading in this process")
+    parser.add_argument('--endpoint', help=f"upload endpoint for this run (same as setting {ENDPOINT_ENV_VAR})")
+    
+    bench = parser.add_argument_group("benchmark", "run uploads against a local mock ImgBB server and print JSON")
+    bench.add_argument('--benchmark', action='store_true', help="run the benchmark suite instead of the GUI")
+    bench.add_argument('--bench-sizes', default="640x480,1920x1080,4000x3000", help="comma-separated WxH corpus sizes")
+    bench.add_argument('--bench-files', type=int, default=5, help="images generated per size")
+    bench.add_argument('--bench-format', default="PNG", choices=["PNG", "JPEG"], help="corpus image format")
+    bench.add_argument('--bench-seed', type=int, default=0, help="random seed for corpus and fault injection")
+    bench.add_argument('--bench-output', help="write the JSON report to this file instead of stdout")
+    
+    daemon = parser.add_argument_group("daemon", "serve uploads to local tools over a Unix socket and localhost HTTP")
+    daemon.add_argument('--daemon', action='store_true', help="run the upload daemon in the foreground instead of the GUI")
+    daemon.add_argument('--daemon-host', default="127.0.0.1", help="address for the HTTP listener")
+    daemon.add_argument('--daemon-port', type=int, default=8766,
+                        help="port for the HTTP listener (0 picks a free port, -1 disables HTTP)")
+    daemon.add_argument('--daemon-socket', default=None,
+                        help=f"Unix socket path (defaults to ~/.{APP_NAME}/{DAEMON_SOCKET_FILE}; empty disables it)")
+    
+    job_queue = parser.add_argument_group("queue", "spread uploads over several machines through a shared SQLite queue")
+    job_queue.add_argument('--queue', metavar="PATH", help="queue database, e.g. on shared storage")
+    job_queue.add_argument('--enqueue', nargs='+', metavar="SOURCE",
+                           help="add files (on storage every worker can read) or URLs to the queue")
+    job_queue.add_argument('--wait', action='store_true',
+                           help="with --enqueue, wait for the jobs, print results and add them to the local history")
+    job_queue.add_argument('--worker', action='store_true', help="pull jobs from the queue and upload them")
+    job_queue.add_argument('--exit-when-empty', action='store_true', help="stop the worker once the queue is drained")
+    job_queue.add_argument('--lease', type=float, default=QUEUE_LEASE_SECONDS,
+                           help="seconds a job stays assigned without a heartbeat before another worker takes it; "
+                                "lease times come from each host's clock, so keep the hosts NTP-synced to well "
+                                "within this")
+    job_queue.add_argument('--queue-status', action='store_true', help="print job counts and live workers as JSON")
+    
+    emulator = parser.add_argument_group("emulator", "serve a local ImgBB-compatible upload endpoint")
+    emulator.add_argument('--emulator', action='store_true', help="run the emulator in the foreground instead of the GUI")
+    emulator.add_argument('--emulator-host', default="127.0.0.1", help="address to listen on")
+    emulator.add_argument('--emulator-port', type=int, default=8765, help="port to listen on")
+    
+    mock = parser.add_argument_group("mock server", "latency and fault injection for --benchmark and --emulator")
+    mock.add_argument('--mock-latency', type=float, default=0.05, help="response latency in seconds")
+    mock.add_argument('--mock-jitter', type=float, default=0.0, help="extra random latency in seconds")
+    mock.add_argument('--mock-bandwidth', type=float, default=None, help="receive bandwidth in bytes/s")
+    mock.add_argument('--mock-error-rate', type=float, default=0.0, help="fraction of uploads answered with HTTP 500")
+    mock.add_argument('--mock-429-rate', type=float, default=0.0, help="fraction of uploads answered with HTTP 429")
+    mock.add_argument('--mock-retry-after', type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    mock.add_argument('--mock-slow-rate', type=float, default=0.0, help="fraction of uploads delayed by --mock-slow-delay")
+    mock.add_argument('--mock-slow-delay', type=float, default=5.0, help="extra delay for slow responses in seconds")
+    mock.add_argument('--mock-truncate-rate', type=float, default=0.0, help="fraction of responses cut off halfway")
+    mock.add_argument('--mock-reset-rate', type=float, default=0.0, help="fraction of uploads reset mid-request")
+    
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
 def main():
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_EnableHighDpiScaling, True)
-    QApplication.setAttribute(Qt.ApplicationAttribute.AA_UseHighDpiPixmaps, True)
+    STARTUP.mark("imports done")
+    args = parse_args(sys.argv)
+    PROFILER.enabled = args.profile
+    STARTUP.enabled = args.trace_startup
     
+    if args.endpoint:
+        os.environ[ENDPOINT_ENV_VAR] = args.endpoint
+        
+    if args.upload:
+        sys.exit(run_cli_upload(args))
+        
+    if args.verify_links:
+        sys.exit(run_verify_links(args))
+        
+    if args.daemon:
+        sys.exit(run_daemon(args))
+        
+    if args.worker or args.enqueue or args.queue_status:
+        if not args.queue:
+            print("Error: --queue PATH is required for --worker, --enqueue and --queue-status", file=sys.stderr)
+            sys.exit(2)
+        if args.worker:
+            sys.exit(run_queue_worker(args))
+        if args.enqueue:
+            sys.exit(run_enqueue(args))
+            
+        from imgbb_queue import JobQueue
+        
+        print(json.dumps(JobQueue(args.queue).stats(), indent=2))
+        return
+        
+    if args.emulator:
+        from imgbb_emulator import run_emulator
+        
+        run_emulator(args)
+        return
+        
+    if args.benchmark:
+        results = json.dumps(run_benchmark(args), indent=2, sort_keys=True)
+        
+        if args.bench_output:
+            Path(args.bench_output).write_text(results + "\n")
+        else:
+            print(results)
+        return
+        
     app = QApplication(sys.argv)
+    STARTUP.mark("QApplication created")
     window = ImgBBUploader()
     window.show()
+    STARTUP.mark("window shown")
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = ImgBBUploader()
-    window.show()
-    sys.exit(app.exec())
+    main()
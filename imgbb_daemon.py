@@ -0,0 +1,377 @@
+import http.client
+import json
+import os
+import secrets
+import signal
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_DAEMON_HOST = "127.0.0.1"
+DEFAULT_DAEMON_PORT = 8766
+DEFAULT_CLIENT_TIMEOUT = 10.0
+MAX_WAIT = 300.0
+MAX_REQUEST_BYTES = 1024 * 1024
+
+class DaemonError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Daemon error {status}: {message}")
+        self.status = status
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+
+        path, query = self._route()
+        engine = self.server.engine
+
+        if path == ['status']:
+            self._send_json(200, engine.status())
+        elif len(path) == 2 and path[0] == 'jobs' and path[1].isdigit():
+            job = engine.wait([int(path[1])], self._wait(query))[0]
+            if job is None:
+                self._send_json(404, {'error': "No such job"})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {'error': "Not found"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+
+        path, _ = self._route()
+        if path != ['jobs']:
+            self._send_json(404, {'error': "Not found"})
+            return
+
+        try:
+            request = self._read_json()
+            sources = request.get('sources')
+            if not isinstance(sources, list) or not sources or not all(isinstance(s, str) for s in sources):
+                raise ValueError("'sources' must be a non-empty list of paths or URLs")
+
+            wait = min(float(request.get('wait') or 0), MAX_WAIT)
+            jobs = self.server.engine.submit(sources, request.get('options') or {}, request.get('api_key'))
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        if wait > 0:
+            jobs = self.server.engine.wait([job['id'] for job in jobs], wait)
+
+        finished = all(job['finished'] for job in jobs)
+        self._send_json(200 if finished else 202, {'jobs': jobs})
+
+    def do_PATCH(self):
+        if not self._authorized():
+            return
+
+        path, _ = self._route()
+        if not (len(path) == 2 and path[0] == 'jobs' and path[1].isdigit()):
+            self._send_json(404, {'error': "Not found"})
+            return
+
+        try:
+            priority = int(self._read_json()['priority'])
+        except KeyError:
+            self._send_json(400, {'error': "'priority' is required"})
+            return
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+
+        updated = self.server.engine.reprioritize(int(path[1]), priority)
+        if updated is None:
+            self._send_json(404, {'error': "No such job"})
+        else:
+            self._send_json(200, {'updated': updated})
+
+    def do_DELETE(self):
+        if not self._authorized():
+            return
+
+        path, _ = self._route()
+        if len(path) == 2 and path[0] == 'jobs' and path[1].isdigit():
+            cancelled = self.server.engine.cancel(int(path[1]))
+            if cancelled is None:
+                self._send_json(404, {'error': "No such job"})
+            else:
+                self._send_json(200, {'cancelled': cancelled})
+        else:
+            self._send_json(404, {'error': "Not found"})
+
+    def _authorized(self) -> bool:
+        # Browsers always send Origin on cross-site requests; no legitimate client of this API does
+        if self.headers.get('Origin'):
+            self._send_json(403, {'error': "Cross-origin requests are not allowed"})
+            return False
+
+        token = self.server.token
+        if token and not secrets.compare_digest(self.headers.get('Authorization', ""), f"Bearer {token}"):
+            self._send_json(401, {'error': "Missing or invalid token"})
+            return False
+
+        return True
+
+    def _route(self) -> tuple:
+        parts = urlsplit(self.path)
+        return [part for part in parts.path.split('/') if part], parse_qs(parts.query)
+
+    def _wait(self, query: dict) -> float:
+        try:
+            return min(float(query.get('wait', ['0'])[0]), MAX_WAIT)
+        except ValueError:
+            return 0.0
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get('Content-Length', 0))
+        if length > MAX_REQUEST_BYTES:
+            raise ValueError("Request body too large")
+
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+
+        if not isinstance(request, dict):
+            raise ValueError("Request body must be a JSON object")
+        return request
+
+    def _send_json(self, status, payload):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+class DaemonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple, engine, token: Optional[str]):
+        super().__init__(address, DaemonHandler)
+        self.engine = engine
+        self.token = token
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class DaemonUnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+        def __init__(self, path: str, engine):
+            # Only the owner can connect, so the socket needs no token
+            previous = os.umask(0o177)
+            try:
+                super().__init__(path, DaemonHandler)
+            finally:
+                os.umask(previous)
+            self.engine = engine
+            self.token = None
+else:
+    DaemonUnixServer = None
+
+class UploadDaemonServer:
+    def __init__(self, engine, host: str = DEFAULT_DAEMON_HOST, port: Optional[int] = DEFAULT_DAEMON_PORT,
+                 socket_path: Optional[str] = None, info_path: Optional[Path] = None):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self.info_path = info_path
+        self.token = secrets.token_urlsafe(32)
+        self.servers = []
+        self._threads = []
+        self._stopped = threading.Event()
+
+    @property
+    def url(self) -> Optional[str]:
+        for server in self.servers:
+            if isinstance(server, DaemonHTTPServer):
+                host, port = server.server_address[:2]
+                return f"http://{host}:{port}"
+        return None
+
+    @property
+    def addresses(self) -> List[str]:
+        return [address for address in (self.url, self.socket_path if self._has_socket() else None) if address]
+
+    def _has_socket(self) -> bool:
+        return any(not isinstance(server, DaemonHTTPServer) for server in self.servers)
+
+    def start(self):
+        if self.socket_path and DaemonUnixServer is not None:
+            remove_stale_socket(self.socket_path)
+            self.servers.append(DaemonUnixServer(self.socket_path, self.engine))
+
+        if self.port is not None:
+            self.servers.append(DaemonHTTPServer((self.host, self.port), self.engine, self.token))
+
+        if not self.servers:
+            raise OSError("No listener configured; give a socket path or an HTTP port")
+
+        for server in self.servers:
+            thread = threading.Thread(target=server.serve_forever, name="UploadDaemonServer", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        if self.info_path is not None:
+            write_info(self.info_path, {'pid': os.getpid(), 'url': self.url, 'token': self.token,
+                                        'socket': self.socket_path if self._has_socket() else None})
+        return self
+
+    def stop(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+        if self._has_socket() and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        if self.info_path is not None and read_info(self.info_path).get('pid') == os.getpid():
+            os.unlink(self.info_path)
+
+        self._stopped.set()
+
+    def wait(self):
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, 'SIGTERM'):
+            signal.signal(signal.SIGTERM, lambda signum, frame: self._stopped.set())
+
+        try:
+            while not self._stopped.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def remove_stale_socket(path: str):
+    if not os.path.exists(path):
+        return
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        # Nothing is listening, so the file was left behind by a daemon that did not exit cleanly
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+
+    raise OSError(f"Another daemon is already listening on {path}")
+
+def write_info(path: Path, info: dict):
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(info, f)
+    os.replace(temp_path, path)
+
+def read_info(path: Path) -> dict:
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class DaemonClient:
+    def __init__(self, url: Optional[str] = None, socket_path: Optional[str] = None, token: Optional[str] = None,
+                 timeout: float = DEFAULT_CLIENT_TIMEOUT):
+        if not url and not socket_path:
+            raise ValueError("A daemon URL or socket path is required")
+        self.url = url
+        self.socket_path = socket_path
+        self.token = token
+        self.timeout = timeout
+
+    @classmethod
+    def from_info(cls, path: Path, timeout: float = DEFAULT_CLIENT_TIMEOUT) -> Optional["DaemonClient"]:
+        info = read_info(path)
+        socket_path = info.get('socket') if DaemonUnixServer is not None else None
+
+        if socket_path and os.path.exists(socket_path):
+            return cls(socket_path=socket_path, timeout=timeout)
+        if info.get('url'):
+            return cls(url=info['url'], token=info.get('token'), timeout=timeout)
+        return None
+
+    def _connection(self, timeout: float):
+        if self.socket_path:
+            return UnixHTTPConnection(self.socket_path, timeout)
+        parts = urlsplit(self.url)
+        return http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None, wait: float = 0) -> dict:
+        connection = self._connection(self.timeout + wait)
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+
+        try:
+            body = json.dumps(payload).encode() if payload is not None else None
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            content = response.read()
+        finally:
+            connection.close()
+
+        try:
+            data = json.loads(content) if content else {}
+        except json.JSONDecodeError:
+            data = {'error': content[:200].decode('utf-8', 'replace')}
+
+        if response.status >= 400:
+            raise DaemonError(response.status, data.get('error', response.reason))
+        return data
+
+    def status(self) -> dict:
+        return self.request('GET', "/status")
+
+    def submit(self, sources: List[str], options: Optional[dict] = None, api_key: Optional[str] = None,
+               wait: float = 0) -> List[dict]:
+        payload = {'sources': sources, 'options': options or {}, 'wait': wait}
+        if api_key:
+            payload['api_key'] = api_key
+        return self.request('POST', "/jobs", payload, wait)['jobs']
+
+    def job(self, job_id: int, wait: float = 0) -> dict:
+        return self.request('GET', f"/jobs/{job_id}?wait={wait}", wait=wait)
+
+    def reprioritize(self, job_id: int, priority: int) -> bool:
+        try:
+            return self.request('PATCH', f"/jobs/{job_id}", {'priority': priority})['updated']
+        except DaemonError as e:
+            if e.status == 404:
+                return False
+            raise
+
+    def cancel(self, job_id: int) -> bool:
+        try:
+            return self.request('DELETE', f"/jobs/{job_id}")['cancelled']
+        except DaemonError as e:
+            if e.status == 404:
+                return False
+            raise
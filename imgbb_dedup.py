@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Sequence
+
+HASH_WIDTH = 9
+HASH_HEIGHT = 8
+DEFAULT_THRESHOLD = 8
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def dhash(pixels: bytes) -> int:
+    value = 0
+    for row in range(HASH_HEIGHT):
+        line = pixels[row * HASH_WIDTH:(row + 1) * HASH_WIDTH]
+        for col in range(HASH_WIDTH - 1):
+            value = (value << 1) | (line[col + 1] > line[col])
+    return value
+
+def dhash_many(thumbnails: Sequence[bytes]) -> List[int]:
+    try:
+        import numpy as np
+    except ImportError:
+        return [dhash(pixels) for pixels in thumbnails]
+
+    if not thumbnails:
+        return []
+
+    # One comparison and one packbits over the whole (N, 8, 9) stack instead of 64 Python ops per image
+    grid = np.frombuffer(b"".join(thumbnails), dtype=np.uint8).reshape(-1, HASH_HEIGHT, HASH_WIDTH)
+    bits = grid[:, :, 1:] > grid[:, :, :-1]
+    packed = np.packbits(bits.reshape(len(thumbnails), -1), axis=1)
+    return [int(value) for value in packed.view('>u8').ravel()]
+
+class MultiIndexHash:
+    # Pigeonhole: split the 64 bits into m chunks; any pair within t bits has a chunk within t // m bits
+    def __init__(self, threshold: int, expected: int, bits: int = 64):
+        self.threshold = threshold
+        self.chunks = min(range(threshold // 3 + 1, threshold + 2), key=lambda m: self._cost(m, expected, bits))
+        self.radius = threshold // self.chunks
+        self.bounds = [(bits * i // self.chunks, bits * (i + 1) // self.chunks) for i in range(self.chunks)]
+        self.tables = [{} for _ in self.bounds]
+        self.masks = [self._masks(high - low) for low, high in self.bounds]
+        self.values = []
+
+    def _cost(self, chunks: int, expected: int, bits: int) -> float:
+        # Probes per query plus candidates to verify, counting a popcount as a few dict probes
+        width = bits // chunks
+        radius = self.threshold // chunks
+        probes = 1 + width * (radius >= 1) + width * (width - 1) // 2 * (radius >= 2)
+        return chunks * probes * (1 + 4 * expected / 2 ** width)
+
+    def _masks(self, width: int) -> List[int]:
+        masks = [0]
+        if self.radius >= 1:
+            masks += [1 << bit for bit in range(width)]
+        if self.radius >= 2:
+            masks += [(1 << bit) | (1 << other) for bit in range(width) for other in range(bit + 1, width)]
+        return masks
+
+    def search(self, value: int) -> List[int]:
+        candidates = set()
+        for (low, high), table, masks in zip(self.bounds, self.tables, self.masks):
+            key = (value >> low) & ((1 << (high - low)) - 1)
+            for mask in masks:
+                bucket = table.get(key ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+        return [i for i in candidates if hamming(value, self.values[i]) <= self.threshold]
+
+    def add(self, value: int) -> int:
+        index = len(self.values)
+        self.values.append(value)
+        for (low, high), table in zip(self.bounds, self.tables):
+            table.setdefault((value >> low) & ((1 << (high - low)) - 1), []).append(index)
+        return index
+
+def cluster_hashes(hashes: Sequence[Optional[int]], threshold: int = DEFAULT_THRESHOLD) -> List[List[int]]:
+    # Identical hashes collapse first so the index only holds distinct values
+    same: Dict[int, List[int]] = {}
+    for index, value in enumerate(hashes):
+        if value is not None:
+            same.setdefault(value, []).append(index)
+
+    distinct = list(same)
+    parent = list(range(len(distinct)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = MultiIndexHash(threshold, len(distinct))
+    for i, value in enumerate(distinct):
+        for match in index.search(value):
+            parent[find(match)] = find(i)
+        index.add(value)
+
+    groups: Dict[int, List[int]] = {}
+    for i, value in enumerate(distinct):
+        groups.setdefault(find(i), []).extend(same[value])
+
+    return [sorted(group) for group in groups.values() if len(group) > 1]
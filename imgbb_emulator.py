@@ -0,0 +1,325 @@
+import json
+import random
+import socket
+import string
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from imgbb_probe import probe_image_bytes
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+# Hosted images are not kept, so /i/ serves a 1x1 PNG for every live image
+PLACEHOLDER_PNG = (b'\x89PNG\r\n\x1a\n' + _png_chunk(b'IHDR', struct.pack('>IIBBBBB', 1, 1, 8, 2, 0, 0, 0)) +
+                   _png_chunk(b'IDAT', zlib.compress(b'\x00\x00\x00\x00')) + _png_chunk(b'IEND', b''))
+
+class MockImgBBHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, format, *args):
+        pass
+        
+    def do_HEAD(self):
+        self.do_GET(head_only=True)
+        
+    def do_GET(self, head_only=False):
+        parts = self.path.split('?')[0].strip('/').split('/')
+        
+        if len(parts) == 2 and parts[0] == 'i':
+            self._serve_image(parts[1], head_only)
+            return
+            
+        # The delete page carries the auth token the web UI posts back to /json
+        if len(parts) == 2 and self.server.has_image(parts[0], parts[1]):
+            content = (f'<html><script>PF.obj.config.auth_token="{self.server.auth_token}";</script>'
+                       f'<body>Delete {parts[0]}</body></html>').encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+            return
+            
+        self._send_json(404, {'status_code': 404, 'error': {'message': "Not found"}, 'status_txt': "Not Found"})
+        
+    def do_POST(self):
+        config = self.server.config
+        length = int(self.headers.get('Content-Length', 0))
+        
+        if random.random() < config['reset_rate']:
+            self._read_body(length // 2, config['bandwidth'])
+            self.server.count('reset')
+            self._reset_connection()
+            return
+            
+        body = self._read_body(length, config['bandwidth'])
+        if len(body) < length:
+            # The client went away mid-body; like a real server, never act on a partial request
+            self.server.count('aborted')
+            self.close_connection = True
+            return
+            
+        delay = config['latency'] + random.uniform(0, config['jitter'])
+        if random.random() < config['slow_rate']:
+            delay += config['slow_delay']
+            self.server.count('slow')
+        if delay > 0:
+            time.sleep(delay)
+            
+        if random.random() < config['rate_limit_rate']:
+            self.server.count('rate_limited')
+            self._send_json(429, {'status_code': 429, 'error': {'message': "Rate limit exceeded"}, 'status_txt': "Too Many Requests"},
+                            {'Retry-After': str(config['retry_after'])})
+            return
+            
+        if random.random() < config['error_rate']:
+            self.server.count('server_error')
+            self._send_json(500, {'status_code': 500, 'error': {'message': "Injected server error"}, 'status_txt': "Internal Server Error"})
+            return
+            
+        if self.path.split('?')[0] == '/json':
+            status, payload = self.server.delete_image(parse_qs(body.decode('utf-8', 'replace')))
+            self.server.count('deleted' if status == 200 else 'delete_failed')
+            self._send_json(status, payload)
+            return
+            
+        payload = {'data': self.server.make_image_data(self.path, body, self.headers.get('Content-Type', '')), 'success': True, 'status': 200}
+        
+        if random.random() < config['truncate_rate']:
+            self.server.count('truncated')
+            self._send_json(200, payload, truncate=True)
+            return
+            
+        self.server.count('uploaded')
+        self._send_json(200, payload)
+        
+    def _serve_image(self, name: str, head_only: bool):
+        image_id = name.split('.')[0].split('-')[0]
+        
+        if not self.server.image_exists(image_id):
+            self.server.count('link_dead')
+            self.send_response(404)
+            self.send_header('Content-Length', "0")
+            self.end_headers()
+            return
+            
+        self.server.count('link_alive')
+        content = PLACEHOLDER_PNG
+        status = 200
+        
+        if self.headers.get('Range', "").startswith("bytes=0-"):
+            end = min(int(self.headers['Range'][8:] or len(content) - 1), len(content) - 1)
+            status = 206
+            content = content[:end + 1]
+            
+        self.send_response(status)
+        self.send_header('Content-Type', "image/png")
+        self.send_header('Content-Length', str(len(content)))
+        if status == 206:
+            self.send_header('Content-Range', f"bytes 0-{len(content) - 1}/{len(PLACEHOLDER_PNG)}")
+        self.end_headers()
+        
+        if not head_only:
+            self.wfile.write(content)
+            
+    def _read_body(self, length, bandwidth):
+        chunks = []
+        remaining = length
+        
+        while remaining > 0:
+            chunk = self.rfile.read(min(65536, remaining))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+            
+            if bandwidth:
+                time.sleep(len(chunk) / bandwidth)
+                
+        return b"".join(chunks)
+        
+    def _reset_connection(self):
+        # SO_LINGER with a zero timeout makes close() send RST instead of FIN
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        self.connection.close()
+        self.close_connection = True
+        
+    def _send_json(self, status, payload, headers=None, truncate=False):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+            
+        if truncate:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+            content = content[:len(content) // 2]
+            
+        self.end_headers()
+        self.wfile.write(content)
+
+class MockImgBBServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 bandwidth: Optional[float] = None, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: float = 1.0, slow_rate: float = 0.0, slow_delay: float = 5.0,
+                 truncate_rate: float = 0.0, reset_rate: float = 0.0):
+        super().__init__((host, port), MockImgBBHandler)
+        self.config = {
+            'latency': latency,
+            'jitter': jitter,
+            'bandwidth': bandwidth,
+            'error_rate': error_rate,
+            'rate_limit_rate': rate_limit_rate,
+            'retry_after': retry_after,
+            'slow_rate': slow_rate,
+            'slow_delay': slow_delay,
+            'truncate_rate': truncate_rate,
+            'reset_rate': reset_rate
+        }
+        self.stats = {}
+        self.images = {}
+        self.auth_token = "".join(random.choices(string.hexdigits.lower()[:16], k=40))
+        self._lock = threading.Lock()
+        self._thread = None
+        
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/1/upload"
+        
+    def count(self, outcome: str):
+        with self._lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+            
+    def image_exists(self, image_id: str) -> bool:
+        with self._lock:
+            return image_id in self.images
+            
+    def has_image(self, image_id: str, delete_hash: str) -> bool:
+        with self._lock:
+            return self.images.get(image_id) == delete_hash
+            
+    def delete_image(self, form: dict) -> tuple:
+        field = lambda name: form.get(name, [""])[0]
+        
+        if field('auth_token') != self.auth_token:
+            return 400, {'status_code': 400, 'error': {'message': "Request denied"}, 'status_txt': "Bad Request"}
+        if field('action') != "delete":
+            return 400, {'status_code': 400, 'error': {'message': "Invalid action"}, 'status_txt': "Bad Request"}
+            
+        image_id = field('deleting[id]')
+        with self._lock:
+            if self.images.get(image_id) != field('deleting[hash]'):
+                return 404, {'status_code': 404, 'error': {'message': "Image not found"}, 'status_txt': "Not Found"}
+            del self.images[image_id]
+            
+        return 200, {'status_code': 200, 'success': {'message': "Image deleted", 'code': 200}, 'status_txt': "OK"}
+        
+    def make_image_data(self, path: str, body: bytes, content_type: str = "") -> dict:
+        image_id = "".join(random.choices(string.ascii_letters + string.digits, k=7))
+        delete_hash = "".join(random.choices(string.hexdigits.lower()[:16], k=32))
+        base = f"http://{self.server_address[0]}:{self.server_address[1]}"
+        
+        info = probe_image_bytes(multipart_field(body, content_type, 'image') or b"")
+        info = info or {'format': "png", 'width': 0, 'height': 0}
+        
+        # ImgBB echoes the requested lifetime (query string or form field), which clients turn into an expiry time
+        expiration = parse_qs(urlsplit(path).query).get('expiration', [None])[0]
+        if expiration is None:
+            expiration = (multipart_field(body, content_type, 'expiration') or b"").decode('ascii', 'replace')
+        
+        with self._lock:
+            self.images[image_id] = delete_hash
+        extension = "jpg" if info['format'] == "jpeg" else info['format']
+        
+        image = {
+            'filename': f"{image_id}.{extension}",
+            'name': image_id,
+            'mime': f"image/{info['format']}",
+            'extension': extension,
+            'url': f"{base}/i/{image_id}.{extension}"
+        }
+        
+        return {
+            'id': image_id,
+            'title': image_id,
+            'url_viewer': f"{base}/{image_id}",
+            'url': image['url'],
+            'display_url': image['url'],
+            'width': str(info['width']),
+            'height': str(info['height']),
+            'size': len(body),
+            'time': str(int(time.time())),
+            'expiration': expiration if expiration.isdigit() else "0",
+            'image': image,
+            'thumb': dict(image, url=f"{base}/i/{image_id}-thumb.{extension}"),
+            'medium': dict(image, url=f"{base}/i/{image_id}-medium.{extension}"),
+            'delete_url': f"{base}/{image_id}/{delete_hash}"
+        }
+        
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="MockImgBBServer", daemon=True)
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        
+    def __enter__(self):
+        return self.start()
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def multipart_field(body: bytes, content_type: str, name: str) -> Optional[bytes]:
+    if 'boundary=' not in content_type:
+        return None
+        
+    boundary = content_type.split('boundary=', 1)[1].split(';')[0].strip().strip('"').encode()
+    disposition = f'name="{name}"'.encode()
+    
+    for part in body.split(b"--" + boundary):
+        head, separator, value = part.partition(b"\r\n\r\n")
+        if separator and disposition in head:
+            return value[:-2] if value.endswith(b"\r\n") else value
+            
+    return None
+
+def mock_server_options(args) -> dict:
+    return {
+        'latency': args.mock_latency,
+        'jitter': args.mock_jitter,
+        'bandwidth': args.mock_bandwidth,
+        'error_rate': args.mock_error_rate,
+        'rate_limit_rate': args.mock_429_rate,
+        'retry_after': args.mock_retry_after,
+        'slow_rate': args.mock_slow_rate,
+        'slow_delay': args.mock_slow_delay,
+        'truncate_rate': args.mock_truncate_rate,
+        'reset_rate': args.mock_reset_rate
+    }
+
+def run_emulator(args):
+    server = MockImgBBServer(host=args.emulator_host, port=args.emulator_port, **mock_server_options(args))
+    print(f"ImgBB emulator listening on {server.url} (Ctrl+C to stop)", flush=True)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats, indent=2, sort_keys=True))
@@ -0,0 +1,120 @@
+import struct
+import zlib
+from typing import Optional
+
+from imgbb_probe import exif_orientation
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_METADATA_CHUNKS = {b'tEXt', b'zTXt', b'iTXt', b'tIME', b'eXIf'}
+# APP0 (JFIF), APP2 (ICC profile) and APP14 (Adobe colour transform) change how the pixels decode
+JPEG_KEPT_SEGMENTS = {0xE0, 0xE2, 0xEE}
+JPEG_STRIPPED_SEGMENTS = set(range(0xE1, 0xF0)) - JPEG_KEPT_SEGMENTS | {0xFE}
+
+def optimize_image(data: bytes) -> bytes:
+    try:
+        if data.startswith(PNG_SIGNATURE):
+            optimized = optimize_png(data)
+        elif data[:2] == b'\xff\xd8':
+            optimized = strip_jpeg(data)
+        else:
+            return data
+    except (struct.error, zlib.error, ValueError):
+        return data
+
+    return optimized if optimized is not None and len(optimized) < len(data) else data
+
+def minimal_exif(orientation: int) -> bytes:
+    # A single-entry IFD0 carrying only the orientation tag
+    return (b'MM\x00\x2a' + struct.pack('>I', 8) + struct.pack('>H', 1) +
+            struct.pack('>HHIHH', 0x0112, 3, 1, orientation, 0) + struct.pack('>I', 0))
+
+def strip_jpeg(data: bytes) -> Optional[bytes]:
+    out = [data[:2]]
+    pos = 2
+    orientation = 1
+
+    while pos < len(data):
+        # A marker needs two bytes; a file cut off after a lone 0xFF is not ours to repair
+        if data[pos] != 0xFF or pos + 1 >= len(data):
+            return None
+
+        code = data[pos + 1]
+        if code == 0xFF:
+            pos += 1
+            continue
+
+        if 0xD0 <= code <= 0xD7 or code == 0x01:
+            out.append(data[pos:pos + 2])
+            pos += 2
+            continue
+
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        end = pos + 2 + length
+        if end > len(data):
+            return None
+
+        if code == 0xDA:
+            # Entropy-coded data follows the scan header; copy everything from here on untouched
+            if orientation != 1:
+                exif = b'Exif\x00\x00' + minimal_exif(orientation)
+                out.insert(_jpeg_exif_index(out), b'\xff\xe1' + struct.pack('>H', len(exif) + 2) + exif)
+            out.append(data[pos:])
+            return b"".join(out)
+
+        if code == 0xE1:
+            orientation = exif_orientation(data[pos + 4:end]) or orientation
+
+        if code not in JPEG_STRIPPED_SEGMENTS:
+            out.append(data[pos:end])
+        pos = end
+
+    return None
+
+def _jpeg_exif_index(segments: list) -> int:
+    # EXIF belongs right after SOI, or after JFIF APP0 when the file has one
+    return 2 if len(segments) > 1 and segments[1][:2] == b'\xff\xe0' else 1
+
+def optimize_png(data: bytes) -> Optional[bytes]:
+    chunks = []
+    idat = []
+    pos = len(PNG_SIGNATURE)
+
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunk_data = data[pos + 8:pos + 8 + length]
+        if len(chunk_data) != length:
+            return None
+        pos += 12 + length
+
+        if chunk_type == b'IDAT':
+            if not idat:
+                chunks.append((b'IDAT', None))
+            idat.append(chunk_data)
+        elif chunk_type == b'eXIf':
+            orientation = exif_orientation(b'Exif\x00\x00' + chunk_data) or 1
+            if orientation != 1:
+                chunks.append((b'eXIf', minimal_exif(orientation)))
+        elif chunk_type not in PNG_METADATA_CHUNKS:
+            chunks.append((chunk_type, chunk_data))
+
+        if chunk_type == b'IEND':
+            break
+
+    if not idat:
+        return None
+
+    # Recompressing the filtered scanlines at level 9 is lossless; keep the original stream when it wins
+    original = b"".join(idat)
+    compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9)
+    recompressed = compressor.compress(zlib.decompress(original)) + compressor.flush()
+    if len(recompressed) >= len(original):
+        recompressed = original
+
+    out = [PNG_SIGNATURE]
+    for chunk_type, chunk_data in chunks:
+        if chunk_data is None:
+            chunk_data = recompressed
+        out.append(struct.pack('>I', len(chunk_data)) + chunk_type + chunk_data +
+                   struct.pack('>I', zlib.crc32(chunk_type + chunk_data)))
+
+    return b"".join(out)
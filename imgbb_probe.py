@@ -0,0 +1,161 @@
+import io
+import os
+import struct
+from typing import BinaryIO, List, Optional
+
+PROBE_BYTES = 4096
+EXIF_PROBE_BYTES = 65536
+IMAGE_FORMATS = ('png', 'jpeg', 'gif', 'bmp', 'webp')
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+ORIENTATION_TAG = 0x0112
+
+def probe_image(path: str) -> dict:
+    result = {'path': path, 'format': None, 'width': 0, 'height': 0, 'orientation': 1, 'size': 0, 'error': None}
+
+    try:
+        result['size'] = os.stat(path).st_size
+        with open(path, 'rb') as f:
+            info = probe_stream(f)
+    except OSError as e:
+        result['error'] = str(e)
+        return result
+
+    if info is None:
+        result['error'] = "Not a supported image (PNG, JPEG, GIF, BMP or WebP)"
+    else:
+        result.update(info)
+
+    return result
+
+def probe_image_bytes(data: bytes) -> Optional[dict]:
+    return probe_stream(io.BytesIO(data))
+
+def probe_images(paths: List[str], max_workers: Optional[int] = None) -> List[dict]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Probing is a handful of small reads per file, so it is bound by I/O latency rather than CPU
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(probe_image, paths, chunksize=64))
+
+def display_size(info: dict) -> tuple:
+    if info.get('orientation', 1) in (5, 6, 7, 8):
+        return info['height'], info['width']
+    return info['width'], info['height']
+
+def probe_stream(f: BinaryIO) -> Optional[dict]:
+    header = f.read(PROBE_BYTES)
+
+    try:
+        if header.startswith(b'\x89PNG\r\n\x1a\n') and header[12:16] == b'IHDR':
+            width, height = struct.unpack('>II', header[16:24])
+            return _info('png', width, height)
+
+        if header[:6] in (b'GIF87a', b'GIF89a'):
+            width, height = struct.unpack('<HH', header[6:10])
+            return _info('gif', width, height)
+
+        if header[:2] == b'BM' and len(header) >= 26:
+            return _probe_bmp(header)
+
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return _probe_webp(header)
+
+        if header[:2] == b'\xff\xd8':
+            return _probe_jpeg(f)
+    except (struct.error, IndexError):
+        return None
+
+    return None
+
+def _info(image_format: str, width: int, height: int, orientation: int = 1) -> Optional[dict]:
+    if width <= 0 or height <= 0:
+        return None
+    return {'format': image_format, 'width': width, 'height': height, 'orientation': orientation}
+
+def _probe_bmp(header: bytes) -> Optional[dict]:
+    dib_size = struct.unpack('<I', header[14:18])[0]
+
+    if dib_size == 12:
+        width, height = struct.unpack('<HH', header[18:22])
+    else:
+        width, height = struct.unpack('<ii', header[18:26])
+
+    return _info('bmp', abs(width), abs(height))
+
+def _probe_webp(header: bytes) -> Optional[dict]:
+    chunk = header[12:16]
+
+    if chunk == b'VP8 ' and header[23:26] == b'\x9d\x01\x2a':
+        width, height = struct.unpack('<HH', header[26:30])
+        return _info('webp', width & 0x3FFF, height & 0x3FFF)
+
+    if chunk == b'VP8L' and header[20:21] == b'\x2f':
+        bits = struct.unpack('<I', header[21:25])[0]
+        return _info('webp', (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1)
+
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return _info('webp', width, height)
+
+    return None
+
+def _probe_jpeg(f: BinaryIO) -> Optional[dict]:
+    # Walk the marker segments with seeks so only segment headers (and the EXIF block) are read
+    f.seek(2)
+    orientation = 1
+
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+
+        code = marker[1]
+        while code == 0xFF:
+            code = f.read(1)[0]
+
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+
+        length = struct.unpack('>H', f.read(2))[0]
+
+        if code in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>xHH', f.read(5))
+            return _info('jpeg', width, height, orientation)
+
+        if code == 0xE1:
+            segment = f.read(min(length - 2, EXIF_PROBE_BYTES))
+            orientation = exif_orientation(segment) or orientation
+            f.seek(length - 2 - len(segment), os.SEEK_CUR)
+        elif code == 0xDA:
+            return None
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+def exif_orientation(segment: bytes) -> Optional[int]:
+    if not segment.startswith(b'Exif\x00\x00'):
+        return None
+
+    tiff = segment[6:]
+    if tiff[:2] == b'II':
+        endian = '<'
+    elif tiff[:2] == b'MM':
+        endian = '>'
+    else:
+        return None
+
+    try:
+        ifd_offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        count = struct.unpack(endian + 'H', tiff[ifd_offset:ifd_offset + 2])[0]
+
+        for i in range(count):
+            entry = ifd_offset + 2 + i * 12
+            tag, field_type, _, value = struct.unpack(endian + 'HHI4s', tiff[entry:entry + 12])
+            if tag == ORIENTATION_TAG:
+                return struct.unpack(endian + 'H', value[:2])[0]
+    except struct.error:
+        return None
+
+    return None
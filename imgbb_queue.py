@@ -0,0 +1,193 @@
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_LEASE_SECONDS = 60.0
+DEFAULT_MAX_ATTEMPTS = 3
+BUSY_TIMEOUT = 30.0
+ID_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+CREATE TABLE IF NOT EXISTS workers (
+    id TEXT PRIMARY KEY,
+    host TEXT,
+    pid INTEGER,
+    started_at REAL,
+    heartbeat_at REAL,
+    stopped_at REAL
+);
+"""
+
+class JobQueue:
+    def __init__(self, path, max_attempts: int = DEFAULT_MAX_ATTEMPTS):
+        self.path = str(path)
+        self.max_attempts = max_attempts
+
+        with self._connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A connection per call keeps the queue usable from worker threads and separate processes alike
+        db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._connect() as db:
+            # IMMEDIATE takes the write lock before reading, so two workers can never lease the same row
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def enqueue(self, sources: Iterable[str], options: Optional[dict] = None) -> List[int]:
+        encoded = json.dumps(options or {})
+        now = time.time()
+
+        with self._transaction() as db:
+            return [db.execute("INSERT INTO jobs (source, options, created_at) VALUES (?, ?, ?)",
+                               (source, encoded, now)).lastrowid for source in sources]
+
+    def _reclaim(self, db, now: float):
+        # An expired lease means the worker died or stalled; requeue the job, or give up after max_attempts.
+        # SQLite has no server clock, so expiry compares wall-clock times written by different hosts: their
+        # clocks must agree to well within the lease length, or a fast clock reclaims leases that are still live
+        db.execute("UPDATE jobs SET state = 'failed', worker = NULL, lease_expires = NULL, finished_at = ?, "
+                   "error = 'Lease expired on ' || attempts || ' attempts' "
+                   "WHERE state = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, self.max_attempts))
+        db.execute("UPDATE jobs SET state = 'queued', worker = NULL, lease_expires = NULL "
+                   "WHERE state = 'leased' AND lease_expires < ?", (now,))
+
+    def lease(self, worker_id: str, count: int, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[dict]:
+        if count <= 0:
+            return []
+
+        now = time.time()
+        with self._transaction() as db:
+            self._reclaim(db, now)
+            rows = db.execute("SELECT id, source, options, attempts FROM jobs WHERE state = 'queued' "
+                              "ORDER BY id LIMIT ?", (count,)).fetchall()
+            db.executemany("UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                           "WHERE id = ?", [(worker_id, now + lease_seconds, row['id']) for row in rows])
+            self._touch(db, worker_id, now)
+
+        return [{'id': row['id'], 'source': row['source'], 'options': json.loads(row['options']),
+                 'attempt': row['attempts'] + 1} for row in rows]
+
+    def heartbeat(self, worker_id: str, job_ids: Iterable[int], lease_seconds: float = DEFAULT_LEASE_SECONDS) -> List[int]:
+        now = time.time()
+        held = []
+
+        with self._transaction() as db:
+            self._touch(db, worker_id, now)
+            for job_id in job_ids:
+                cursor = db.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+                                    (now + lease_seconds, job_id, worker_id))
+                if cursor.rowcount:
+                    held.append(job_id)
+
+        return held
+
+    def complete(self, worker_id: str, job_id: int, success: bool, result: dict, error: Optional[str] = None) -> bool:
+        # Only the current lease holder may finish a job; a worker whose lease was reassigned gets False
+        with self._transaction() as db:
+            cursor = db.execute("UPDATE jobs SET state = ?, worker = NULL, lease_expires = NULL, finished_at = ?, "
+                                "result = ?, error = ? WHERE id = ? AND state = 'leased' AND worker = ?",
+                                ('done' if success else 'failed', time.time(), json.dumps(result), error,
+                                 job_id, worker_id))
+            return cursor.rowcount == 1
+
+    def release(self, worker_id: str, job_ids: Optional[Iterable[int]] = None):
+        # A clean hand-back does not count as an attempt
+        query = ("UPDATE jobs SET state = 'queued', worker = NULL, lease_expires = NULL, attempts = attempts - 1 "
+                 "WHERE state = 'leased' AND worker = ?")
+
+        with self._transaction() as db:
+            if job_ids is None:
+                db.execute(query, (worker_id,))
+            else:
+                db.executemany(query + " AND id = ?", [(worker_id, job_id) for job_id in job_ids])
+
+    def register_worker(self, worker_id: str, host: str, pid: int):
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO workers (id, host, pid, started_at, heartbeat_at, stopped_at) "
+                       "VALUES (?, ?, ?, ?, ?, NULL)", (worker_id, host, pid, now, now))
+
+    def unregister_worker(self, worker_id: str):
+        self.release(worker_id)
+        with self._transaction() as db:
+            db.execute("UPDATE workers SET stopped_at = ? WHERE id = ?", (time.time(), worker_id))
+
+    def _touch(self, db, worker_id: str, now: float):
+        db.execute("UPDATE workers SET heartbeat_at = ? WHERE id = ?", (now, worker_id))
+
+    def jobs(self, job_ids: List[int]) -> List[dict]:
+        rows = {}
+        with self._connect() as db:
+            for start in range(0, len(job_ids), ID_CHUNK):
+                chunk = job_ids[start:start + ID_CHUNK]
+                query = f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(chunk))})"
+                rows.update((row['id'], self._job(row)) for row in db.execute(query, chunk))
+
+        return [rows[job_id] for job_id in job_ids if job_id in rows]
+
+    def _job(self, row) -> dict:
+        job = dict(row)
+        job['options'] = json.loads(job['options'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def pending(self, job_ids: Optional[List[int]] = None) -> int:
+        with self._connect() as db:
+            if job_ids is None:
+                return db.execute("SELECT COUNT(*) FROM jobs WHERE state IN ('queued', 'leased')").fetchone()[0]
+
+        return sum(1 for job in self.jobs(job_ids) if job['state'] in ('queued', 'leased'))
+
+    def wait(self, job_ids: List[int], poll_seconds: float = 2.0, timeout: Optional[float] = None) -> List[dict]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self.pending(job_ids) and (deadline is None or time.monotonic() < deadline):
+            time.sleep(poll_seconds)
+
+        return self.jobs(job_ids)
+
+    def stats(self) -> dict:
+        now = time.time()
+
+        with self._connect() as db:
+            states: Dict[str, int] = {row['state']: row['count'] for row in
+                                      db.execute("SELECT state, COUNT(*) AS count FROM jobs GROUP BY state")}
+            workers = [{'id': row['id'], 'host': row['host'], 'pid': row['pid'],
+                        'heartbeat_age': round(now - row['heartbeat_at'], 1),
+                        'leased': row['leased']}
+                       for row in db.execute("SELECT workers.*, (SELECT COUNT(*) FROM jobs WHERE jobs.worker = workers.id "
+                                             "AND jobs.state = 'leased') AS leased FROM workers "
+                                             "WHERE stopped_at IS NULL ORDER BY id")]
+
+        return {'jobs': states, 'workers': workers}
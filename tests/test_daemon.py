@@ -0,0 +1,214 @@
+import http.client
+import json
+import os
+import struct
+import threading
+import zlib
+from urllib.parse import urlsplit
+
+import pytest
+
+from imgbb_daemon import DaemonClient, DaemonError, DaemonUnixServer, UploadDaemonServer, read_info
+from imgbb_emulator import MockImgBBServer
+
+def make_png(width: int, height: int) -> bytes:
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    rows = b'\x00\x00\x00\x00' * height
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+class EmulatorEngine:
+    # Stands in for UploadDaemon: one thread per job posting the file to the emulator
+    def __init__(self, upload_url: str):
+        self.upload_url = upload_url
+        self.jobs = {}
+        self.release = threading.Event()
+        self.release.set()
+        self._changed = threading.Condition()
+
+    def submit(self, sources, options, api_key):
+        jobs = []
+        with self._changed:
+            for source in sources:
+                job = {'id': len(self.jobs) + 1, 'source': source, 'priority': options.get('priority', 0),
+                       'api_key': api_key, 'finished': False, 'success': False, 'result': None, 'error': None}
+                self.jobs[job['id']] = job
+                jobs.append(dict(job))
+                threading.Thread(target=self._upload, args=(job,), daemon=True).start()
+        return jobs
+
+    def _upload(self, job):
+        self.release.wait()
+        with self._changed:
+            if job['finished']:
+                return
+
+        boundary = "daemontest"
+        with open(job['source'], 'rb') as f:
+            body = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.png\"\r\n\r\n".encode() +
+                    f.read() + f"\r\n--{boundary}--\r\n".encode())
+
+        parts = urlsplit(self.upload_url)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+        try:
+            connection.request('POST', parts.path, body=body,
+                               headers={'Content-Type': f"multipart/form-data; boundary={boundary}"})
+            response = connection.getresponse()
+            payload = json.loads(response.read())
+        finally:
+            connection.close()
+
+        with self._changed:
+            job.update(finished=True, success=response.status == 200, result=payload.get('data'),
+                       error=None if response.status == 200 else payload['error']['message'])
+            self._changed.notify_all()
+
+    def wait(self, ids, timeout):
+        with self._changed:
+            self._changed.wait_for(lambda: all(self.jobs.get(i, {'finished': True})['finished'] for i in ids), timeout)
+            return [dict(self.jobs[i]) if i in self.jobs else None for i in ids]
+
+    def cancel(self, job_id):
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job['finished']:
+                return False
+            job.update(finished=True, error="Upload cancelled")
+            self._changed.notify_all()
+            return True
+
+    def reprioritize(self, job_id, priority):
+        with self._changed:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return None
+            if job['finished']:
+                return False
+            job['priority'] = min(job['priority'], priority)
+            return True
+
+    def status(self):
+        with self._changed:
+            return {'jobs': len(self.jobs), 'finished': sum(job['finished'] for job in self.jobs.values())}
+
+@pytest.fixture
+def emulator():
+    with MockImgBBServer() as server:
+        yield server
+
+@pytest.fixture
+def daemon(emulator, tmp_path):
+    engine = EmulatorEngine(emulator.url)
+    with UploadDaemonServer(engine, port=0, info_path=tmp_path / "daemon.json") as server:
+        yield server
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(5, 4))
+    return str(path)
+
+def test_submit_and_wait_uploads_through_emulator(daemon, emulator, image):
+    client = DaemonClient.from_info(daemon.info_path)
+
+    jobs = client.submit([image], api_key="key", wait=10)
+
+    assert len(jobs) == 1 and jobs[0]['finished'] and jobs[0]['success']
+    assert (jobs[0]['result']['width'], jobs[0]['result']['height']) == ("5", "4")
+    assert emulator.image_exists(jobs[0]['result']['id'])
+    assert client.job(jobs[0]['id'])['success']
+    assert client.status() == {'jobs': 1, 'finished': 1}
+
+def test_unfinished_submit_returns_202_then_job_can_be_polled(daemon, image):
+    daemon.engine.release.clear()
+    client = DaemonClient(url=daemon.url, token=daemon.token)
+
+    job = client.submit([image])[0]
+    assert not job['finished']
+
+    daemon.engine.release.set()
+    assert client.job(job['id'], wait=10)['success']
+
+def test_cancel_and_reprioritize(daemon, image):
+    daemon.engine.release.clear()
+    client = DaemonClient(url=daemon.url, token=daemon.token)
+    job = client.submit([image], options={'priority': 2})[0]
+
+    assert client.reprioritize(job['id'], 0) is True
+    assert daemon.engine.jobs[job['id']]['priority'] == 0
+    assert client.cancel(job['id']) is True
+    assert client.cancel(job['id']) is False
+    assert client.reprioritize(job['id'], 0) is False
+    assert client.cancel(999) is False
+    assert client.reprioritize(999, 0) is False
+
+    daemon.engine.release.set()
+    assert client.job(job['id'])['error'] == "Upload cancelled"
+
+def test_requests_are_validated(daemon):
+    client = DaemonClient(url=daemon.url, token=daemon.token)
+
+    for payload in ({}, {'sources': []}, {'sources': [1]}, {'sources': "a.png"}):
+        with pytest.raises(DaemonError) as error:
+            client.request('POST', "/jobs", payload)
+        assert error.value.status == 400
+
+    with pytest.raises(DaemonError) as error:
+        client.request('PATCH', "/jobs/1", {})
+    assert error.value.status == 400
+
+    with pytest.raises(DaemonError) as error:
+        client.request('GET', "/jobs/1")
+    assert error.value.status == 404
+
+def test_token_and_origin_are_enforced(daemon):
+    with pytest.raises(DaemonError) as error:
+        DaemonClient(url=daemon.url).status()
+    assert error.value.status == 401
+
+    with pytest.raises(DaemonError) as error:
+        DaemonClient(url=daemon.url, token="wrong").status()
+    assert error.value.status == 401
+
+    parts = urlsplit(daemon.url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+    try:
+        connection.request('GET', "/status", headers={'Authorization': f"Bearer {daemon.token}",
+                                                      'Origin': "https://example.com"})
+        assert connection.getresponse().status == 403
+    finally:
+        connection.close()
+
+def test_info_file_is_private_and_removed_on_stop(emulator, tmp_path):
+    info_path = tmp_path / "daemon.json"
+    server = UploadDaemonServer(EmulatorEngine(emulator.url), port=0, info_path=info_path).start()
+    try:
+        info = read_info(info_path)
+        assert info['url'] == server.url and info['token'] == server.token and info['pid'] == os.getpid()
+        if os.name == 'posix':
+            assert info_path.stat().st_mode & 0o777 == 0o600
+    finally:
+        server.stop()
+
+    assert not info_path.exists()
+    assert DaemonClient.from_info(info_path) is None
+
+@pytest.mark.skipif(DaemonUnixServer is None, reason="Unix sockets are not available")
+def test_unix_socket_needs_no_token(emulator, image):
+    import tempfile
+
+    # AF_UNIX paths are limited to about 100 bytes, which pytest's tmp_path can exceed
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "daemon.sock")
+        with UploadDaemonServer(EmulatorEngine(emulator.url), port=None, socket_path=socket_path) as server:
+            assert server.addresses == [socket_path]
+            assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+            client = DaemonClient(socket_path=socket_path)
+            assert client.submit([image], wait=10)[0]['success']
+
+        assert not os.path.exists(socket_path)
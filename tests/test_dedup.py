@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from imgbb_dedup import MultiIndexHash, cluster_hashes, dhash, dhash_many, hamming
+
+def brute_force_clusters(hashes, threshold):
+    parent = list(range(len(hashes)))
+
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    for i, a in enumerate(hashes):
+        for j in range(i):
+            b = hashes[j]
+            if a is not None and b is not None and hamming(a, b) <= threshold:
+                parent[find(i)] = find(j)
+
+    groups = {}
+    for i, value in enumerate(hashes):
+        if value is not None:
+            groups.setdefault(find(i), []).append(i)
+    return sorted(group for group in groups.values() if len(group) > 1)
+
+def near_duplicate_hashes(rng, seeds, copies, max_flips):
+    hashes = []
+    for _ in range(seeds):
+        seed = rng.getrandbits(64)
+        hashes.append(seed)
+        for _ in range(rng.randrange(copies)):
+            value = seed
+            for bit in rng.sample(range(64), rng.randrange(max_flips + 1)):
+                value ^= 1 << bit
+            hashes.append(value)
+    hashes += [None] * 5
+    rng.shuffle(hashes)
+    return hashes
+
+@pytest.mark.parametrize('threshold', [0, 1, 2, 4, 8, 12])
+@pytest.mark.parametrize('seed', range(3))
+def test_cluster_hashes_matches_brute_force(threshold, seed):
+    rng = random.Random(seed * 100 + threshold)
+    hashes = near_duplicate_hashes(rng, seeds=120, copies=4, max_flips=threshold + 3)
+
+    assert sorted(cluster_hashes(hashes, threshold)) == brute_force_clusters(hashes, threshold)
+
+def test_cluster_hashes_groups_identical_and_skips_missing():
+    assert cluster_hashes([5, None, 5, 7, None], threshold=0) == [[0, 2]]
+    assert sorted(cluster_hashes([0, 0b1, 0b11, 0xFF << 40], threshold=1)) == [[0, 1, 2]]
+    assert cluster_hashes([]) == []
+
+def test_multi_index_search_finds_every_match_within_threshold():
+    rng = random.Random(7)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    index = MultiIndexHash(threshold=8, expected=len(values))
+    for value in values:
+        index.add(value)
+
+    for value in values[:50]:
+        query = value
+        for bit in rng.sample(range(64), 8):
+            query ^= 1 << bit
+        expected = sorted(i for i, v in enumerate(values) if hamming(query, v) <= 8)
+        assert sorted(index.search(query)) == expected
+
+def test_dhash_encodes_horizontal_gradient():
+    rising = bytes(range(9)) * 8
+    falling = bytes(reversed(range(9))) * 8
+
+    assert dhash(rising) == (1 << 64) - 1
+    assert dhash(falling) == 0
+    assert dhash_many([rising, falling, bytes(72)]) == [dhash(rising), 0, 0]
+    assert dhash_many([]) == []
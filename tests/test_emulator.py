@@ -0,0 +1,118 @@
+import http.client
+import json
+import socket
+import struct
+import time
+import zlib
+from urllib.parse import urlsplit
+
+import pytest
+
+from imgbb_emulator import MockImgBBServer, multipart_field
+
+def make_png(width: int, height: int) -> bytes:
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    rows = b"".join(b'\x00' + b'\x80' * width * 3 for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+def post_image(server: MockImgBBServer, image: bytes, query: str = "key=test", fields: dict = None):
+    boundary = "testboundary"
+    body = "".join(f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n"
+                   for name, value in (fields or {}).items()).encode()
+    body += (f"--{boundary}\r\nContent-Disposition: form-data; name=\"image\"; filename=\"a.png\"\r\n"
+             f"Content-Type: image/png\r\n\r\n").encode() + image + f"\r\n--{boundary}--\r\n".encode()
+
+    parts = urlsplit(server.url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=5)
+    try:
+        connection.request('POST', f"{parts.path}?{query}", body=body,
+                           headers={'Content-Type': f"multipart/form-data; boundary={boundary}"})
+        response = connection.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        connection.close()
+
+def test_upload_returns_imgbb_response_shape():
+    with MockImgBBServer() as server:
+        status, _, content = post_image(server, make_png(7, 3))
+
+    data = json.loads(content)['data']
+    assert status == 200
+    assert (data['width'], data['height']) == ("7", "3")
+    assert data['image']['extension'] == "png"
+    assert data['delete_url'].startswith(f"http://127.0.0.1:{server.server_address[1]}/{data['id']}/")
+    assert server.stats == {'uploaded': 1}
+
+def test_requested_expiration_is_echoed():
+    with MockImgBBServer() as server:
+        _, _, default = post_image(server, make_png(1, 1))
+        _, _, query = post_image(server, make_png(1, 1), query="key=test&expiration=600")
+        _, _, field = post_image(server, make_png(1, 1), fields={'key': "test", 'expiration': "3600"})
+
+    assert json.loads(default)['data']['expiration'] == "0"
+    assert json.loads(query)['data']['expiration'] == "600"
+    assert json.loads(field)['data']['expiration'] == "3600"
+
+def test_uploaded_image_is_served_until_deleted():
+    with MockImgBBServer() as server:
+        _, _, content = post_image(server, make_png(1, 1))
+        data = json.loads(content)['data']
+        image_id, delete_hash = data['delete_url'].rsplit('/', 2)[1:]
+
+        assert server.image_exists(image_id)
+        status, _ = server.delete_image({'auth_token': [server.auth_token], 'action': ["delete"],
+                                         'deleting[id]': [image_id], 'deleting[hash]': [delete_hash]})
+        assert status == 200
+        assert not server.image_exists(image_id)
+
+def test_injected_server_error():
+    with MockImgBBServer(error_rate=1.0) as server:
+        status, _, content = post_image(server, make_png(1, 1))
+
+    assert status == 500
+    assert json.loads(content)['status_code'] == 500
+    assert server.stats == {'server_error': 1}
+
+def test_injected_rate_limit_sends_retry_after():
+    with MockImgBBServer(rate_limit_rate=1.0, retry_after=2.5) as server:
+        status, headers, _ = post_image(server, make_png(1, 1))
+
+    assert status == 429
+    assert headers['Retry-After'] == "2.5"
+
+def test_injected_truncated_response():
+    with MockImgBBServer(truncate_rate=1.0) as server:
+        with pytest.raises(http.client.IncompleteRead):
+            post_image(server, make_png(1, 1))
+
+    assert server.stats == {'truncated': 1}
+
+def test_injected_connection_reset():
+    with MockImgBBServer(reset_rate=1.0) as server:
+        with pytest.raises((ConnectionError, http.client.HTTPException)):
+            post_image(server, make_png(64, 64))
+
+    assert server.stats == {'reset': 1}
+
+def test_partial_body_is_not_stored():
+    with MockImgBBServer() as server:
+        with socket.create_connection(server.server_address[:2]) as client:
+            client.sendall(b"POST /1/upload HTTP/1.1\r\nHost: test\r\nContent-Type: multipart/form-data; boundary=b\r\n"
+                           b"Content-Length: 100000\r\n\r\n" + b"x" * 1000)
+
+        deadline = time.monotonic() + 5
+        while not server.stats and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert server.stats == {'aborted': 1}
+        assert not server.images
+
+def test_multipart_field_extracts_named_part():
+    body = b'--b\r\nContent-Disposition: form-data; name="key"\r\n\r\nabc\r\n--b\r\n' \
+           b'Content-Disposition: form-data; name="image"\r\n\r\n\x00\x01\r\n--b--\r\n'
+    assert multipart_field(body, "multipart/form-data; boundary=b", 'image') == b'\x00\x01'
+    assert multipart_field(body, "multipart/form-data; boundary=b", 'missing') is None
+    assert multipart_field(body, "application/octet-stream", 'image') is None
@@ -0,0 +1,125 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QListWidget, QListWidgetItem
+
+from imgbb import HistoryManager, ImgBBUploader
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def upload(name: str, **fields) -> dict:
+    return dict({'id': name, 'url': f"https://i.ibb.co/{name}.png", 'title': name}, **fields)
+
+def filenames(manager: HistoryManager) -> list:
+    return [entry['filename'] for entry in manager.get_history()]
+
+def test_delete_removes_the_clicked_entry_after_an_external_insert(home, app):
+    gui = HistoryManager()
+    gui.add_entry(upload("first"))
+    gui.add_entry(upload("second"))
+
+    history_list = QListWidget()
+    for entry in gui.get_history():
+        item = QListWidgetItem(entry['filename'])
+        item.setData(Qt.ItemDataRole.UserRole, entry)
+        history_list.addItem(item)
+
+    # The daemon writes an entry; an expiry sweep with nothing expired reloads without rebuilding the list
+    HistoryManager().add_entry(upload("daemon"))
+    assert gui.sweep_expired() == []
+    assert filenames(gui) == ["daemon", "second", "first"]
+
+    window = SimpleNamespace(history_list=history_list, history_manager=gui)
+    ImgBBUploader.delete_history_item(window, history_list.item(1))
+
+    assert filenames(gui) == ["daemon", "second"]
+    assert filenames(HistoryManager()) == ["daemon", "second"]
+    assert [history_list.item(row).text() for row in range(history_list.count())] == ["second"]
+
+def test_entries_from_other_writers_are_merged(home):
+    first = HistoryManager()
+    second = HistoryManager()
+
+    first.add_entry(upload("a"))
+    second.add_entry(upload("b"))
+    first.add_entries([upload("c"), upload("d")])
+
+    assert filenames(first) == ["d", "c", "b", "a"]
+    assert second.reload() and filenames(second) == filenames(first)
+    assert not second.reload()
+
+    second.remove_entries([entry for entry in second.get_history() if entry['filename'] in ("a", "c")])
+    assert first.reload() and filenames(first) == ["d", "b"]
+
+def test_expiry_heap_orders_and_sweeps_with_a_fixed_clock(home):
+    manager = HistoryManager()
+    manager.add_entries([
+        upload("late", time="1000", expiration="900"),
+        upload("never", time="1000"),
+        upload("early", time="1000", expiration="60"),
+        upload("middle", time="1200", expiration="300"),
+    ])
+
+    assert manager.next_expiry() == 1060
+    assert manager.sweep_expired(now=1059) == []
+    assert manager.next_expiry() == 1060
+
+    swept = manager.sweep_expired(now=1500)
+    assert [entry['filename'] for entry in swept] == ["early", "middle"]
+    assert all(entry['expired'] for entry in swept)
+    assert manager.next_expiry() == 1900
+
+    assert [entry['filename'] for entry in manager.sweep_expired(now=10 ** 10)] == ["late"]
+    assert manager.next_expiry() is None
+    assert manager.sweep_expired(now=10 ** 10) == []
+
+    reloaded = HistoryManager()
+    assert {entry['filename'] for entry in reloaded.get_history() if entry.get('expired')} == {"early", "middle", "late"}
+    assert reloaded.next_expiry() is None
+
+def test_next_expiry_skips_removed_entries(home):
+    manager = HistoryManager()
+    manager.add_entries([upload("a", time="0", expiration="100"), upload("b", time="0", expiration="200")])
+
+    manager.remove_entries([entry for entry in manager.get_history() if entry['filename'] == "a"])
+
+    assert manager.next_expiry() == 200
+    assert [entry['filename'] for entry in manager.sweep_expired(now=150)] == []
+    assert [entry['filename'] for entry in manager.sweep_expired(now=250)] == ["b"]
+
+def test_sweep_sees_expiring_entries_written_by_another_process(home):
+    manager = HistoryManager()
+    manager.add_entry(upload("gui", time="0", expiration="500"))
+    HistoryManager().add_entry(upload("daemon", time="0", expiration="100"))
+
+    assert [entry['filename'] for entry in manager.sweep_expired(now=200)] == ["daemon"]
+    assert manager.next_expiry() == 500
+
+def test_expiration_from_emulator_sets_expiry_time(home):
+    pytest.importorskip("requests")
+    from imgbb import UploadWorker
+    from imgbb_emulator import MockImgBBServer
+
+    image = home / "image.png"
+    image.write_bytes(b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x02\x00\x00\x00\x03\x08\x02\x00\x00\x00')
+
+    with MockImgBBServer() as server:
+        worker = UploadWorker("key", str(image), {'endpoint': server.url, 'expiration': 600})
+        worker.run()
+
+    entry = HistoryManager.make_entry(worker.data)
+    assert entry['expiration'] == 600
+    assert entry['expires_at'] == int(worker.data['time']) + 600
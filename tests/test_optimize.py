@@ -0,0 +1,107 @@
+import struct
+import zlib
+
+from imgbb_optimize import optimize_image, optimize_png, strip_jpeg
+from imgbb_probe import exif_orientation, probe_image_bytes
+
+def chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+def png_chunks(data: bytes) -> list:
+    chunks = []
+    pos = 8
+    while pos < len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        chunks.append((chunk_type, data[pos + 8:pos + 8 + length]))
+        pos += 12 + length
+    return chunks
+
+def exif_block(orientation: int) -> bytes:
+    return b'II*\x00' + struct.pack('<IH', 8, 1) + struct.pack('<HHIH2x', 0x0112, 3, 1, orientation) + b'\x00' * 4
+
+def make_png(width: int = 32, height: int = 16, extra: bytes = b'') -> bytes:
+    rows = b"".join(b'\x00' + bytes((x * 7 + y) % 256 for x in range(width * 3)) for y in range(height))
+    # Level 0 leaves room for the level 9 recompression to win
+    idat = zlib.compress(rows, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) + extra +
+            chunk(b'IDAT', idat[:len(idat) // 2]) + chunk(b'IDAT', idat[len(idat) // 2:]) + chunk(b'IEND', b''))
+
+def make_jpeg(*segments: bytes) -> bytes:
+    scan = b'\xff\xda' + struct.pack('>H', 8) + b'\x01\x01\x00\x00\x3f\x00' + bytes(range(1, 200)) + b'\xff\xd9'
+    return (b'\xff\xd8' + b"".join(segments) + b'\xff\xdb' + struct.pack('>H', 67) + b'\x00' * 65 +
+            b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, 10, 20, 1) + b'\x01\x11\x00' + scan)
+
+def segment(code: int, payload: bytes) -> bytes:
+    return bytes((0xFF, code)) + struct.pack('>H', len(payload) + 2) + payload
+
+def idat_pixels(data: bytes) -> bytes:
+    return zlib.decompress(b"".join(d for t, d in png_chunks(data) if t == b'IDAT'))
+
+def test_png_metadata_is_stripped_and_pixels_preserved():
+    original = make_png(extra=chunk(b'tEXt', b'Comment\x00' + b'x' * 500) + chunk(b'tIME', b'\x07\xea\x01\x01\x00\x00\x00'))
+
+    optimized = optimize_image(original)
+
+    assert len(optimized) < len(original)
+    types = [t for t, _ in png_chunks(optimized)]
+    assert types == [b'IHDR', b'IDAT', b'IEND']
+    assert idat_pixels(optimized) == idat_pixels(original)
+
+def test_png_orientation_is_kept():
+    original = make_png(extra=chunk(b'eXIf', exif_block(6) + b'\x00' * 300))
+
+    optimized = optimize_png(original)
+    exif = [d for t, d in png_chunks(optimized) if t == b'eXIf']
+
+    assert len(exif) == 1
+    assert probe_image_bytes(optimized)['width'] == 32
+    assert exif_orientation(b'Exif\x00\x00' + exif[0]) == 6
+
+def test_png_default_orientation_drops_exif():
+    optimized = optimize_png(make_png(extra=chunk(b'eXIf', exif_block(1))))
+    assert b'eXIf' not in [t for t, _ in png_chunks(optimized)]
+
+def test_jpeg_metadata_is_stripped_and_scan_untouched():
+    jfif = segment(0xE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00')
+    icc = segment(0xE2, b'ICC_PROFILE\x00' + b'p' * 40)
+    original = make_jpeg(jfif, segment(0xE1, b'Exif\x00\x00' + exif_block(1) + b'm' * 400), icc,
+                         segment(0xED, b'Photoshop 3.0\x00' + b'i' * 100), segment(0xFE, b'a comment'))
+
+    optimized = optimize_image(original)
+
+    assert optimized == make_jpeg(jfif, icc)
+    assert probe_image_bytes(optimized)['orientation'] == 1
+
+def test_jpeg_orientation_is_rewritten_after_jfif():
+    jfif = segment(0xE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00')
+    original = make_jpeg(jfif, segment(0xE1, b'Exif\x00\x00' + exif_block(8) + b'm' * 400))
+
+    optimized = strip_jpeg(original)
+
+    assert optimized.startswith(b'\xff\xd8' + jfif + b'\xff\xe1')
+    info = probe_image_bytes(optimized)
+    assert (info['orientation'], info['width'], info['height']) == (8, 20, 10)
+    assert optimized.endswith(original[original.index(b'\xff\xda'):])
+
+def test_unoptimizable_data_is_returned_unchanged():
+    text = b'plain text, not an image'
+    assert optimize_image(text) is text
+
+    corrupt = b'\xff\xd8\x00\x00garbage'
+    assert optimize_image(corrupt) is corrupt
+
+    truncated = make_png()[:60]
+    assert optimize_image(truncated) is truncated
+
+    # Already minimal: nothing to strip and recompression does not help
+    minimal = make_jpeg()
+    assert optimize_image(minimal) is minimal
+
+def test_truncated_jpeg_is_returned_unchanged():
+    jfif = segment(0xE0, b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00')
+    full = make_jpeg(jfif, segment(0xE1, b'Exif\x00\x00' + exif_block(6) + b'm' * 400))
+    scan = full.index(b'\xff\xda')
+
+    for data in (b'\xff\xd8\xff\xe0\x00\x04ab\xff', b'\xff\xd8\xff', full[:scan - 30], full[:scan + 1]):
+        assert strip_jpeg(data) is None
+        assert optimize_image(data) is data
@@ -0,0 +1,78 @@
+import struct
+
+import pytest
+
+from imgbb_probe import display_size, exif_orientation, probe_image, probe_image_bytes, probe_images
+
+def png_header(width: int, height: int) -> bytes:
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+
+def jpeg(width: int, height: int, exif: bytes = b'') -> bytes:
+    data = b'\xff\xd8'
+    data += b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00' + b'\x00' * 9
+    if exif:
+        data += b'\xff\xe1' + struct.pack('>H', len(exif) + 2) + exif
+    data += b'\xff\xdb' + struct.pack('>H', 67) + b'\x00' * 65
+    data += b'\xff\xc2' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+    return data + b'\xff\xda' + struct.pack('>H', 8) + b'\x01\x01\x00\x00\x3f\x00' + b'\x00' * 16 + b'\xff\xd9'
+
+def exif(orientation: int, endian: str) -> bytes:
+    order = b'II' if endian == '<' else b'MM'
+    entry = struct.pack(endian + 'HHIH2x', 0x0112, 3, 1, orientation)
+    return b'Exif\x00\x00' + order + struct.pack(endian + 'HI', 42, 8) + struct.pack(endian + 'H', 1) + entry + b'\x00' * 4
+
+@pytest.mark.parametrize('data, expected', [
+    (png_header(640, 480), ('png', 640, 480)),
+    (b'GIF89a' + struct.pack('<HH', 12, 34) + b'\x00' * 8, ('gif', 12, 34)),
+    (b'BM' + b'\x00' * 12 + struct.pack('<Iii', 40, 300, -200), ('bmp', 300, 200)),
+    (b'BM' + b'\x00' * 12 + struct.pack('<IHH', 12, 5, 6) + b'\x00' * 4, ('bmp', 5, 6)),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8 ' + b'\x00' * 7 + b'\x9d\x01\x2a' + struct.pack('<HH', 1024, 768), ('webp', 1024, 768)),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8L\x00\x00\x00\x00\x2f' + struct.pack('<I', (99 << 14) | 199), ('webp', 200, 100)),
+    (b'RIFF\x00\x00\x00\x00WEBPVP8X' + b'\x00' * 8 + (4999).to_bytes(3, 'little') + (2999).to_bytes(3, 'little'),
+     ('webp', 5000, 3000)),
+    (jpeg(1920, 1080), ('jpeg', 1920, 1080)),
+])
+def test_probe_image_bytes_reads_dimensions(data, expected):
+    info = probe_image_bytes(data)
+    assert (info['format'], info['width'], info['height']) == expected
+    assert info['orientation'] == 1
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'not an image at all',
+    png_header(0, 10),
+    b'GIF89a\x01',
+    b'\xff\xd8\xff\xda\x00\x08' + b'\x00' * 6,
+    b'\xff\xd8\xff\xe0\x00',
+])
+def test_probe_image_bytes_rejects_invalid_data(data):
+    assert probe_image_bytes(data) is None
+
+@pytest.mark.parametrize('endian', ['<', '>'])
+def test_jpeg_orientation_swaps_display_size(endian):
+    info = probe_image_bytes(jpeg(400, 300, exif(6, endian)))
+    assert info['orientation'] == 6
+    assert (info['width'], info['height']) == (400, 300)
+    assert display_size(info) == (300, 400)
+
+def test_exif_orientation():
+    assert exif_orientation(exif(3, '<')) == 3
+    assert exif_orientation(b'Exif\x00\x00XX') is None
+    assert exif_orientation(b'JFIF') is None
+    assert display_size({'width': 4, 'height': 2, 'orientation': 3}) == (4, 2)
+
+def test_probe_image_reports_size_and_errors(tmp_path):
+    image = tmp_path / "a.png"
+    image.write_bytes(png_header(3, 2) + b'\x00' * 100)
+    text = tmp_path / "notes.txt"
+    text.write_text("hello")
+
+    results = probe_images([str(image), str(text), str(tmp_path / "missing.png")], max_workers=2)
+
+    assert [r['path'] for r in results] == [str(image), str(text), str(tmp_path / "missing.png")]
+    assert results[0]['error'] is None
+    assert (results[0]['format'], results[0]['width'], results[0]['height']) == ('png', 3, 2)
+    assert results[0]['size'] == len(png_header(3, 2)) + 100
+    assert results[1]['format'] is None and "Not a supported image" in results[1]['error']
+    assert results[2]['error'] and results[2]['size'] == 0
+    assert probe_image(str(image)) == results[0]
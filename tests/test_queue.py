@@ -0,0 +1,123 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from imgbb_queue import JobQueue
+
+def drain(path, worker_id, results):
+    queue = JobQueue(path)
+    queue.register_worker(worker_id, "test", os.getpid())
+    completed = []
+
+    while True:
+        jobs = queue.lease(worker_id, 3, 30)
+        if not jobs:
+            if not queue.pending():
+                break
+            time.sleep(0.01)
+            continue
+        for job in jobs:
+            if queue.complete(worker_id, job['id'], True, {'worker': worker_id}):
+                completed.append(job['id'])
+
+    queue.unregister_worker(worker_id)
+    results.put((worker_id, completed))
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(tmp_path / "queue.db", max_attempts=2)
+
+def test_processes_never_lease_the_same_job(tmp_path):
+    path = str(tmp_path / "queue.db")
+    ids = JobQueue(path).enqueue([f"/images/{i}.png" for i in range(200)], {'optimize': True})
+
+    results = multiprocessing.Queue()
+    workers = [multiprocessing.Process(target=drain, args=(path, f"worker-{i}", results)) for i in range(4)]
+    for worker in workers:
+        worker.start()
+    completed = dict(results.get(timeout=60) for _ in workers)
+    for worker in workers:
+        worker.join(timeout=10)
+
+    done = [job_id for ids_done in completed.values() for job_id in ids_done]
+    assert sorted(done) == ids
+
+    jobs = JobQueue(path).jobs(ids)
+    assert all(job['state'] == 'done' and job['attempts'] == 1 for job in jobs)
+    assert all(job['result']['worker'] in completed and job['id'] in completed[job['result']['worker']] for job in jobs)
+    assert JobQueue(path).stats() == {'jobs': {'done': 200}, 'workers': []}
+
+def test_lease_order_options_and_attempts(queue):
+    ids = queue.enqueue(["a", "b", "c"], {'variants': [[320, None]]})
+
+    jobs = queue.lease("w1", 2)
+
+    assert [job['id'] for job in jobs] == ids[:2]
+    assert jobs[0] == {'id': ids[0], 'source': "a", 'options': {'variants': [[320, None]]}, 'attempt': 1}
+    assert queue.lease("w2", 5)[0]['id'] == ids[2]
+    assert queue.lease("w3", 5) == []
+    assert queue.lease("w3", 0) == []
+
+def test_expired_lease_is_reassigned_and_old_holder_is_fenced(queue):
+    [job_id] = queue.enqueue(["a"])
+    queue.lease("stalled", 1, lease_seconds=0.05)
+    time.sleep(0.1)
+
+    [job] = queue.lease("alive", 1, lease_seconds=30)
+
+    assert job['id'] == job_id and job['attempt'] == 2
+    assert queue.heartbeat("stalled", [job_id]) == []
+    assert queue.complete("stalled", job_id, True, {}) is False
+    assert queue.heartbeat("alive", [job_id]) == [job_id]
+    assert queue.complete("alive", job_id, False, {}, "Upload failed") is True
+    assert queue.jobs([job_id])[0]['state'] == 'failed'
+    assert queue.complete("alive", job_id, True, {}) is False
+
+def test_lease_expiring_on_last_attempt_fails_the_job(queue):
+    [job_id] = queue.enqueue(["a"])
+    for _ in range(2):
+        assert queue.lease("stalled", 1, lease_seconds=0.05)
+        time.sleep(0.1)
+
+    assert queue.lease("alive", 1) == []
+    job = queue.jobs([job_id])[0]
+    assert job['state'] == 'failed' and job['error'] == "Lease expired on 2 attempts"
+    assert queue.pending() == 0
+
+def test_heartbeat_keeps_the_lease(queue):
+    [job_id] = queue.enqueue(["a"])
+    queue.lease("w1", 1, lease_seconds=0.2)
+
+    for _ in range(3):
+        time.sleep(0.1)
+        assert queue.heartbeat("w1", [job_id], lease_seconds=0.2) == [job_id]
+
+    assert queue.lease("w2", 1) == []
+
+def test_release_does_not_count_as_an_attempt(queue):
+    ids = queue.enqueue(["a", "b"])
+    queue.register_worker("w1", "host", 1)
+    queue.lease("w1", 2)
+
+    queue.release("w1", [ids[0]])
+    assert queue.lease("w2", 5) == [{'id': ids[0], 'source': "a", 'options': {}, 'attempt': 1}]
+
+    queue.unregister_worker("w1")
+    assert queue.jobs([ids[1]])[0]['state'] == 'queued'
+    assert queue.stats()['workers'] == []
+
+def test_wait_and_stats(queue):
+    ids = queue.enqueue(["a", "b"])
+    queue.register_worker("w1", "host", 1)
+    queue.lease("w1", 1)
+
+    stats = queue.stats()
+    assert stats['jobs'] == {'leased': 1, 'queued': 1}
+    assert [(w['id'], w['host'], w['leased']) for w in stats['workers']] == [("w1", "host", 1)]
+
+    assert [job['state'] for job in queue.wait(ids, poll_seconds=0.01, timeout=0.05)] == ['leased', 'queued']
+    queue.complete("w1", ids[0], True, {'url': "u"})
+    assert queue.pending(ids) == 1
+    assert queue.jobs(ids)[0]['result'] == {'url': "u"}
@@ -0,0 +1,213 @@
+import asyncio
+import os
+import struct
+import threading
+import time
+import zlib
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+import imgbb
+from imgbb import (PRIORITY_BACKGROUND, PRIORITY_BATCH, PRIORITY_INTERACTIVE, JobCancelled, JobPaused, UploadBody,
+                   UploadScheduler)
+
+@pytest.fixture(autouse=True)
+def no_metrics_export(monkeypatch):
+    monkeypatch.setattr(imgbb.METRICS, 'autoexport', False)
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def run_in_slot(scheduler, job, order, hold=None):
+    def target():
+        try:
+            with scheduler.slot(job):
+                order.append(job.source)
+                if hold is not None:
+                    hold.wait(5)
+        except JobCancelled:
+            order.append(f"cancelled {job.source}")
+        scheduler.finish_job(job, 'done')
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread
+
+def queue_jobs(scheduler, specs, order):
+    threads = []
+    for source, priority in specs:
+        job = scheduler.create_job(source, priority)
+        waiting = len(scheduler._waiting)
+        threads.append(run_in_slot(scheduler, job, order))
+        wait_until(lambda: len(scheduler._waiting) == waiting + 1)
+    return threads
+
+def test_waiting_jobs_start_in_priority_then_arrival_order():
+    scheduler = UploadScheduler(max_active=1, interactive_reserve=0)
+    order = []
+    hold = threading.Event()
+    blocker = run_in_slot(scheduler, scheduler.create_job("blocker"), order, hold)
+    wait_until(lambda: order == ["blocker"])
+
+    threads = queue_jobs(scheduler, [("background", PRIORITY_BACKGROUND), ("batch-1", PRIORITY_BATCH),
+                                     ("interactive", PRIORITY_INTERACTIVE), ("batch-2", PRIORITY_BATCH)], order)
+    hold.set()
+    for thread in [blocker] + threads:
+        thread.join(5)
+
+    assert order == ["blocker", "interactive", "batch-1", "batch-2", "background"]
+    assert scheduler.jobs == {}
+
+def test_interactive_job_uses_reserved_slot_ahead_of_full_batch():
+    scheduler = UploadScheduler(max_active=1, interactive_reserve=1)
+    order = []
+    hold = threading.Event()
+    blocker = run_in_slot(scheduler, scheduler.create_job("batch-1"), order, hold)
+    wait_until(lambda: order == ["batch-1"])
+    threads = queue_jobs(scheduler, [("batch-2", PRIORITY_BATCH)], order)
+
+    interactive = scheduler.create_job("interactive", PRIORITY_INTERACTIVE)
+    threads.append(run_in_slot(scheduler, interactive, order))
+    wait_until(lambda: "interactive" in order)
+    assert "batch-2" not in order
+
+    hold.set()
+    for thread in [blocker] + threads:
+        thread.join(5)
+    assert order == ["batch-1", "interactive", "batch-2"]
+
+def test_paused_job_is_skipped_until_resumed():
+    scheduler = UploadScheduler(max_active=1, interactive_reserve=0)
+    order = []
+    hold = threading.Event()
+    blocker = run_in_slot(scheduler, scheduler.create_job("blocker"), order, hold)
+    wait_until(lambda: order == ["blocker"])
+    threads = queue_jobs(scheduler, [("paused", PRIORITY_BATCH), ("background", PRIORITY_BACKGROUND)], order)
+
+    paused = next(job for job in scheduler.jobs.values() if job.source == "paused")
+    scheduler.pause(paused)
+    assert paused.state == 'paused'
+
+    hold.set()
+    wait_until(lambda: order == ["blocker", "background"])
+    time.sleep(0.05)
+    assert order == ["blocker", "background"]
+
+    scheduler.resume(paused)
+    for thread in [blocker] + threads:
+        thread.join(5)
+    assert order == ["blocker", "background", "paused"]
+
+def test_cancelling_a_waiting_job_wakes_it():
+    scheduler = UploadScheduler(max_active=1, interactive_reserve=0)
+    order = []
+    hold = threading.Event()
+    blocker = run_in_slot(scheduler, scheduler.create_job("blocker"), order, hold)
+    wait_until(lambda: order == ["blocker"])
+    [thread] = queue_jobs(scheduler, [("queued", PRIORITY_BATCH)], order)
+
+    scheduler.cancel(next(job for job in scheduler.jobs.values() if job.source == "queued"))
+    thread.join(5)
+    assert order == ["blocker", "cancelled queued"]
+
+    hold.set()
+    blocker.join(5)
+
+    late = scheduler.create_job("late")
+    scheduler.cancel(late)
+    with pytest.raises(JobCancelled):
+        with scheduler.slot(late):
+            pass
+
+def test_group_controls_cover_every_job_in_the_group():
+    scheduler = UploadScheduler()
+    jobs = [scheduler.create_job(f"file-{i}", group="batch") for i in range(3)]
+    other = scheduler.create_job("other", group="other")
+
+    scheduler.pause_group("batch")
+    assert all(job.paused for job in jobs) and not other.paused
+    scheduler.resume_group("batch")
+    assert not any(job.paused for job in jobs)
+
+    scheduler.cancel_group("batch")
+    assert all(job.cancelled for job in jobs) and not other.cancelled
+    with pytest.raises(JobCancelled):
+        jobs[0].checkpoint()
+
+def test_cancel_interrupts_retry_backoff():
+    scheduler = UploadScheduler()
+    job = scheduler.create_job("file")
+    threading.Timer(0.05, scheduler.cancel, args=(job,)).start()
+
+    start = time.monotonic()
+    with pytest.raises(JobCancelled):
+        job.sleep(5)
+    assert time.monotonic() - start < 2
+
+def test_upload_body_is_only_interrupted_while_data_remains():
+    scheduler = UploadScheduler()
+    job = scheduler.create_job("file")
+
+    body = UploadBody(b"x" * 10, job)
+    assert body.read(4) == b"xxxx"
+    scheduler.pause(job)
+    with pytest.raises(JobPaused):
+        body.read(4)
+    assert isinstance(body.interrupted, JobPaused)
+
+    scheduler.resume(job)
+    body = UploadBody(b"x" * 10, job)
+    assert body.read() == b"x" * 10
+    scheduler.pause(job)
+    assert body.read() == b""
+    assert body.interrupted is None
+
+    scheduler.cancel(job)
+    with pytest.raises(JobCancelled):
+        UploadBody(b"x", job).read()
+
+def make_png(width: int, height: int) -> bytes:
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    # Random pixels keep the file larger than one upload chunk
+    rows = b"".join(b'\x00' + os.urandom(width * 3) for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows, 0)) + chunk(b'IEND', b''))
+
+@pytest.mark.parametrize('mid_body', [True, False])
+def test_pausing_a_batch_never_uploads_an_image_twice(monkeypatch, tmp_path, mid_body):
+    pytest.importorskip("aiohttp")
+    from imgbb_emulator import MockImgBBServer
+
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(200, 200))
+    read = UploadBody.read
+    paused = []
+
+    def read_and_pause(self, size=-1):
+        chunk = read(self, size)
+        # Pause once, either after the first chunk or once the whole body is out
+        if not paused and (chunk if mid_body else not chunk):
+            paused.append(True)
+            worker.pause()
+            threading.Timer(0.3, worker.resume).start()
+        return chunk
+
+    monkeypatch.setattr(UploadBody, 'read', read_and_pause)
+
+    with MockImgBBServer(latency=0.1) as server:
+        worker = imgbb.BatchUploadWorker("key", [str(path)], {'endpoint': server.url})
+        summary = asyncio.run(worker.perform_uploads())
+        wait_until(lambda: sum(server.stats.values()) == (2 if mid_body else 1))
+
+    assert paused
+    assert summary['successful'] == 1
+    assert len(server.images) == 1
+    assert server.stats == ({'aborted': 1, 'uploaded': 1} if mid_body else {'uploaded': 1})
+    assert worker.results[0]['data']['id'] in server.images
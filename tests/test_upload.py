@@ -0,0 +1,124 @@
+import asyncio
+import os
+import struct
+import zlib
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+import imgbb
+from imgbb import (UploadBody, UploadScheduler, connection_retry_delay, needs_local_copy, should_relay,
+                   status_retry_delay, upload_params, upload_response_data)
+
+@pytest.fixture(autouse=True)
+def no_metrics_export(monkeypatch):
+    monkeypatch.setattr(imgbb.METRICS, 'autoexport', False)
+
+def make_png(width: int, height: int) -> bytes:
+    def chunk(chunk_type, data):
+        return struct.pack('>I', len(data)) + chunk_type + data + struct.pack('>I', zlib.crc32(chunk_type + data))
+
+    rows = b"".join(b'\x00' + os.urandom(width * 3) for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) +
+            chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+def test_status_retry_delay():
+    assert status_retry_delay(200, 1, 3) is None
+    assert status_retry_delay(400, 1, 3) is None
+    assert status_retry_delay(503, 4, 3) is None
+    assert status_retry_delay(429, 1, 3, "2.5") == 2.5
+    assert status_retry_delay(429, 1, 3, "600") == 60.0
+    assert 0 <= status_retry_delay(500, 3, 3) <= imgbb.RETRY_BACKOFF * 4
+
+def test_connection_retry_delay_only_before_the_body_is_sent():
+    job = UploadScheduler().create_job("file")
+
+    unsent = UploadBody(b"data", job)
+    assert connection_retry_delay(unsent, 1, 3) is not None
+    assert connection_retry_delay(unsent, 4, 3) is None
+
+    sent = UploadBody(b"data", job)
+    sent.read(1)
+    assert connection_retry_delay(sent, 1, 3) is None
+
+    sent.interrupted = imgbb.JobPaused("paused")
+    with pytest.raises(imgbb.JobPaused):
+        connection_retry_delay(sent, 1, 3)
+
+def test_remote_source_decisions():
+    assert needs_local_copy("https://example.com/a.png", {'variants': [{'width': 320, 'format': None}]})
+    assert not needs_local_copy("https://example.com/a.png", {})
+    assert not needs_local_copy("/tmp/a.png", {'variants': [{'width': 320, 'format': None}]})
+
+    assert should_relay(400, {})
+    assert not should_relay(400, {'url_fallback': False})
+    assert not should_relay(500, {})
+    assert not should_relay(None, {})
+
+def test_params_and_response():
+    assert upload_params("key", {}) == {'key': "key"}
+    assert upload_params("key", {'expiration': 600, 'name': "ignored"}) == {'key': "key", 'expiration': "600"}
+
+    assert upload_response_data({'data': {'url': "u"}}) == {'url': "u"}
+    for response in ({}, {'data': {}}):
+        with pytest.raises(ValueError):
+            upload_response_data(response)
+
+def single_upload(path, options):
+    worker = imgbb.UploadWorker("key", str(path), options)
+    errors = []
+    worker.upload_error.connect(errors.append, imgbb.Qt.ConnectionType.DirectConnection)
+    worker.run()
+    return worker.data, errors
+
+def batch_upload(path, options):
+    worker = imgbb.BatchUploadWorker("key", [str(path)], options)
+    asyncio.run(worker.perform_uploads())
+    [result] = worker.results
+    return result.get('data'), [result['error']] if not result['success'] else []
+
+@pytest.mark.parametrize('upload', [single_upload, batch_upload], ids=["requests", "aiohttp"])
+def test_transports_share_the_retry_rules(tmp_path, upload):
+    pytest.importorskip("requests")
+    pytest.importorskip("aiohttp")
+    from imgbb_emulator import MockImgBBServer
+
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(300, 300))
+
+    with MockImgBBServer(rate_limit_rate=1.0, retry_after=0.01) as server:
+        data, errors = upload(path, {'endpoint': server.url, 'max_retries': 2})
+    assert data is None and errors and "429" in errors[0]
+    assert server.stats == {'rate_limited': 3}
+
+    # A reset mid-body may follow a stored upload, so it is never retried
+    with MockImgBBServer(reset_rate=1.0) as server:
+        data, errors = upload(path, {'endpoint': server.url, 'max_retries': 2})
+    assert data is None and errors
+    assert server.stats == {'reset': 1}
+
+    with MockImgBBServer() as server:
+        data, errors = upload(path, {'endpoint': server.url, 'expiration': 600})
+    assert errors == [] and data['expiration'] == "600" and data['id'] in server.images
+
+@pytest.mark.parametrize('upload', [single_upload, batch_upload], ids=["requests", "aiohttp"])
+def test_transports_share_the_variant_plan(tmp_path, upload):
+    pytest.importorskip("requests")
+    pytest.importorskip("aiohttp")
+    from imgbb_emulator import MockImgBBServer
+
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(300, 200))
+    variants = imgbb.parse_variants("original,1600,100")
+
+    with MockImgBBServer() as server:
+        data, errors = upload(path, {'endpoint': server.url, 'variants': variants})
+
+    # original and 1600w clamp to the same buffer, so two images are stored for three labels
+    assert errors == []
+    assert server.stats == {'uploaded': 2} and len(server.images) == 2
+    assert data['width'] == "300"
+    assert [(entry['label'], entry['width']) for entry in data['variants']] == [
+        ("original", "300"), ("1600w", "300"), ("100w", "100")]
+
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QBuffer
+from PyQt6.QtGui import QColor, QImage, QImageReader
+from PyQt6.QtWidgets import QApplication
+
+from imgbb import combine_variants, encode_qimage, make_variants, parse_variants, unique_variants
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+def make_image(width: int, height: int, image_format: str = "PNG") -> bytes:
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    for x in range(width):
+        for y in range(0, height, 8):
+            image.setPixelColor(x, y, QColor(x % 256, y % 256, (x * y) % 256))
+    return encode_qimage(image, image_format)
+
+def decode(data: bytes) -> tuple:
+    buffer = QBuffer()
+    buffer.setData(data)
+    reader = QImageReader(buffer)
+    image_format = bytes(reader.format().data()).decode().upper()
+    image = reader.read()
+    return image_format, image.width(), image.height()
+
+def test_parse_variants():
+    assert parse_variants("1600:webp, 320,original:jpg,,") == [
+        {'width': 1600, 'format': "WEBP"},
+        {'width': 320, 'format': None},
+        {'width': None, 'format': "JPEG"},
+    ]
+    assert parse_variants("") == []
+
+    for text in ("0", "-5", "wide", "320:gif"):
+        with pytest.raises(ValueError):
+            parse_variants(text)
+
+def test_make_variants_shares_buffers_per_effective_size(app):
+    source = make_image(400, 200)
+    variants = make_variants(source, parse_variants("original,1600,800:png,200,200:jpg,100:jpg"), {})
+
+    assert [label for label, _ in variants] == ["original", "1600w", "800w-png", "200w", "200w-jpeg", "100w-jpeg"]
+    data = dict(variants)
+
+    # Sizes past the source width clamp to it; in the source format that is the untouched original
+    assert data["original"] is source and data["1600w"] is source and data["800w-png"] is source
+    assert len(unique_variants(variants)) == 4
+
+    assert decode(data["200w"]) == ("PNG", 200, 100)
+    assert decode(data["200w-jpeg"]) == ("JPEG", 200, 100)
+    assert decode(data["100w-jpeg"]) == ("JPEG", 100, 50)
+
+def test_each_size_is_scaled_from_the_full_resolution(app, monkeypatch):
+    scaled_from = []
+    scale = QImage.scaledToWidth
+
+    def record(image, width, *args):
+        scaled_from.append(image.width())
+        return scale(image, width, *args)
+
+    monkeypatch.setattr(QImage, 'scaledToWidth', record)
+    make_variants(make_image(400, 200), parse_variants("300,200,100"), {})
+
+    assert scaled_from == [400, 400, 400]
+
+def test_combine_variants_maps_labels_to_uploads():
+    large, small = b"large", b"small"
+    variants = [("original", large), ("1600w", large), ("320w", small)]
+    uploaded = [{'data': {'url': "https://i.ibb.co/a.png", 'width': "1200", 'height': "800", 'size': 5,
+                          'delete_url': "https://ibb.co/a/x"}},
+                {'data': {'url': "https://i.ibb.co/b.png", 'width': "320", 'height': "213", 'size': 5,
+                          'delete_url': "https://ibb.co/b/y"}}]
+
+    combined = combine_variants(variants, unique_variants(variants), uploaded)
+
+    assert combined['url'] == "https://i.ibb.co/a.png"
+    assert [(entry['label'], entry['url']) for entry in combined['variants']] == [
+        ("original", "https://i.ibb.co/a.png"),
+        ("1600w", "https://i.ibb.co/a.png"),
+        ("320w", "https://i.ibb.co/b.png"),
+    ]
+    assert combined['variants'][2]['delete_url'] == "https://ibb.co/b/y"
+
+    # The widest upload is the primary even when it is not listed first
+    combined = combine_variants(variants[::-1], unique_variants(variants[::-1]), uploaded[::-1])
+    assert combined['url'] == "https://i.ibb.co/a.png"